@@ -0,0 +1,146 @@
+"""
+Run the benchmark suite, on a synthetic league.
+
+Each stage of a ranking run is timed separately: parsing input with
+`LeagueRankerParser.parse`, building a log table with `LogTableFactory.build`,
+ranking it with `LeagueRankController._rank`, and rendering it with
+`CreateLogTableRequestView.render`. Each stage is run a number of times, and the
+fastest time is kept.
+
+Results are printed as JSON, with the throughput of each stage and the peak resident
+set size (RSS) of the process after it, so that regressions can be tracked.
+
+Usage:
+    python -m benchmarks [OPTIONS] [--output FILE]
+"""
+import argparse
+import contextlib
+import copy
+import dataclasses
+import json
+import logging
+import os
+import platform
+import resource
+import sys
+import time
+import typing as t
+
+from benchmarks.generate import LeagueSpec, add_arguments, generate
+from ranker.config import ConfigSnapshot
+from ranker.context import RankingContext
+from ranker.controllers import LeagueRankController
+from ranker.factories import LogTableFactory
+from ranker.parsers import LeagueRankerParser
+from ranker.views import CreateLogTableRequestView
+
+DEFAULT_REPEAT = 3
+
+
+def peak_rss() -> int:
+    """Return the peak resident set size of this process, in bytes."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    return peak if sys.platform == "darwin" else peak * 1024  # Linux gives KiB
+
+
+def stage(
+    name: str, items: int, unit: str, run: t.Callable[[], t.Any], repeat: int
+) -> tuple[dict[str, t.Any], t.Any]:
+    """Time a stage, and return its results with the output of its last run."""
+    best = float("inf")
+
+    for _ in range(repeat):
+        start = time.perf_counter_ns()
+        output = run()
+        best = min(best, time.perf_counter_ns() - start)
+
+    seconds = best / 1e9
+    result = {
+        "stage": name,
+        "seconds": round(seconds, 6),
+        unit: items,
+        f"{unit}_per_second": round(items / seconds) if seconds else None,
+        "peak_rss_bytes": peak_rss(),
+    }
+
+    return result, output
+
+
+def run(spec: LeagueSpec, repeat: int = DEFAULT_REPEAT) -> dict[str, t.Any]:
+    """Run every stage on a league, and return the results."""
+    data = "\n".join(generate(spec))
+    context = RankingContext(config=ConfigSnapshot())
+    # Log at the default level, as the CLI does, so that rejected lines are not written
+    logging.basicConfig(level=context.config.log_level)
+    parser = LeagueRankerParser(context=context)
+    factory = LogTableFactory(context=context)
+    controller = LeagueRankController(context=context)
+
+    stages = []
+
+    result, fixtures = stage(
+        "parse", spec.fixtures, "lines", lambda: parser.parse(data=data), repeat
+    )
+    stages.append(result)
+
+    result, table = stage(
+        "build",
+        len(fixtures.fixtures),
+        "fixtures",
+        lambda: factory.build(fixtures),
+        repeat,
+    )
+    stages.append(result)
+
+    # The table is sorted in place, so each run ranks a fresh copy
+    tables = [copy.deepcopy(table) for _ in range(repeat)]
+    result, ranked = stage(
+        "rank",
+        len(table.rankings),
+        "teams",
+        lambda: controller._rank(tables.pop()),
+        repeat,
+    )
+    stages.append(result)
+
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        result, _ = stage(
+            "render",
+            len(ranked.rankings),
+            "teams",
+            lambda: CreateLogTableRequestView.render(ranked, context=context),
+            repeat,
+        )
+    stages.append(result)
+
+    return {
+        "spec": dataclasses.asdict(spec),
+        "repeat": repeat,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "stages": stages,
+        "peak_rss_bytes": peak_rss(),
+    }
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Run the benchmark suite, and print or save its results."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    add_arguments(parser)
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    parser.add_argument("--output", help="Write results to this file, not stdout.")
+    args = vars(parser.parse_args(argv))
+
+    repeat, output = args.pop("repeat"), args.pop("output")
+    results = json.dumps(run(LeagueSpec(**args), repeat=repeat), indent=2)
+
+    if output is None:
+        print(results)
+    else:
+        with open(output, "w") as file:
+            file.write(results + "\n")
+
+
+if __name__ == "__main__":
+    main()
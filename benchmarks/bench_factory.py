@@ -0,0 +1,92 @@
+"""
+Benchmark the points tally loop in `LogTableFactory.tally_records`, with logging off.
+
+Compares the current tally against the previous loop, which built a list of format
+arguments and formatted a log message for every fixture, even when INFO messages were
+not logged.
+
+Usage:
+    python -m benchmarks.bench_factory [FIXTURES]
+"""
+import itertools
+import logging
+import sys
+import time
+import typing as t
+
+from collections import defaultdict
+
+from ranker import models as m
+from ranker.config import LeagueRankerConfig
+from ranker.factories import LogTableFactory
+
+DEFAULT_FIXTURES = 5_000_000
+
+# Records with a win, a loss and a draw
+RECORDS: list[m.FixtureRecord] = [
+    ("Lions", 3, "Snakes", 1),
+    ("Tarantulas", 0, "FC Awesome", 1),
+    ("Grouches", 2, "Lions", 2),
+]
+
+logger = logging.getLogger("ranker.factories")
+
+
+def legacy_tally_records(
+    factory: LogTableFactory, records: t.Iterable[m.FixtureRecord]
+) -> dict[str, int]:
+    """The previous implementation of `LogTableFactory.tally_records`."""
+    table: dict[str, int] = defaultdict(int)
+    log_template = "{} {} {}: {} - {}"
+
+    for left_name, left_score, right_name, right_score in records:
+        format_args = [left_name, "", right_name, left_score, right_score]
+
+        if left_score > right_score:
+            format_args[1] = "won"
+            table[left_name] += factory.points_win
+            table[right_name] += factory.points_loss
+        elif right_score > left_score:
+            format_args[1] = "lost"
+            table[left_name] += factory.points_loss
+            table[right_name] += factory.points_win
+        else:
+            format_args[1] = "drew"
+            table[left_name] += factory.points_draw
+            table[right_name] += factory.points_draw
+
+        logger.info(log_template.format(*format_args))
+
+    return table
+
+
+def run(tally: t.Callable[[t.Iterable[m.FixtureRecord]], t.Any], n: int) -> float:
+    """Return the mean time, in nanoseconds, taken to tally a fixture."""
+    records = itertools.islice(itertools.cycle(RECORDS), n)
+    start = time.perf_counter_ns()
+
+    tally(records)
+
+    return (time.perf_counter_ns() - start) / n
+
+
+def main(fixtures: int = DEFAULT_FIXTURES) -> None:
+    """Run the benchmark, and print results."""
+    print(f"Tallying {fixtures:,} fixtures, with log level ERROR")
+
+    LeagueRankerConfig.create({})
+    logger.setLevel(logging.ERROR)
+    factory = LogTableFactory()
+
+    before = run(lambda records: legacy_tally_records(factory, records), fixtures)
+    after = run(factory.tally_records, fixtures)
+
+    print(
+        f"before: {before:6.1f} ns/fixture  "
+        f"after: {after:6.1f} ns/fixture  "
+        f"speedup: {before / after:.2f}x"
+    )
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:2]])
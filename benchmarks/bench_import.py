@@ -0,0 +1,89 @@
+"""
+Benchmark the cold start of the `rank` CLI.
+
+Each run starts a fresh interpreter, so that nothing is already imported. The import
+of `ranker.main` is timed with `python -X importtime`, and the modules with the
+largest cumulative import times are listed. A whole `rank` run, with a small input,
+is also timed.
+
+If a LIMIT is given, in milliseconds, the benchmark fails when the median import time
+of `ranker.main` is over it. Use this to keep the start up time from regressing.
+
+Usage:
+    python -m benchmarks.bench_import [RUNS] [LIMIT]
+"""
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+DEFAULT_RUNS = 10
+TOP_MODULES = 10
+
+INPUT = "Lions 3, Snakes 3\nTarantulas 1, FC Awesome 0\n"
+
+
+def import_times() -> dict[str, int]:
+    """Return the cumulative import time of each module, in microseconds."""
+    output = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import ranker.main"],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+
+    times = {}
+    for line in output.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+
+        _, cumulative, name = line.removeprefix("import time:").split("|")
+        times[name.strip()] = int(cumulative)
+
+    return times
+
+
+def run_time(path: str) -> float:
+    """Return the time taken by a `rank` run, in milliseconds."""
+    code = "from ranker.main import main; main()"
+    start = time.perf_counter_ns()
+
+    subprocess.run(
+        [sys.executable, "-c", code, path, "--no-cache"],
+        capture_output=True,
+        check=True,
+    )
+
+    return (time.perf_counter_ns() - start) / 1e6
+
+
+def main(runs: int = DEFAULT_RUNS, limit: int | None = None) -> None:
+    """Run the benchmark, and print results."""
+    print(f"Starting {runs} interpreters")
+
+    samples = [import_times() for _ in range(runs)]
+    median = statistics.median(sample["ranker.main"] for sample in samples) / 1e3
+
+    print(f"import ranker.main: {median:6.1f} ms (median)")
+    for name, cumulative in sorted(
+        samples[-1].items(), key=lambda item: item[1], reverse=True
+    )[1 : TOP_MODULES + 1]:
+        print(f"  {cumulative / 1e3:6.1f} ms  {name}")
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "small.in")
+        with open(path, "w") as file:
+            file.write(INPUT)
+
+        run = statistics.median(run_time(path) for _ in range(runs))
+
+    print(f"rank (small input): {run:6.1f} ms (median)")
+
+    if limit is not None and median > limit:
+        sys.exit(f"Import time {median:.1f} ms is over the limit of {limit} ms")
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:3]])
@@ -0,0 +1,126 @@
+"""
+Benchmark the memory used by a list of fixture models.
+
+Compares the current (slotted and frozen) models, with interned team names, against
+the previous plain dataclass models, with a separate string for every team name.
+The columnar fixture list is also measured.
+
+Usage:
+    python -m benchmarks.bench_models [FIXTURES]
+"""
+import dataclasses
+import gc
+import itertools
+import sys
+import tracemalloc
+import typing as t
+
+from ranker import models as m
+from ranker.parsers import LeagueRankerParser
+
+DEFAULT_FIXTURES = 1_000_000
+
+TEAMS = ["Lions", "Snakes", "Tarantulas", "FC Awesome", "Grouches", "New Zealand"]
+
+
+@dataclasses.dataclass
+class LegacyTeamModel:
+    """The previous `TeamModel`."""
+
+    name: str
+
+
+@dataclasses.dataclass
+class LegacyScoreModel:
+    """The previous `ScoreModel`."""
+
+    value: int
+
+
+@dataclasses.dataclass
+class LegacyResultModel:
+    """The previous `ResultModel`."""
+
+    team: LegacyTeamModel
+    score: LegacyScoreModel
+
+
+@dataclasses.dataclass
+class LegacyFixtureModel:
+    """The previous `FixtureModel`."""
+
+    left: LegacyResultModel
+    right: LegacyResultModel
+
+
+def records(fixtures: int) -> t.Iterator[str]:
+    """Generate input records."""
+    pairs = itertools.cycle(itertools.permutations(TEAMS, 2))
+    for n, (left, right) in enumerate(itertools.islice(pairs, fixtures)):
+        yield f"{left} {n % 7}, {right} {n % 5}"
+
+
+def legacy_fixtures(fixtures: int) -> list[LegacyFixtureModel]:
+    """Parse records into the previous models, without interning team names."""
+    parser = LeagueRankerParser()
+
+    return [
+        LegacyFixtureModel(
+            left=LegacyResultModel(
+                team=LegacyTeamModel(name=groups[0]),  # A new string per record
+                score=LegacyScoreModel(value=int(groups[1])),
+            ),
+            right=LegacyResultModel(
+                team=LegacyTeamModel(name=groups[2]),
+                score=LegacyScoreModel(value=int(groups[3])),
+            ),
+        )
+        for groups in map(parser.match, records(fixtures))
+    ]
+
+
+def current_fixtures(fixtures: int) -> list[m.FixtureModel]:
+    """Parse records into the current models."""
+    return list(LeagueRankerParser().iterparse(data=records(fixtures)))
+
+
+def columnar_fixtures(fixtures: int) -> m.ColumnarFixtureListModel:
+    """Parse records into a columnar fixture list."""
+    return LeagueRankerParser().parse_columnar(data=records(fixtures))
+
+
+def measure(build: t.Callable[[int], t.Any], fixtures: int) -> float:
+    """Return the number of bytes allocated per fixture, for the built list."""
+    gc.collect()
+    tracemalloc.start()
+
+    result = build(fixtures)
+    size, _ = tracemalloc.get_traced_memory()
+
+    tracemalloc.stop()
+    del result
+
+    return size / fixtures
+
+
+def main(fixtures: int = DEFAULT_FIXTURES) -> None:
+    """Run the benchmark, and print results."""
+    print(f"Allocating {fixtures:,} fixtures")
+
+    before = measure(legacy_fixtures, fixtures)
+    after = measure(current_fixtures, fixtures)
+    columnar = measure(columnar_fixtures, fixtures)
+
+    print(
+        f"before: {before:6.1f} bytes/fixture  "
+        f"after: {after:6.1f} bytes/fixture  "
+        f"saving: {1 - after / before:.0%}"
+    )
+    print(
+        f"columnar: {columnar:6.1f} bytes/fixture  "
+        f"saving: {1 - columnar / before:.0%}"
+    )
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:2]])
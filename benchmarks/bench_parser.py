@@ -0,0 +1,87 @@
+"""
+Benchmark per-record matching in `LeagueRankerParser.match`.
+
+Compares the current parser against the previous matching implementation (two
+`re.sub` calls, then `re.match` on a pattern string), with strict parsing disabled
+and enabled.
+
+Usage:
+    python -m benchmarks.bench_parser [LINES]
+"""
+import functools
+import itertools
+import re
+import sys
+import time
+import typing as t
+
+from ranker.errors import RecordParseError
+from ranker.parsers import LeagueRankerParser
+
+DEFAULT_LINES = 10_000_000
+
+# A mix of clean, untidy and malformed records
+RECORDS = [
+    "Lions 3, Snakes 3",
+    "Tarantulas 1, FC Awesome 0",
+    "New Zealand     23,South Africa     13",
+    "Foo_Baz_bar   1,   Baa _  Bar  _ 10",
+    "$_foo 6, _&Bar$foo 5",
+    "Japan   30, Russia 10",
+    "Red Jam 5 Sky Pen 6",
+    "=======================================",
+]
+
+
+def legacy_match(record: str, strict_parse: bool) -> tuple[str, ...]:
+    """The previous implementation of `LeagueRankerParser.match`."""
+    if not strict_parse:
+        record = re.sub(r"[^\w ,]+", " ", record)
+        record = re.sub(r"[\s\_]+", " ", record)
+        record = record.strip()
+
+    if not record:
+        raise RecordParseError(f"Unusable record: '{record}'")
+
+    match = re.match(r"^(\D*) (\d+),(\D*) (\d+)$", record)
+
+    if not match:
+        raise RecordParseError(f"Invalid record format: '{record}'")
+
+    return tuple([str(group).strip() for group in match.groups()])
+
+
+def run(match: t.Callable[[str], tuple[str, ...]], lines: int) -> float:
+    """Return the mean time, in nanoseconds, taken to match a record."""
+    start = time.perf_counter_ns()
+
+    for record in itertools.islice(itertools.cycle(RECORDS), lines):
+        try:
+            match(record)
+        except RecordParseError:
+            pass
+
+    return (time.perf_counter_ns() - start) / lines
+
+
+def main(lines: int = DEFAULT_LINES) -> None:
+    """Run the benchmark, and print results."""
+    print(f"Matching {lines:,} records")
+
+    for strict_parse in (False, True):
+        parser = LeagueRankerParser()
+        parser._strict_parse = strict_parse
+
+        before = run(functools.partial(legacy_match, strict_parse=strict_parse), lines)
+        after = run(parser.match, lines)
+
+        print(
+            f"strict_parse={strict_parse!s:<5}  "
+            f"before: {before:7.1f} ns/record  "
+            f"after: {after:7.1f} ns/record  "
+            f"speedup: {before / after:.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:2]])
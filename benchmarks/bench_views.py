@@ -0,0 +1,93 @@
+"""
+Benchmark the rendering of a large ranking table, in rows per second.
+
+Compares the current view, which writes ranks in chunks, against the previous view,
+which called `click.echo()` for every rank. Output is written to a pipe, that is
+drained by a thread.
+
+Usage:
+    python -m benchmarks.bench_views [TEAMS]
+"""
+import contextlib
+import os
+import sys
+import threading
+import time
+import typing as t
+
+import click
+
+from ranker import models as m
+from ranker.config import ConfigSnapshot
+from ranker.context import RankingContext
+from ranker.views import CreateLogTableRequestView
+
+DEFAULT_TEAMS = 300_000
+
+
+def legacy_render(model: m.RankingTableModel) -> None:
+    """The previous implementation of `CreateLogTableRequestView.render`."""
+    for line in CreateLogTableRequestView.lines(model):
+        click.echo(line)
+
+
+def table(teams: int) -> m.RankingTableModel:
+    """Create a ranking table, with aggregates of 0, 1 and more points."""
+    return m.RankingTableModel(
+        rankings=[
+            m.RankModel(
+                team=m.TeamModel(name=f"Team {n}"),
+                aggregate=m.RankAggregateModel(value=(teams - n) % 50),
+                order=m.RankOrderModel(value=n + 1),
+            )
+            for n in range(teams)
+        ]
+    )
+
+
+def run(render: t.Callable[[], None]) -> float:
+    """Return the time taken to render to a pipe, in seconds."""
+    read, write = os.pipe()
+    drain = threading.Thread(target=drain_all, args=(read,))
+    drain.start()
+
+    with (
+        open(write, "w", encoding="utf-8") as stdout,
+        contextlib.redirect_stdout(stdout),
+    ):
+        start = time.perf_counter()
+        render()
+        stdout.flush()
+        elapsed = time.perf_counter() - start
+
+    drain.join()
+    os.close(read)
+
+    return elapsed
+
+
+def drain_all(fd: int) -> None:
+    """Read from a pipe until it is closed."""
+    while os.read(fd, 1 << 20):
+        pass
+
+
+def main(teams: int = DEFAULT_TEAMS) -> None:
+    """Run the benchmark, and print results."""
+    print(f"Rendering {teams:,} ranks to a pipe")
+
+    model = table(teams)
+    context = RankingContext(config=ConfigSnapshot())
+
+    before = run(lambda: legacy_render(model))
+    after = run(lambda: CreateLogTableRequestView.render(model, context=context))
+
+    print(
+        f"before: {teams / before:12,.0f} rows/s  "
+        f"after: {teams / after:12,.0f} rows/s  "
+        f"speedup: {before / after:.1f}x"
+    )
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:2]])
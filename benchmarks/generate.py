@@ -0,0 +1,101 @@
+"""
+Generate synthetic league input data, for benchmarks.
+
+Leagues are generated from a seed, so that the same arguments always give the same
+input. The number of teams and fixtures, the ratio of malformed lines, the length of
+team names and the ratio of non-ASCII characters in them may all be set.
+
+Usage:
+    python -m benchmarks.generate [OPTIONS] > league.in
+"""
+import argparse
+import dataclasses
+import random
+import sys
+import typing as t
+
+ASCII_LETTERS = "abcdefghijklmnopqrstuvwxyz"
+UNICODE_LETTERS = "áéíóúàèçñöüøåæßłžšğışéΩλπжщяأبت"
+
+
+@dataclasses.dataclass(frozen=True)
+class LeagueSpec:
+    """The size and content of a synthetic league."""
+
+    teams: int = 1_000
+    fixtures: int = 100_000
+    malformed: float = 0.01  # The ratio of lines that cannot be parsed
+    min_name: int = 3  # The minimum length of a team name, in characters
+    max_name: int = 20  # The maximum length of a team name, in characters
+    unicode: float = 0.0  # The ratio of team name letters that are not ASCII
+    seed: int = 0
+
+
+def team_names(spec: LeagueSpec, rng: random.Random) -> list[str]:
+    """Return distinct team names, of one or more words."""
+    names: set[str] = set()
+
+    while len(names) < spec.teams:
+        length = rng.randint(spec.min_name, spec.max_name)
+        letters = [
+            rng.choice(UNICODE_LETTERS)
+            if rng.random() < spec.unicode
+            else rng.choice(ASCII_LETTERS)
+            for _ in range(length)
+        ]
+        # Split long names into words, and capitalise each word
+        words = ["".join(letters[i : i + 8]) for i in range(0, length, 8)]
+        names.add(" ".join(word.capitalize() for word in words))
+
+    return sorted(names)
+
+
+def malformed_line(rng: random.Random, left: str, right: str) -> str:
+    """Return a line that cannot be parsed as a record."""
+    return rng.choice(
+        [
+            f"{left} {rng.randint(0, 9)} {right} {rng.randint(0, 9)}",  # No comma
+            f"{left}, {right} {rng.randint(0, 9)}",  # A missing score
+            f"{left} {rng.randint(0, 9)}",  # A missing team
+            "=" * rng.randint(1, 40),
+        ]
+    )
+
+
+def generate(spec: LeagueSpec) -> t.Iterator[str]:
+    """Yield the lines of a league, without line separators."""
+    rng = random.Random(spec.seed)
+    names = team_names(spec, rng)
+
+    for _ in range(spec.fixtures):
+        left, right = rng.sample(names, 2)
+
+        if rng.random() < spec.malformed:
+            yield malformed_line(rng, left, right)
+        else:
+            yield f"{left} {rng.randint(0, 9)}, {right} {rng.randint(0, 9)}"
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add arguments for each league spec field to an argument parser."""
+    for field in dataclasses.fields(LeagueSpec):
+        parser.add_argument(
+            f"--{field.name.replace('_', '-')}",
+            dest=field.name,
+            type=type(field.default),
+            default=field.default,
+            help=f"default: {field.default}",
+        )
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Write a league to stdout."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    add_arguments(parser)
+    spec = LeagueSpec(**vars(parser.parse_args(argv)))
+
+    sys.stdout.writelines(f"{line}\n" for line in generate(spec))
+
+
+if __name__ == "__main__":
+    main()
@@ -1 +1,11 @@
-from .main import cli  # noqa: F401 imported but unused
+import typing as t
+
+
+def __getattr__(name: str) -> t.Any:
+    """Import the CLI on first use, so that importing a submodule stays cheap."""
+    if name == "cli":
+        from .main import cli
+
+        return cli
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
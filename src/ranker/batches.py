@@ -0,0 +1,100 @@
+"""
+Batches rank many leagues in one run, with one input file and output file per league.
+
+Leagues are ranked concurrently by an asyncio event loop. The parsing, building and
+ranking of each league is CPU-bound, so it is given to a bounded pool of worker
+processes. Output files are written in threads, so that the event loop never blocks.
+
+Each league has its own ranking context, with a snapshot of the configuration and its
+own stats counter, so that record counts are never mixed between leagues. A league
+that cannot be ranked does not stop the others.
+"""
+from __future__ import annotations
+
+import asyncio
+import os
+
+from concurrent.futures import Executor, ProcessPoolExecutor
+
+from . import models as m
+from .config import ConfigSnapshot, LeagueRankerConfig
+from .context import RankingContext
+from .controllers import LeagueRankController
+from .requests import CreateLogTableRequest
+from .views import CreateLogTableRequestView
+
+OUTPUT_SUFFIX = ".out"
+
+
+def output_path(path: str, output_dir: str) -> str:
+    """Return the output file path for an input file, in the output directory."""
+    name, _ = os.path.splitext(os.path.basename(path))
+
+    return os.path.join(output_dir, f"{name}{OUTPUT_SUFFIX}")
+
+
+def rank_league(
+    path: str, top: int = 0, config: ConfigSnapshot | None = None
+) -> tuple[list[str], dict[str, int]]:
+    """
+    Rank the league in the file at `path`, with the given `config` snapshot.
+
+    Return the lines of the ranking table, and the record counts for the league.
+    """
+    context = RankingContext.create(config)
+    controller = LeagueRankController(context=context)
+    request = CreateLogTableRequest(data="", path=path, top=top)
+
+    table = controller.create_log_table(request=request)
+    lines = list(CreateLogTableRequestView.lines(table))
+
+    return lines, {name: context.stats[name] for name in ("read", "parsed", "error")}
+
+
+def write_lines(path: str, lines: list[str]) -> None:
+    """Write lines of text to the file at `path`."""
+    with open(path, "w", encoding="utf-8") as file:
+        file.writelines(f"{line}\n" for line in lines)
+
+
+async def rank_leagues(
+    paths: list[str],
+    output_dir: str,
+    jobs: int,
+    top: int = 0,
+    config: ConfigSnapshot | None = None,
+) -> list[m.LeagueResultModel]:
+    """
+    Rank the leagues in many files, using a pool of `jobs` worker processes.
+
+    Every league is ranked with the same `config` snapshot, or a snapshot of
+    `LeagueRankerConfig`.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    config = LeagueRankerConfig().snapshot() if config is None else config
+
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        leagues = (
+            _rank_and_write(executor, path, output_dir, top, config) for path in paths
+        )
+
+        return await asyncio.gather(*leagues)
+
+
+async def _rank_and_write(
+    executor: Executor, path: str, output_dir: str, top: int, config: ConfigSnapshot
+) -> m.LeagueResultModel:
+    """Rank a league in the executor, and write its output in a thread."""
+    output = output_path(path, output_dir)
+    loop = asyncio.get_running_loop()
+
+    try:
+        lines, stats = await loop.run_in_executor(
+            executor, rank_league, path, top, config
+        )
+        await asyncio.to_thread(write_lines, output, lines)
+
+    except (OSError, ValueError) as e:  # Such as a missing or undecodable file
+        return m.LeagueResultModel(input=path, output=output, stats={}, error=str(e))
+
+    return m.LeagueResultModel(input=path, output=output, stats=stats)
@@ -0,0 +1,158 @@
+"""
+Caches keep the results of previous runs, so that they need not be repeated.
+
+A ranking table is stored in a cache directory, under a key derived from the content
+of the input file and the configuration that it was ranked with. A run with the same
+input and configuration renders the stored table, and nothing is parsed. The record
+counts, and the counts and sample of rejected records, are stored with the table.
+
+The cache is bounded in size. When it grows too large, the least recently used entries
+are evicted. A cache that cannot be read or written is treated as empty.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import typing as t
+
+from . import models as m
+from .config import ConfigSnapshot, LeagueRankerConfig
+from .readers import encoding, mapped
+from .stats import ErrorSampler
+
+if t.TYPE_CHECKING:
+    from .stats import StatsCounter
+
+logger = logging.getLogger(__name__)
+
+VERSION = 2  # The cache entry format version
+
+_COUNTS: t.Final = ("read", "parsed", "error")
+_SUFFIX: t.Final = ".json"
+
+
+class ResultCache:
+    """A size-bounded, least recently used cache of ranking tables."""
+
+    def __init__(self, directory: str, config: ConfigSnapshot | None = None) -> None:
+        self._config = LeagueRankerConfig().snapshot() if config is None else config
+        self._directory = os.path.expanduser(directory)
+        self._max_size = self._config.cache_size
+
+    def key(self, path: str, top: int = 0) -> str:
+        """Return the cache key for the file at `path`, with the cache config."""
+        content = hashlib.sha256()
+        with mapped(path) as data:
+            content.update(data)
+
+        key = {
+            "version": VERSION,
+            "content": content.hexdigest(),
+            "encoding": encoding(),
+            "settings": self._config.settings(),
+            "top": top,
+        }
+
+        return hashlib.sha256(json.dumps(key, sort_keys=True).encode()).hexdigest()
+
+    def get(
+        self, key: str
+    ) -> tuple[m.RankingTableModel, dict[str, int], ErrorSampler] | None:
+        """
+        Return the ranking table, record counts and rejected records for a key.
+
+        Return None if there is no usable entry for the key.
+        """
+        path = self._path(key)
+
+        try:
+            with open(path, encoding="utf-8") as file:
+                entry = json.load(file)
+
+            os.utime(path)  # Mark as recently used
+
+            table = m.RankingTableModel(
+                rankings=[
+                    m.RankModel(
+                        team=m.TeamModel(name=name),
+                        aggregate=m.RankAggregateModel(value=aggregate),
+                        order=m.RankOrderModel(value=order),
+                    )
+                    for name, aggregate, order in entry["rankings"]
+                ]
+            )
+            stats = {name: int(entry["stats"][name]) for name in _COUNTS}
+
+            errors = ErrorSampler()
+            errors.counts = {
+                str(category): int(count)
+                for category, count in entry["errors"]["counts"].items()
+            }
+            errors.seen = int(entry["errors"]["seen"])
+            errors.sample = [
+                (int(line), str(category), str(record))
+                for line, category, record in entry["errors"]["sample"]
+            ]
+
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, TypeError, KeyError) as e:
+            logger.warning("Ignoring cache entry %s: %s", path, e)
+
+            return None
+
+        logger.info("Read cached result from %s", path)
+
+        return table, stats, errors
+
+    def put(self, key: str, table: m.RankingTableModel, stats: StatsCounter) -> None:
+        """
+        Store the ranking table, record counts and rejected records for a key.
+
+        Evict old entries.
+        """
+        errors = stats.sampler()
+        entry = {
+            "rankings": [
+                [r.team.name, r.aggregate.value, r.order.value] for r in table.rankings
+            ],
+            "stats": {name: stats[name] for name in _COUNTS},
+            "errors": {
+                "counts": errors.counts,
+                "seen": errors.seen,
+                "sample": errors.sample,
+            },
+        }
+        path = self._path(key)
+
+        try:
+            os.makedirs(self._directory, exist_ok=True)
+            with open(f"{path}.tmp", "w", encoding="utf-8") as file:
+                json.dump(entry, file)
+
+            os.replace(f"{path}.tmp", path)
+            self._evict()
+
+        except OSError as e:
+            logger.warning("Could not write cache entry %s: %s", path, e)
+
+    def _path(self, key: str) -> str:
+        """Return the path of the cache entry file for a key."""
+        return os.path.join(self._directory, f"{key}{_SUFFIX}")
+
+    def _evict(self) -> None:
+        """Remove the least recently used entries, until the cache is small enough."""
+        entries = [
+            entry
+            for entry in os.scandir(self._directory)
+            if entry.name.endswith(_SUFFIX) and entry.is_file()
+        ]
+        entries.sort(key=lambda entry: entry.stat().st_mtime_ns, reverse=True)
+
+        size = 0
+        for entry in entries:  # The most recently used first
+            size += entry.stat().st_size
+            if size > self._max_size:
+                os.remove(entry.path)
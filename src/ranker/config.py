@@ -7,10 +7,18 @@ Configuration container for League Ranker.
 > 2. Environment variables (supersede)
 > 3. Configuration file
 
-Configuration values are stored in the environment.
+Values read from a configuration file are cached as JSON, keyed on the file path,
+modification time and size, so that the file is only parsed again when it changes.
+
+Configuration values are stored in the environment. Once they are resolved, a typed
+and immutable `ConfigSnapshot` is taken, and read by attribute. Many snapshots, such as
+one for each rule set, may be held at once.
 """
 from __future__ import annotations
 
+import dataclasses
+import hashlib
+import json
 import logging
 import os
 import os.path
@@ -18,8 +26,6 @@ import typing as t
 
 from pathlib import Path
 
-import yaml
-
 from .errors import ConfigurationError
 from .meta import SingletonMeta
 
@@ -30,6 +36,51 @@ S = t.TypeVar("S", bound=bool | int | str)
 P = t.ParamSpec("P")
 KeyValuePairs: t.TypeAlias = dict[str, S]
 
+# Default values, for keys that are not set
+POINTS_WIN = 3
+POINTS_LOSS = 0
+POINTS_DRAW = 1
+CACHE_SIZE = 100 << 20  # The maximum size of the result cache, in bytes
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class ConfigSnapshot:
+    """
+    An immutable snapshot of League Ranker configuration.
+
+    Take a snapshot of the resolved configuration with `LeagueRankerConfig.snapshot()`.
+    A snapshot for another rule set may be created directly, or with
+    `dataclasses.replace()`.
+    """
+
+    log_level: str = "ERROR"
+    strict_parse: bool = False
+    verbose: bool = False
+    workers: int = 1
+    top: int = 0
+    output_format: str = "text"
+    metrics: str = ""  # A file to write metrics to, as JSON
+    rejects: str = ""  # A file to write rejected records to
+    cache: bool = False
+    cache_dir: str = "~/.ranker/cache"
+    cache_size: int = CACHE_SIZE
+    points_win: int = POINTS_WIN
+    points_loss: int = POINTS_LOSS
+    points_draw: int = POINTS_DRAW
+
+    def settings(self) -> dict[str, t.Any]:
+        """
+        Return the configuration values that records are tallied with.
+
+        A saved snapshot or cached result may only be used with the same settings.
+        """
+        return {
+            "points_win": self.points_win,
+            "points_loss": self.points_loss,
+            "points_draw": self.points_draw,
+            "strict_parse": self.strict_parse,
+        }
+
 
 class LeagueRankerConfig(metaclass=SingletonMeta):
     """A Singleton container for League Ranker configuration."""
@@ -42,6 +93,7 @@ class LeagueRankerConfig(metaclass=SingletonMeta):
         # Package directory
         Path(__file__).absolute().parent.absolute().as_posix(),
     ]
+    _cache_dir = os.path.expanduser("~/.ranker/cache/config/")  # Parsed config files
     _truthey = [1, "1", True, "True", "true"]  # Values that should evaluate to `True`
 
     def __init__(self) -> None:
@@ -62,6 +114,27 @@ class LeagueRankerConfig(metaclass=SingletonMeta):
 
         return cls()
 
+    def snapshot(self) -> ConfigSnapshot:
+        """
+        Return a snapshot of the configuration.
+
+        Each value is read once, as the type of its default. Keys that are not set
+        take their default values.
+        """
+        defaults = ConfigSnapshot()
+        getters: dict[type, t.Callable[[str, t.Any], t.Any]] = {
+            bool: self.get_bool,
+            int: self.get_int,
+            str: self.get_str,
+        }
+
+        values = {}
+        for field in dataclasses.fields(ConfigSnapshot):
+            default = getattr(defaults, field.name)
+            values[field.name] = getters[type(default)](field.name, default)
+
+        return ConfigSnapshot(**values)
+
     def has_key(self, key: str) -> bool:
         """Return `True` if the given key has a set value, else `False`."""
         return self.env_key(key) in os.environ
@@ -116,11 +189,67 @@ class LeagueRankerConfig(metaclass=SingletonMeta):
         """Merge values from a YAML file located at the given path, into environment."""
         logger.info(f"Read config from file {path}")
 
+        key: dict[str, t.Any] | None
+        try:
+            stat = os.stat(path)
+        except OSError:
+            key = None  # The file is not cached
+        else:
+            key = {
+                "path": os.path.abspath(path),
+                "mtime_ns": stat.st_mtime_ns,
+                "size": stat.st_size,
+            }
+
+        pairs = None if key is None else self._read_cache(key)
+
+        if pairs is None:
+            import yaml  # Only needed when a file is parsed
+
+            try:
+                with open(path, encoding="locale") as file:
+                    pairs = yaml.safe_load(file).get("config", {})
+            except FileNotFoundError as e:
+                raise ConfigurationError(f"Could not read from file '{path}'") from e
+
+            if key is not None:
+                self._write_cache(key, pairs)
+
+        self._merge(pairs)
+
+    def _cache_path(self, key: dict[str, t.Any]) -> str:
+        """Return the path of the cache file for a configuration file."""
+        name = hashlib.sha256(key["path"].encode()).hexdigest()
+
+        return os.path.join(self._cache_dir, f"{name}.json")
+
+    def _read_cache(self, key: dict[str, t.Any]) -> KeyValuePairs | None:
+        """Return the cached values for a configuration file, or None if stale."""
         try:
-            with open(path, encoding="locale") as file:
-                self._merge(yaml.safe_load(file).get("config", {}))
-        except FileNotFoundError as e:
-            raise ConfigurationError(f"Could not read from file '{path}'") from e
+            with open(self._cache_path(key), encoding="utf-8") as file:
+                content = json.load(file)
+        except (OSError, ValueError):
+            return None
+
+        if not isinstance(content, dict) or content.get("key") != key:
+            return None
+
+        logger.debug(f"Read cached config for {key['path']}")
+
+        return t.cast(KeyValuePairs, content["config"])
+
+    def _write_cache(self, key: dict[str, t.Any], pairs: KeyValuePairs) -> None:
+        """Cache the values of a configuration file. Errors are logged and ignored."""
+        path = self._cache_path(key)
+
+        try:
+            os.makedirs(self._cache_dir, exist_ok=True)
+            with open(f"{path}.tmp", "w", encoding="utf-8") as file:
+                json.dump({"key": key, "config": pairs}, file)
+
+            os.replace(f"{path}.tmp", path)
+        except (OSError, TypeError, ValueError) as e:
+            logger.debug(f"Could not cache config for {key['path']}: {e}")
 
     @classmethod
     def env_key(cls, key: str) -> str:
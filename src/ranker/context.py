@@ -0,0 +1,44 @@
+"""
+A ranking context carries the configuration and stats for a single ranking run.
+
+Components that are given a context read configuration values from it, and count
+records in its stats counter. Rankings that run at the same time, in threads or in a
+long-running service, each have their own context, so that a change of configuration
+or a record count in one never reaches another.
+
+Components that are not given a context use the default context, which has a snapshot
+of the `LeagueRankerConfig` and counts records in the `LeagueRankerStats`.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+
+from .config import ConfigSnapshot, LeagueRankerConfig
+from .stats import LeagueRankerStats, StatsCounter
+
+
+@dataclass(frozen=True, slots=True)
+class RankingContext:
+    """The configuration and stats for a ranking run."""
+
+    config: ConfigSnapshot
+    stats: StatsCounter = field(default_factory=StatsCounter)
+
+    @classmethod
+    def create(cls, config: ConfigSnapshot | None = None) -> RankingContext:
+        """
+        Create a context with its own stats counter.
+
+        If no `config` snapshot is given, a snapshot of `LeagueRankerConfig` is taken.
+        The phases of the run are timed if the configuration is verbose, or asks for
+        metrics.
+        """
+        config = LeagueRankerConfig().snapshot() if config is None else config
+        timing = config.verbose or bool(config.metrics)
+
+        return cls(config=config, stats=StatsCounter(timing=timing))
+
+    @classmethod
+    def default(cls) -> RankingContext:
+        """Return a context of the `rank` run, with the current configuration."""
+        return cls(config=LeagueRankerConfig().snapshot(), stats=LeagueRankerStats())
@@ -2,14 +2,21 @@
 
 from __future__ import annotations
 
+import heapq
 import logging
 import typing as t
 
+from . import models as m
+from . import snapshots
+from .caches import ResultCache
+from .context import RankingContext
 from .factories import LogTableFactory
 from .parsers import LeagueRankerParser
+from .readers import iterparse_file, iterrecords_file
+from .stats import timed
 
 if t.TYPE_CHECKING:
-    from . import models as m
+    from .engines import RankEngine
     from .requests import CreateLogTableRequest
 
 logger = logging.getLogger()
@@ -18,40 +25,170 @@ logger = logging.getLogger()
 class LeagueRankController:
     """Controller class contains logic for the League Ranker."""
 
-    def __init__(self) -> None:
-        self._factory = LogTableFactory()
-        self._parser = LeagueRankerParser()
+    def __init__(self, context: RankingContext | None = None) -> None:
+        self._context = RankingContext.default() if context is None else context
+        self._factory = LogTableFactory(context=self._context)
+        self._parser = LeagueRankerParser(context=self._context)
 
     def create_log_table(self, request: CreateLogTableRequest) -> m.RankingTableModel:
-        """Create and return a League Log Table."""
-        parsed_data = self._parse(data=request.data)
-        table = self._build(data=parsed_data)
-        response = self._rank(table=table)
+        """
+        Create and return a League Log Table.
+
+        Parsed records are fed straight into the factory tally; no fixture models are
+        created. Use `list_fixtures()` to get fixture models.
+
+        If a cache directory is given, then the log table for a file input is cached.
+        If rejected records are written to a file, the input is parsed in one process,
+        and the cache is not used. A warning is logged for each category of rejected
+        records.
+        """
+        if (
+            request.path is not None
+            and request.cache_dir is not None
+            and request.snapshot is None  # A resumed run must update its snapshot
+            and not self._context.config.rejects  # Rejected records must be parsed
+        ):
+            response = self._create_cached(
+                request=request, path=request.path, cache_dir=request.cache_dir
+            )
+        else:
+            response = self._create(request=request)
+
+        self._context.stats.log_errors()
 
         return response
 
-    def _parse(self, data: str) -> m.FixtureListModel:
-        """Invoke the parser."""
-        return self._parser.parse(data=data)
+    def _create(self, request: CreateLogTableRequest) -> m.RankingTableModel:
+        """Create a log table, from the request input."""
+        if request.path is None:
+            records = self._parse(data=request.data)
+            table = self._build(data=records)
+        elif request.snapshot is not None:
+            table = self._build_resumed(path=request.path, snapshot=request.snapshot)
+        elif request.workers > 1 and not self._context.config.rejects:
+            table = self._build_parallel(path=request.path, workers=request.workers)
+        else:
+            records = self._parse_file(path=request.path)
+            table = self._build(data=records)
+
+        response = self._rank(table=table, top=request.top)
 
-    def _build(self, data: m.FixtureListModel) -> m.RankingTableModel:
-        """Invoke the factory build."""
-        return self._factory.build(input=data)
+        return response
+
+    def _create_cached(
+        self, request: CreateLogTableRequest, path: str, cache_dir: str
+    ) -> m.RankingTableModel:
+        """Return a cached log table, or create one and cache it."""
+        cache = ResultCache(directory=cache_dir, config=self._context.config)
+        key = cache.key(path=path, top=request.top)
+
+        cached = cache.get(key)
+        if cached is not None:
+            response, stats, errors = cached
+            for name, value in stats.items():
+                self._context.stats.incr(name, value)
+            self._context.stats.merge_errors(errors)
+
+            return response
+
+        response = self._create(request=request)
+        cache.put(key, response, self._context.stats)
+
+        return response
+
+    def list_fixtures(self, request: CreateLogTableRequest) -> m.FixtureListModel:
+        """Parse and return the list of fixtures in the request input."""
+        if request.path is None:
+            fixtures = self._parser.iterparse(data=request.data)
+        else:
+            fixtures = iterparse_file(parser=self._parser, path=request.path)
+
+        return m.FixtureListModel(fixtures=list(fixtures))
+
+    def create_rank_engine(self, request: CreateLogTableRequest) -> RankEngine:
+        """
+        Create and return a rank engine, loaded with the fixtures in the request input.
+
+        Further results may then be applied to the engine, without a full rebuild.
+        """
+        from .engines import RankEngine
+
+        if request.path is None:
+            records = self._parse(data=request.data)
+        else:
+            records = self._parse_file(path=request.path)
+
+        engine = RankEngine(factory=self._factory)
+        engine.load(records)
+
+        return engine
+
+    def _parse(self, data: str | t.Iterable[str]) -> t.Iterator[m.FixtureRecord]:
+        """Invoke the parser. Records are parsed as the factory consumes them."""
+        return self._context.stats.iter("parse", self._parser.iterrecords(data=data))
+
+    def _parse_file(self, path: str) -> t.Iterator[m.FixtureRecord]:
+        """Invoke the parser on a memory-mapped input file."""
+        records = iterrecords_file(parser=self._parser, path=path)
+
+        return self._context.stats.iter("parse", records)
+
+    @timed("build")
+    def _build(self, data: t.Iterable[m.FixtureRecord]) -> m.RankingTableModel:
+        """Invoke the factory tally, and create a log table."""
+        return self._factory.create(self._factory.tally_records(records=data))
+
+    @timed("build")
+    def _build_parallel(self, path: str, workers: int) -> m.RankingTableModel:
+        """Invoke the parser and factory on chunks of a file, in worker processes."""
+        from .workers import tally_file  # Only needed for more than one worker
+
+        table = tally_file(path=path, workers=workers, context=self._context)
+
+        return self._factory.create(table)
+
+    @timed("build")
+    def _build_resumed(self, path: str, snapshot: str) -> m.RankingTableModel:
+        """Invoke the parser and factory on the input appended since a snapshot."""
+        table, updated = snapshots.tally_resumed(
+            parser=self._parser,
+            factory=self._factory,
+            path=path,
+            snapshot=snapshots.load_snapshot(path=snapshot),
+        )
+        snapshots.save_snapshot(path=snapshot, snapshot=updated)
+
+        return self._factory.create(table)
+
+    @timed("rank")
+    def _rank(self, table: m.RankingTableModel, top: int = 0) -> m.RankingTableModel:
+        """
+        Assign rank order amd sort table by this order.
+
+        If `top` is given, only the top ranked teams, and any teams tied with the last
+        of them, are kept. These are selected with a heap, and only they are sorted.
+        """
+        if 0 < top < len(table.rankings):
+            aggregates = (r.aggregate.value for r in table.rankings)
+            threshold = heapq.nlargest(top, aggregates)[-1]  # Of the last top team
+            table = m.RankingTableModel(
+                rankings=[r for r in table.rankings if r.aggregate.value >= threshold]
+            )
 
-    def _rank(self, table: m.RankingTableModel) -> m.RankingTableModel:
-        """Assign rank order amd sort table by this order."""
         # First, sort the table by aggregate value descending
         table.rankings.sort(key=lambda r: (-r.aggregate.value, r.team.name))
 
         current_aggregate = None
         current_order = 0
+        debug = logger.isEnabledFor(logging.DEBUG)
 
         for current_sequence, rank in enumerate(table.rankings, start=1):
             if rank.aggregate.value != current_aggregate:
                 current_aggregate = rank.aggregate.value
                 current_order += current_sequence - current_order
 
-            logger.debug(f"Set {rank.team.name} to order {current_order}")
+            if debug:
+                logger.debug("Set %s to order %s", rank.team.name, current_order)
             rank.order.value = current_order
 
         return table
@@ -0,0 +1,180 @@
+"""
+Engines keep a ranking table up to date, as results are applied one at a time.
+
+A `RankEngine` holds a points table and a rank index of tie groups: the teams that
+share an aggregate value, in name order. Each tie group has one `RankOrderModel`.
+
+When a result is applied or retracted, only its teams move between tie groups, and
+only the order values of tie groups between a team's old and new aggregate values are
+changed. Tie groups are found by binary search, so an update does not re-sort the
+table.
+"""
+from __future__ import annotations
+
+import bisect
+import typing as t
+
+from collections import defaultdict
+
+from . import errors as err
+from . import models as m
+from .factories import LogTableFactory
+
+
+class RankEngine:
+    """An incremental ranking engine."""
+
+    def __init__(self, factory: LogTableFactory | None = None) -> None:
+        self._factory = factory or LogTableFactory()
+        self._points: dict[str, int] = {}  # Aggregate points, by team name
+        self._played: dict[str, int] = {}  # Number of results applied, by team name
+        self._values: list[int] = []  # Distinct aggregate values, in ascending order
+        self._groups: dict[int, list[str]] = {}  # Sorted team names, by value
+        self._orders: dict[int, m.RankOrderModel] = {}  # Tie group order, by value
+
+    def load(self, records: t.Iterable[m.FixtureRecord]) -> None:
+        """Replace the table, with one built from parsed record tuples."""
+        played: dict[str, int] = defaultdict(int)
+
+        def count(records: t.Iterable[m.FixtureRecord]) -> t.Iterator[m.FixtureRecord]:
+            """Count the results for each team, as records are tallied."""
+            for record in records:
+                played[record[0]] += 1
+                played[record[2]] += 1
+                yield record
+
+        self._points = dict(self._factory.tally_records(count(records)))
+        self._played = dict(played)
+
+        groups: dict[int, list[str]] = defaultdict(list)
+        for name, value in self._points.items():
+            groups[value].append(name)
+
+        self._values = sorted(groups)
+        self._groups = {value: sorted(names) for value, names in groups.items()}
+        self._orders = {}
+
+        order = 1
+        for value in reversed(self._values):
+            self._orders[value] = m.RankOrderModel(value=order)
+            order += len(self._groups[value])
+
+    def apply(self, fixture: m.FixtureModel) -> None:
+        """Apply the result of a fixture."""
+        left, right = self._factory.points(
+            fixture.left.score.value, fixture.right.score.value
+        )
+
+        self._update(fixture.left.team.name, left, 1)
+        self._update(fixture.right.team.name, right, 1)
+
+    def retract(self, fixture: m.FixtureModel) -> None:
+        """
+        Retract the result of a fixture, that was previously applied.
+
+        A team is removed from the table when all its results are retracted. If either
+        team has no results, a RankEngineError exception is raised.
+        """
+        for name in (fixture.left.team.name, fixture.right.team.name):
+            if name not in self._played:
+                raise err.RankEngineError(f"Cannot retract a result for team '{name}'")
+
+        left, right = self._factory.points(
+            fixture.left.score.value, fixture.right.score.value
+        )
+
+        self._update(fixture.left.team.name, -left, -1)
+        self._update(fixture.right.team.name, -right, -1)
+
+    def rank(self, name: str) -> m.RankModel:
+        """Return the rank of a team. If the team is not ranked, raise KeyError."""
+        value = self._points[name]
+
+        return self._rank_model(name, value)
+
+    def table(self, top: int = 0) -> m.RankingTableModel:
+        """
+        Return the ranking table, sorted by rank order.
+
+        If `top` is given, only the top ranked teams, and any teams tied with the last
+        of them, are included. Only the tie groups that are included are visited.
+        """
+        rankings: list[m.RankModel] = []
+
+        for value in reversed(self._values):
+            if 0 < top <= len(rankings):
+                break
+
+            group = self._groups[value]
+            rankings.extend(self._rank_model(name, value) for name in group)
+
+        return m.RankingTableModel(rankings=rankings)
+
+    def __len__(self) -> int:
+        """Return the number of ranked teams."""
+        return len(self._points)
+
+    def _rank_model(self, name: str, value: int) -> m.RankModel:
+        """Create a rank model, with a copy of its tie group order."""
+        return m.RankModel(
+            team=m.TeamModel(name=name),
+            aggregate=m.RankAggregateModel(value=value),
+            order=m.RankOrderModel(value=self._orders[value].value),
+        )
+
+    def _update(self, name: str, points: int, played: int) -> None:
+        """Add points and a number of results for a team, and move it in the index."""
+        old = self._points.get(name)
+        count = self._played.get(name, 0) + played
+        new = None if count == 0 else (old or 0) + points
+
+        if old is not None and old == new:
+            self._played[name] = count
+            return
+
+        if old is not None:
+            self._leave(name, old)
+
+        # Only tie groups between the old and new values have a changed number of
+        # teams ranked above them. A new team is ranked above every group below it,
+        # and a removed team was ranked above every group below it.
+        values = [v for v in (old, new) if v is not None]
+        low = 0 if len(values) == 1 else bisect.bisect_left(self._values, min(values))
+        high = bisect.bisect_left(self._values, max(values))
+        step = 1 if old is None or (new is not None and new > old) else -1
+
+        for value in self._values[low:high]:
+            self._orders[value].value += step
+
+        if new is None:
+            del self._points[name], self._played[name]
+            return
+
+        self._points[name], self._played[name] = new, count
+        self._join(name, new)
+
+    def _leave(self, name: str, value: int) -> None:
+        """Remove a team from a tie group. An empty tie group is removed."""
+        group = self._groups[value]
+        del group[bisect.bisect_left(group, name)]
+
+        if not group:
+            del self._values[bisect.bisect_left(self._values, value)]
+            del self._groups[value], self._orders[value]
+
+    def _join(self, name: str, value: int) -> None:
+        """Add a team to a tie group. A new tie group is ordered after the one above."""
+        if value in self._groups:
+            bisect.insort(self._groups[value], name)
+            return
+
+        index = bisect.bisect_left(self._values, value)
+        if index < len(self._values):
+            above = self._values[index]
+            order = self._orders[above].value + len(self._groups[above])
+        else:
+            order = 1
+
+        self._values.insert(index, value)
+        self._groups[value] = [name]
+        self._orders[value] = m.RankOrderModel(value=order)
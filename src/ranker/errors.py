@@ -10,4 +10,56 @@ class ConfigurationError(Exception):
 class RecordParseError(Exception):
     """Input data record could not be parsed."""
 
+    category = "error"  # The category of rejected records that this error counts
+
+
+class RejectedRecordError(RecordParseError):
+    """
+    Input data record was rejected by the parser, at a line number.
+
+    The message is only formatted if the error is printed, so that rejecting many
+    records is cheap when their warnings are not logged.
+    """
+
+    def __init__(self, record: str, line: int = 0) -> None:
+        super().__init__(record, line)
+        self.record = record
+        self.line = line
+
+
+class UnusableRecordError(RejectedRecordError):
+    """Input data record is empty, once normalised."""
+
+    category = "unusable"
+
+    def __str__(self) -> str:
+        """Format the message."""
+        return f"Unusable record: '{self.record}' at line {self.line}"
+
+
+class InvalidRecordError(RejectedRecordError):
+    """Input data record does not have the format of a fixture."""
+
+    category = "invalid_format"
+
+    def __str__(self) -> str:
+        """Format the message."""
+        return f"Invalid record format: '{self.record}' at line {self.line}"
+
+
+class RankEngineError(Exception):
+    """A result could not be applied to, or retracted from, a rank engine."""
+
+    pass
+
+
+class ProfileError(Exception):
+    """A profile of a ranking run could not be written."""
+
+    pass
+
+
+class SnapshotError(Exception):
+    """A snapshot of an input file could not be written."""
+
     pass
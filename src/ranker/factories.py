@@ -1,61 +1,199 @@
 """Factories take in something and produce something else."""
 
+import functools
 import logging
+import typing as t
 
 from collections import defaultdict
 
 from . import models as m
-from .config import LeagueRankerConfig
+from .context import RankingContext
 
 logger = logging.getLogger(__name__)
 
 
-# Constants for point values.
-# These are only used if configuration values cannot be retrieved.
-POINTS_WIN = 3
-POINTS_LOSS = 0
-POINTS_DRAW = 1
+@functools.cache
+def _numpy() -> t.Any:
+    """
+    Return the NumPy module, or None if it is not installed.
+
+    NumPy is an optional dependency. It is imported on first use, so that runs which
+    never tally columns do not pay for the import.
+    """
+    try:
+        import numpy
+    except ImportError:  # pragma: no cover
+        return None
+
+    return numpy
 
 
 class LogTableFactory:
     """Factory produces a log table from match result data."""
 
-    def __init__(self) -> None:
-        self.points_win = LeagueRankerConfig().get_int("points_win") or POINTS_WIN
-        self.points_loss = LeagueRankerConfig().get_int("points_loss") or POINTS_LOSS
-        self.points_draw = LeagueRankerConfig().get_int("points_draw") or POINTS_DRAW
+    def __init__(self, context: RankingContext | None = None) -> None:
+        config = (RankingContext.default() if context is None else context).config
+        self.points_win = config.points_win
+        self.points_loss = config.points_loss
+        self.points_draw = config.points_draw
+
+    def build(
+        self,
+        input: (
+            m.FixtureListModel | m.ColumnarFixtureListModel | t.Iterable[m.FixtureModel]
+        ),
+    ) -> m.RankingTableModel:
+        """
+        Build a log table.
+
+        Input may be a `FixtureListModel`, a `ColumnarFixtureListModel`, or any
+        iterable of `FixtureModel` instances.
+        """
+        if isinstance(input, m.ColumnarFixtureListModel):
+            return self.create(self.tally_columns(input))
+
+        fixtures = input.fixtures if isinstance(input, m.FixtureListModel) else input
+
+        return self.create(self.tally(fixtures))
+
+    def points(self, left_score: int, right_score: int) -> tuple[int, int]:
+        """Return the points for each team in a fixture, with the given scores."""
+        if left_score > right_score:
+            return self.points_win, self.points_loss
+        elif right_score > left_score:
+            return self.points_loss, self.points_win
+        else:
+            return self.points_draw, self.points_draw
+
+    def tally(self, fixtures: t.Iterable[m.FixtureModel]) -> dict[str, int]:
+        """Tally the aggregate points for each team, in order of first appearance."""
+        return self.tally_records(
+            (
+                fixture.left.team.name,
+                fixture.left.score.value,
+                fixture.right.team.name,
+                fixture.right.score.value,
+            )
+            for fixture in fixtures
+        )
+
+    def tally_records(self, records: t.Iterable[m.FixtureRecord]) -> dict[str, int]:
+        """
+        Tally the aggregate points for each team, from parsed record tuples.
 
-    def build(self, input: m.FixtureListModel) -> m.RankingTableModel:
-        """Build a log table."""
+        This is the fused form of `tally()`: records go straight from the parser into
+        the points table, and no fixture models are created.
+        """
         table: dict[str, int] = defaultdict(int)
-        log_template = "{} {} {}: {} - {}"
-
-        for fixture in input.fixtures:
-            left, right = fixture.left, fixture.right
-
-            format_args = [
-                left.team.name,
-                "",
-                right.team.name,
-                left.score.value,
-                right.score.value,
-            ]
-
-            if left.score.value > right.score.value:
-                format_args[1] = "won"
-                table[left.team.name] += self.points_win
-                table[right.team.name] += self.points_loss
-            elif right.score.value > left.score.value:
-                format_args[1] = "lost"
-                table[left.team.name] += self.points_loss
-                table[right.team.name] += self.points_win
+        # Checked once, so that nothing is formatted per record unless INFO is enabled
+        trace = logger.isEnabledFor(logging.INFO)
+
+        for left_name, left_score, right_name, right_score in records:
+            if left_score > right_score:
+                outcome = "won"
+                table[left_name] += self.points_win
+                table[right_name] += self.points_loss
+            elif right_score > left_score:
+                outcome = "lost"
+                table[left_name] += self.points_loss
+                table[right_name] += self.points_win
             else:
-                format_args[1] = "drew"
-                table[left.team.name] += self.points_draw
-                table[right.team.name] += self.points_draw
+                outcome = "drew"
+                table[left_name] += self.points_draw
+                table[right_name] += self.points_draw
+
+            if trace:
+                logger.info(
+                    "%s %s %s: %s - %s",
+                    left_name,
+                    outcome,
+                    right_name,
+                    left_score,
+                    right_score,
+                )
+
+        return table
+
+    def tally_columns(self, fixtures: m.ColumnarFixtureListModel) -> dict[str, int]:
+        """
+        Tally the aggregate points for each team, from columnar fixtures.
+
+        If NumPy is installed, points are computed over whole columns at a time.
+        Otherwise, points are accumulated in a list indexed by team id, so no team
+        names are hashed in the loop. Both give the same result.
+        """
+        np = _numpy()
+        if np is not None:
+            return self._tally_columns_numpy(fixtures, np)
+
+        points = [0] * len(fixtures.teams)
+
+        for left_team, left_score, right_team, right_score in zip(
+            fixtures.left_teams,
+            fixtures.left_scores,
+            fixtures.right_teams,
+            fixtures.right_scores,
+            strict=True,
+        ):
+            if left_score > right_score:
+                points[left_team] += self.points_win
+                points[right_team] += self.points_loss
+            elif right_score > left_score:
+                points[left_team] += self.points_loss
+                points[right_team] += self.points_win
+            else:
+                points[left_team] += self.points_draw
+                points[right_team] += self.points_draw
+
+        return dict(zip(fixtures.teams, points, strict=True))
+
+    def _tally_columns_numpy(
+        self, fixtures: m.ColumnarFixtureListModel, np: t.Any
+    ) -> dict[str, int]:
+        """Tally columnar fixtures with NumPy, from win, loss and draw masks."""
+        left_teams, left_scores, right_teams, right_scores = (
+            np.frombuffer(column, dtype=column.typecode)
+            for column in (
+                fixtures.left_teams,
+                fixtures.left_scores,
+                fixtures.right_teams,
+                fixtures.right_scores,
+            )
+        )
+        won = left_scores > right_scores
+        lost = left_scores < right_scores
+        drew = ~(won | lost)
+
+        def count(mask: t.Any, teams: t.Any) -> t.Any:
+            """Count the fixtures that match a mask, for each team id."""
+            return np.bincount(teams[mask], minlength=len(fixtures.teams))
+
+        # Outcomes are counted, rather than points weighted, so that sums are exact
+        wins = count(won, left_teams) + count(lost, right_teams)
+        losses = count(lost, left_teams) + count(won, right_teams)
+        draws = count(drew, left_teams) + count(drew, right_teams)
+        points = (
+            wins * self.points_win
+            + losses * self.points_loss
+            + draws * self.points_draw
+        )
+
+        return dict(zip(fixtures.teams, points.tolist(), strict=True))
+
+    @staticmethod
+    def merge(tables: t.Iterable[t.Mapping[str, int]]) -> dict[str, int]:
+        """Merge partial points tables, by adding the points for each team."""
+        table: dict[str, int] = defaultdict(int)
+
+        for partial in tables:
+            for name, points in partial.items():
+                table[name] += points
 
-            logger.info(log_template.format(*format_args))
+        return table
 
+    @staticmethod
+    def create(table: t.Mapping[str, int]) -> m.RankingTableModel:
+        """Create a log table from a points table."""
         rankings = [
             m.RankModel(
                 team=m.TeamModel(name=k),
@@ -1,24 +1,38 @@
 """The CLI application entry point."""
 
+import contextlib
 import logging
 import os
+import sys
 import typing as t
 
 from io import TextIOWrapper
 
 import click
 
+from . import profiling
 from .config import LeagueRankerConfig
+from .context import RankingContext
 from .controllers import LeagueRankController
+from .errors import ProfileError, SnapshotError
 from .requests import CreateLogTableRequest
-from .views import CreateLogTableRequestView
+from .stats import REJECTS_BUFFER
+from .views import CreateLogTableRequestView, RankBatchView
+from .writers import BINARY_FORMATS, TEXT_FORMATS, pyarrow
 
 P = t.ParamSpec("P")
 
+LOG_LEVELS = [
+    logging.getLevelName(logging.DEBUG),
+    logging.getLevelName(logging.INFO),
+    logging.getLevelName(logging.WARNING),
+    logging.getLevelName(logging.ERROR),
+    logging.getLevelName(logging.CRITICAL),
+]
+OUTPUT_FORMATS = ["text", *TEXT_FORMATS, *BINARY_FORMATS]
 
-@click.command()  # type: ignore
-@click.argument("input", type=click.File(mode="r", encoding="locale"))
-@click.option(
+# Options that are shared between commands
+config_option = click.option(
     "--config",
     "-c",
     "config_path",
@@ -26,7 +40,7 @@ P = t.ParamSpec("P")
     help="Path to a configuration file",
     default=None,
 )
-@click.option(
+strict_option = click.option(
     "--strict",
     "-s",
     "strict_parse",
@@ -35,55 +49,349 @@ P = t.ParamSpec("P")
     default=None,
     help="Enable strict parsing. Input values will not be normalised.",
 )
+top_option = click.option(
+    "--top",
+    "-t",
+    type=click.IntRange(min=0),
+    default=None,
+    help="Print only the top ranked teams, and any teams tied with the last of them.",
+)
+log_level_option = click.option(
+    "--log-level",
+    "-l",
+    type=click.Choice(LOG_LEVELS, case_sensitive=True),
+    help="Sets the logger level.",
+    default=None,
+    show_default=True,
+)
+
+
+@click.command()  # type: ignore
+@click.argument("input", type=click.File(mode="r", encoding="locale"))
+@config_option
+@strict_option
 @click.option(
     "--verbose",
     "-v",
     is_flag=True,
     show_default=False,
     default=None,
-    help="Run verbosely (prints statistics at completion).",
+    help="Run verbosely (prints statistics and timings at completion).",
 )
 @click.option(
-    "--log-level",
-    "-l",
-    type=click.Choice(
-        [
-            logging.getLevelName(logging.DEBUG),
-            logging.getLevelName(logging.INFO),
-            logging.getLevelName(logging.WARNING),
-            logging.getLevelName(logging.ERROR),
-            logging.getLevelName(logging.CRITICAL),
-        ],
-        case_sensitive=True,
-    ),
-    help="Sets the logger level.",
+    "--workers",
+    "-w",
+    type=click.IntRange(min=1),
     default=None,
-    show_default=True,
+    help="Parse a file INPUT in parallel, using this many worker processes.",
+)
+@top_option
+@click.option(
+    "--resume",
+    "-r",
+    "snapshot",
+    type=click.Path(file_okay=True, dir_okay=False, writable=True),
+    default=None,
+    help="Resume from a snapshot file, parsing only input appended since it was "
+    "saved. The snapshot is created or updated.",
 )
+@click.option(
+    "--cache/--no-cache",
+    default=None,
+    help="Cache the ranking table for a file INPUT, or render a cached table.",
+)
+@click.option(
+    "--connect",
+    default=None,
+    metavar="ADDRESS",
+    help="Send INPUT to a ranking service (see `rank serve`), and print its response.",
+)
+@click.option(
+    "--format",
+    "-f",
+    "output_format",
+    type=click.Choice(OUTPUT_FORMATS),
+    default=None,
+    help="Output format of the ranking table. Arrow and Parquet need PyArrow.",
+)
+@click.option(
+    "--metrics",
+    type=click.Path(file_okay=True, dir_okay=False, writable=True),
+    default=None,
+    metavar="FILE",
+    help="Time each phase of the run, and write counts and timings to FILE, as JSON.",
+)
+@click.option(
+    "--rejects",
+    type=click.Path(file_okay=True, dir_okay=False, writable=True),
+    default=None,
+    metavar="FILE",
+    help="Write records that cannot be parsed to FILE, with their line numbers. "
+    "INPUT is parsed in one process.",
+)
+@click.option(
+    "--profile",
+    type=click.Choice(profiling.PROFILERS),
+    default=None,
+    help="Profile the ranking and rendering of the table, for CPU time (cprofile) or "
+    "memory allocations (tracemalloc). A summary is printed to stderr.",
+)
+@click.option(
+    "--profile-file",
+    type=click.Path(file_okay=True, dir_okay=False, writable=True),
+    default=None,
+    metavar="FILE",
+    help="File to write the profile to. Defaults to "
+    f"{profiling.FILENAMES['cprofile']} or {profiling.FILENAMES['tracemalloc']}.",
+)
+@log_level_option
 def cli(*args: P.args, **kwargs: P.kwargs) -> None:
     """
     Calculate and print the ranking table for a league.
 
-    INPUT should be a input file path, or '-' for stdin.
+    INPUT should be a input file path, or '-' for stdin. Give an INPUT named 'serve'
+    or 'batch' after '--', or as a path such as './serve'.
     """
     input = t.cast(TextIOWrapper, kwargs.pop("input"))  # This is the input file stream
+    snapshot = t.cast(str | None, kwargs.pop("snapshot"))  # Not a configuration value
+    connect = t.cast(str | None, kwargs.pop("connect"))  # Not a configuration value
+    profile = t.cast(str | None, kwargs.pop("profile"))  # Not a configuration value
+    profile_file = t.cast(str | None, kwargs.pop("profile_file"))
+
+    path = getattr(input, "name", None)  # Only a file on disk is memory-mapped
+    if not (isinstance(path, str) and os.path.isfile(path)):
+        path = None
+
+    if snapshot is not None and path is None:
+        raise click.BadOptionUsage("snapshot", "--resume requires a file INPUT.")
+
+    if profile_file is not None and profile is None:
+        raise click.BadOptionUsage("profile_file", "--profile-file requires --profile.")
 
     # If set, let cli args override env, file values
     config = LeagueRankerConfig.create(
         {k: v for k, v in kwargs.items() if v is not None}
-    )
+    ).snapshot()
+    context = RankingContext.create(config)
 
-    click.echo()
-    if config.get_bool("strict_parse", False):
+    if config.output_format not in OUTPUT_FORMATS:  # It may be set in a config file
+        raise click.BadParameter(
+            f"Unknown output format '{config.output_format}'. "
+            f"Choose from {', '.join(OUTPUT_FORMATS)}.",
+            param_hint="--format",
+        )
+    if config.output_format in BINARY_FORMATS and pyarrow() is None:
+        raise click.BadParameter(
+            f"{config.output_format} output needs PyArrow. "
+            "Install it with `pip install league-ranker[arrow]`.",
+            param_hint="--format",
+        )
+
+    text = config.output_format == "text"  # Otherwise, keep messages out of stdout
+    if text:
+        click.echo()
+    if config.strict_parse:
         click.secho(
             f"Note: Strict parsing is enabled.{os.linesep}",
             fg="red",
             bold=True,
+            err=not text,
+        )
+
+    profiler = None if profile is None else profiling.create(profile, profile_file)
+
+    try:
+        with contextlib.ExitStack() as stack:
+            if profiler is not None:
+                stack.enter_context(profiler)
+            if config.rejects:
+                file = stack.enter_context(_open_rejects(config.rejects))
+                stack.enter_context(context.stats.rejects(file))
+
+            _render(input, path, snapshot=snapshot, connect=connect, context=context)
+    except (ProfileError, SnapshotError) as e:
+        raise click.ClickException(str(e)) from None
+
+    if profiler is not None:
+        click.echo(f"{os.linesep}{profiler.summary}", err=True)
+
+    if config.metrics:
+        _write_metrics(path=config.metrics, context=context)
+
+
+@click.command()  # type: ignore
+@click.argument("address")
+@config_option
+@strict_option
+@log_level_option
+def serve(*args: P.args, **kwargs: P.kwargs) -> None:
+    """
+    Run a ranking service, until interrupted.
+
+    ADDRESS should be a Unix domain socket path, or a host:port for a TCP socket.
+    """
+    from . import service
+
+    address = t.cast(str, kwargs.pop("address"))
+
+    LeagueRankerConfig.create({k: v for k, v in kwargs.items() if v is not None})
+
+    with service.create_server(address) as server:
+        click.echo(f"Serving on {address}. Press Ctrl+C to stop.")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+
+@click.command()  # type: ignore
+@click.argument(
+    "inputs",
+    nargs=-1,
+    required=True,
+    type=click.Path(exists=True, file_okay=True, dir_okay=False),
+)
+@click.option(
+    "--output-dir",
+    "-o",
+    type=click.Path(file_okay=False, dir_okay=True, writable=True),
+    default=".",
+    show_default=True,
+    help="Directory to write ranking tables to.",
+)
+@click.option(
+    "--jobs",
+    "-j",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Number of worker processes. Defaults to the number of CPUs.",
+)
+@config_option
+@strict_option
+@top_option
+@log_level_option
+def batch(*args: P.args, **kwargs: P.kwargs) -> None:
+    """
+    Calculate the ranking tables for many leagues, and write each to a file.
+
+    INPUTS should be input file paths, one per league. The ranking table for each is
+    written to a file of the same name with an '.out' extension, in the output
+    directory.
+    """
+    import asyncio
+
+    from . import batches
+
+    inputs = t.cast(tuple[str, ...], kwargs.pop("inputs"))
+    output_dir = t.cast(str, kwargs.pop("output_dir"))
+    jobs = t.cast(int | None, kwargs.pop("jobs")) or os.cpu_count() or 1
+
+    outputs = [batches.output_path(path, output_dir) for path in inputs]
+    if len(set(outputs)) < len(outputs):
+        raise click.BadParameter("File names must be unique.", param_hint="INPUTS")
+
+    config = LeagueRankerConfig.create(
+        {k: v for k, v in kwargs.items() if v is not None}
+    ).snapshot()
+
+    results = asyncio.run(
+        batches.rank_leagues(
+            list(inputs), output_dir, jobs=jobs, top=config.top, config=config
         )
+    )
+    RankBatchView.render(results)
+
+    if any(result.error is not None for result in results):
+        raise click.exceptions.Exit(1)
+
 
-    request = CreateLogTableRequest(data=input.read())
+def main() -> None:
+    """
+    The `rank` command entry point.
+
+    `rank serve ...` runs the ranking service, and `rank batch ...` ranks a batch of
+    leagues. Anything else runs the `cli` command, so that `rank -- serve` ranks an
+    INPUT file named `serve`.
+    """
+    args = sys.argv[1:]
+
+    if args[:1] == ["serve"]:
+        serve(args[1:], prog_name="rank serve")
+    elif args[:1] == ["batch"]:
+        batch(args[1:], prog_name="rank batch")
+    else:
+        cli(args, prog_name="rank")
 
-    controller = LeagueRankController()
+
+def _render(
+    input: TextIOWrapper,
+    path: str | None,
+    snapshot: str | None,
+    connect: str | None,
+    context: RankingContext,
+) -> None:
+    """Create and render the ranking table for the input, or for a ranking service."""
+    if connect is not None:
+        return _render_remote(address=connect, data=input.read(), context=context)
+
+    request = CreateLogTableRequest(
+        data=input,  # Input is read line by line
+        path=path,
+        workers=context.config.workers,
+        top=context.config.top,
+        snapshot=snapshot,
+        cache_dir=context.config.cache_dir if context.config.cache else None,
+    )
+
+    controller = LeagueRankController(context=context)
     response = controller.create_log_table(request=request)
 
-    return CreateLogTableRequestView.render(response)
+    return CreateLogTableRequestView.render(response, context=context)
+
+
+def _render_remote(address: str, data: str, context: RankingContext) -> None:
+    """Send input data to a ranking service, and render its response."""
+    from . import service
+
+    try:
+        response = service.request(address, data=data, top=context.config.top)
+    except OSError as e:
+        raise click.ClickException(f"Could not connect to {address}: {e}") from None
+    except ValueError:  # Such as no reply, or a reply that is not JSON
+        raise click.ClickException(f"Invalid response from {address}") from None
+
+    try:
+        if "error" in response:
+            raise click.ClickException(response["error"])
+
+        stats = {name: int(value) for name, value in response["stats"].items()}
+        table = service.load_table(response["rankings"])
+    except (KeyError, TypeError, ValueError, AttributeError):
+        raise click.ClickException(f"Invalid response from {address}") from None
+
+    for name, value in stats.items():
+        context.stats.incr(name, value)
+
+    return CreateLogTableRequestView.render(table, context=context)
+
+
+def _open_rejects(path: str) -> t.TextIO:
+    """Open a file to write rejected records to, with a large buffer."""
+    try:
+        return open(path, "w", encoding="utf-8", buffering=REJECTS_BUFFER)
+    except OSError as e:
+        raise click.ClickException(
+            f"Could not write rejected records to {path}: {e}"
+        ) from None
+
+
+def _write_metrics(path: str, context: RankingContext) -> None:
+    """Write the counts and timings of a run to a file, as JSON."""
+    import json
+
+    try:
+        with open(path, "w") as file:
+            json.dump(context.stats.metrics(), file, indent=2)
+            file.write("\n")
+    except OSError as e:
+        raise click.ClickException(f"Could not write metrics to {path}: {e}") from None
@@ -1,44 +1,123 @@
-"""Models are data containers."""
+"""
+Models are data containers.
+
+Models are slotted, so that instances have no `__dict__`. Where a model's attributes
+are never reassigned, it is also frozen.
+"""
 # ruff: noqa: D101 Missing docstring in public class
 
-from dataclasses import dataclass
+import typing as t
+
+from array import array
+from dataclasses import dataclass, field
+
+# A parsed record, as a plain tuple: left name, left score, right name, right score
+FixtureRecord: t.TypeAlias = tuple[str, int, str, int]
+
+MAX_SCORE: t.Final = 2**64 - 1  # The largest score held by a columnar fixture list
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class TeamModel:
     name: str
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ScoreModel:
     value: int
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ResultModel:
     team: TeamModel
     score: ScoreModel
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class FixtureModel:
     left: ResultModel
     right: ResultModel
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class FixtureListModel:
     fixtures: list[FixtureModel]
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
+class ColumnarFixtureListModel:
+    """
+    Fixtures stored as columns of team ids and scores, in contiguous arrays.
+
+    Each team name is stored once, in `teams`, which maps a name to its id. Ids are
+    assigned in order of first appearance. Columns are `array` instances, that support
+    the buffer protocol (for example, `memoryview(model.left_scores)`). Team ids are
+    `array("I")`, and scores `array("Q")`, that hold scores of up to `MAX_SCORE`.
+
+    Iterating yields `FixtureModel` instances, for compatibility with
+    `FixtureListModel.fixtures`.
+    """
+
+    teams: dict[str, int] = field(default_factory=dict)
+    left_teams: "array[int]" = field(default_factory=lambda: array("I"))
+    left_scores: "array[int]" = field(default_factory=lambda: array("Q"))
+    right_teams: "array[int]" = field(default_factory=lambda: array("I"))
+    right_scores: "array[int]" = field(default_factory=lambda: array("Q"))
+
+    def append(self, record: FixtureRecord) -> None:
+        """
+        Append a parsed record.
+
+        If a score is greater than `MAX_SCORE`, an OverflowError is raised, and nothing
+        is appended.
+        """
+        left_name, left_score, right_name, right_score = record
+        teams = self.teams
+
+        if left_score > MAX_SCORE or right_score > MAX_SCORE:
+            raise OverflowError(f"Score is greater than {MAX_SCORE}: {record}")
+
+        self.left_teams.append(teams.setdefault(left_name, len(teams)))
+        self.left_scores.append(left_score)
+        self.right_teams.append(teams.setdefault(right_name, len(teams)))
+        self.right_scores.append(right_score)
+
+    def extend(self, records: t.Iterable[FixtureRecord]) -> None:
+        """Append parsed records."""
+        for record in records:
+            self.append(record)
+
+    def __len__(self) -> int:
+        """Return the number of fixtures."""
+        return len(self.left_teams)
+
+    def __iter__(self) -> t.Iterator[FixtureModel]:
+        """Yield a `FixtureModel` for each fixture."""
+        teams = [TeamModel(name=name) for name in self.teams]  # Indexed by id
+
+        for left_team, left_score, right_team, right_score in zip(
+            self.left_teams,
+            self.left_scores,
+            self.right_teams,
+            self.right_scores,
+            strict=True,
+        ):
+            yield FixtureModel(
+                left=ResultModel(team=teams[left_team], score=ScoreModel(left_score)),
+                right=ResultModel(
+                    team=teams[right_team], score=ScoreModel(right_score)
+                ),
+            )
+
+
+@dataclass(frozen=True, slots=True)
 class RankAggregateModel:
     """Points aggregated in ranking table."""
 
     value: int
 
 
-@dataclass
+@dataclass(slots=True)
 class RankOrderModel:
     """
     Order in ranking table, based on aggregate points.
@@ -49,13 +128,35 @@ class RankOrderModel:
     value: int = 0
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class RankModel:
     team: TeamModel
     aggregate: RankAggregateModel
     order: RankOrderModel
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class RankingTableModel:
     rankings: list[RankModel]
+
+
+@dataclass(frozen=True, slots=True)
+class SnapshotModel:
+    """The aggregated state of the records in a prefix of an input file."""
+
+    table: dict[str, int]  # Aggregate points, by team name
+    stats: dict[str, int]  # Record counts
+    offset: int  # The end of the prefix, in bytes
+    line: int  # The number of the line that starts at the offset
+    digest: str  # A digest of the bytes just before the offset
+    settings: dict[str, t.Any]  # The configuration that records were tallied with
+
+
+@dataclass(frozen=True, slots=True)
+class LeagueResultModel:
+    """The result of ranking one league, in a batch of leagues."""
+
+    input: str  # The input file path
+    output: str  # The output file path
+    stats: dict[str, int]  # Record counts
+    error: str | None = None  # Set if the league could not be ranked
@@ -4,16 +4,19 @@ Parsers understand a defined input data format.
 They are able to convert input data to a model structure.
 """
 import logging
+import mmap
 import re
+import sys
 import typing as t
 
 from . import errors as err
 from . import models as m
-from .config import LeagueRankerConfig
-from .stats import LeagueRankerStats
+from .context import RankingContext
 
 logger = logging.getLogger(__name__)
 
+Buffer: t.TypeAlias = bytes | bytearray | mmap.mmap
+
 
 class LeagueRankerParser:
     r"""
@@ -29,42 +32,189 @@ class LeagueRankerParser:
         "The Lions 3, Snakes 3"
     """
 
-    _PATTERN: t.Final = r"^(\D*) (\d+),(\D*) (\d+)$"
+    _PATTERN: t.Final = re.compile(r"^(\D*) (\d+),(\D*) (\d+)$")
+    _SEPARATOR: t.Final = re.compile(r"\r\n|\n|\r")  # Record separator
+    # A run of characters that are not alphanumeric or comma, or are underscore.
+    # This is a single-pass equivalent to substituting `[^\w ,]+` and then `[\s\_]+`.
+    _NORMALISE: t.Final = re.compile(r"(?:[^\w,]|_)+")
+    _BYTES_SEPARATOR: t.Final = re.compile(rb"\r\n|\n|\r")
+    # A record of ASCII team names and scores that is already in normal form.
+    # Matching this in either parse mode gives the same groups as `match()`.
+    _BYTES_NORMAL: t.Final = re.compile(
+        rb"([A-Za-z]+(?: [A-Za-z]+)*) (\d+), ?([A-Za-z]+(?: [A-Za-z]+)*) (\d+)"
+    )
 
-    def __init__(self) -> None:
-        """The constructor."""
-        self._stats = LeagueRankerStats()
-        self._strict_parse = LeagueRankerConfig().get_bool("strict_parse", False)
+    def __init__(self, context: RankingContext | None = None) -> None:
+        """
+        The constructor.
+
+        Configuration is read from, and record counts are kept in, the given `context`,
+        or the default context.
+        """
+        self._context = RankingContext.default() if context is None else context
+        self._stats = self._context.stats
+        self._strict_parse = self._context.config.strict_parse
 
     def parse(self, data: str) -> m.FixtureListModel:
         """Parse request input data."""
-        results = []
-        for line, record in enumerate(re.split(r"\r\n|\n|\r", data)):
-            self._stats.incr("read")
-            try:
-                groups = self.match(record=record, line=line + 1)
-
-            except err.RecordParseError as e:
-                logger.warning(str(e))
-                self._stats.incr("error")
-
-                continue  # Skip to next record on error
-
-            result = m.FixtureModel(
-                left=m.ResultModel(
-                    team=m.TeamModel(name=str(groups[0]).strip()),
-                    score=m.ScoreModel(value=int(groups[1])),
-                ),
-                right=m.ResultModel(
-                    team=m.TeamModel(name=str(groups[2]).strip()),
-                    score=m.ScoreModel(value=int(groups[3])),
-                ),
-            )
-
-            self._stats.incr("parsed")
-            results.append(result)
-
-        return m.FixtureListModel(fixtures=results)
+        return m.FixtureListModel(fixtures=list(self.iterparse(data=data)))
+
+    def parse_columnar(
+        self, data: str | t.Iterable[str], line: int = 1
+    ) -> m.ColumnarFixtureListModel:
+        """
+        Parse request input data into a columnar fixture list.
+
+        Records with a score that a columnar fixture list cannot hold are rejected.
+        """
+        fixtures = m.ColumnarFixtureListModel()
+        fixtures.extend(self.iterrecords(data=data, line=line, max_score=m.MAX_SCORE))
+
+        return fixtures
+
+    def iterparse(
+        self, data: str | t.Iterable[str], line: int = 1
+    ) -> t.Iterator[m.FixtureModel]:
+        """
+        Lazily parse request input data, yielding a model for each valid record.
+
+        See `iterrecords()`.
+        """
+        for record in self.iterrecords(data=data, line=line):
+            yield self._fixture(*record)
+
+    def iterrecords(
+        self, data: str | t.Iterable[str], line: int = 1, max_score: int | None = None
+    ) -> t.Iterator[m.FixtureRecord]:
+        """
+        Lazily parse request input data, yielding a tuple for each valid record.
+
+        Input may be a string, or any iterable of lines (such as an open file object).
+        Records are read one at a time, so memory use does not grow with input size.
+        Lines are numbered from `line`. The time taken to split or read lines is timed
+        as the `read` phase. Records that cannot be parsed are rejected, in the stats.
+        Counts of records read and parsed are added to the stats when parsing ends. If
+        `max_score` is given, records with a greater score are rejected as invalid.
+        """
+        if isinstance(data, str):
+            with self._stats.timer("read"):
+                records: t.Iterable[str] = self._SEPARATOR.split(data)
+        else:
+            records = self._stats.iter("read", data)
+
+        read = parsed = 0  # Counted in locals, so the stats lock is taken once
+        debug = logger.isEnabledFor(logging.DEBUG)
+
+        try:
+            for number, record in enumerate(records, start=line):
+                read += 1
+                record = record.rstrip("\r\n")
+                try:
+                    groups = self.match(record=record, line=number)
+                    left_score, right_score = int(groups[1]), int(groups[3])
+
+                    if (
+                        max_score is not None
+                        and max(left_score, right_score) > max_score
+                    ):
+                        raise err.InvalidRecordError(record, number)
+
+                except err.RecordParseError as e:
+                    if debug:  # Rejects are summarised at the end of a run
+                        logger.debug("%s", e)
+                    self._stats.reject(e.category, record, number)
+
+                    continue  # Skip to next record on error
+
+                left_name, right_name = groups[0], groups[2]
+
+                parsed += 1
+                # Team names are interned, so that each distinct name is stored once
+                yield sys.intern(left_name), left_score, sys.intern(
+                    right_name
+                ), right_score
+        finally:
+            self._stats.incr("read", read)
+            self._stats.incr("parsed", parsed)
+
+    def iterparse_buffer(
+        self,
+        data: Buffer,
+        start: int = 0,
+        end: int | None = None,
+        line: int = 1,
+        encoding: str = "utf-8",
+    ) -> t.Iterator[m.FixtureModel]:
+        """
+        Lazily parse records in a byte range of a buffer, yielding a model for each.
+
+        See `iterrecords_buffer()`.
+        """
+        records = self.iterrecords_buffer(data, start, end, line, encoding)
+        for record in records:
+            yield self._fixture(*record)
+
+    def iterrecords_buffer(
+        self,
+        data: Buffer,
+        start: int = 0,
+        end: int | None = None,
+        line: int = 1,
+        encoding: str = "utf-8",
+    ) -> t.Iterator[m.FixtureRecord]:
+        """
+        Lazily parse records in a byte range of a buffer, such as a memory-mapped file.
+
+        Records are scanned in place. If a record is already in normal form, then only
+        its team names are decoded; other records are decoded and matched as strings.
+        A tuple is yielded for each valid record. Lines are numbered from `line`. Counts
+        of records read and parsed are added to the stats when parsing ends.
+        """
+        end = len(data) if end is None else end
+        number = line - 1
+        read = parsed = 0  # Counted in locals, so the stats lock is taken once
+        debug = logger.isEnabledFor(logging.DEBUG)
+
+        try:
+            while start < end:
+                separator = self._BYTES_SEPARATOR.search(data, start, end)
+                stop, next_start = (end, end) if separator is None else separator.span()
+                start, record_start = next_start, start
+                number += 1
+
+                read += 1
+                normal = self._BYTES_NORMAL.fullmatch(data, record_start, stop)
+
+                if normal is not None:  # Only team names need to be decoded
+                    left_name = normal[1].decode(encoding)
+                    right_name = normal[3].decode(encoding)
+                    left_score, right_score = int(normal[2]), int(normal[4])
+                else:
+                    try:
+                        record = data[record_start:stop].decode(encoding)
+                        groups = self.match(record=record, line=number)
+
+                    except err.RecordParseError as e:
+                        if debug:  # Rejects are summarised at the end of a run
+                            logger.debug("%s", e)
+                        self._stats.reject(e.category, record, number)
+
+                        continue  # Skip to next record on error
+
+                    left_name, right_name = groups[0], groups[2]
+                    left_score, right_score = int(groups[1]), int(groups[3])
+
+                parsed += 1
+                # Team names are interned, so that each distinct name is stored once
+                yield (
+                    sys.intern(left_name),
+                    left_score,
+                    sys.intern(right_name),
+                    right_score,
+                )
+        finally:
+            self._stats.incr("read", read)
+            self._stats.incr("parsed", parsed)
 
     def match(self, record: str, line: int = 0) -> tuple[str, ...]:
         """
@@ -79,20 +229,33 @@ class LeagueRankerParser:
             - Reduce consecutive spaces to a single space
             - Strip leading and trailing spaces
             """
-            record = re.sub(r"[^\w ,]+", " ", record)
-            record = re.sub(r"[\s\_]+", " ", record)
-            record = record.strip()
+            record = self._NORMALISE.sub(" ", record).strip()
 
         if not record:
-            raise err.RecordParseError(f"Unusable record: '{record}' at line {line}")
+            raise err.UnusableRecordError(record, line)
 
-        match = re.match(self._PATTERN, record)
+        match = self._PATTERN.match(record)
 
         if not match:
-            raise err.RecordParseError(
-                f"Invalid record format: '{record}' at line {line}"
-            )
+            raise err.InvalidRecordError(record, line)
+
+        left_name, left_score, right_name, right_score = match.groups()
 
-        groups = match.groups()
+        # Only team names may have surrounding spaces; scores are digits only
+        return (left_name.strip(), left_score, right_name.strip(), right_score)
 
-        return tuple([str(group).strip() for group in groups])  # Keep mypy happy ...
+    @staticmethod
+    def _fixture(
+        left_name: str, left_score: int, right_name: str, right_score: int
+    ) -> m.FixtureModel:
+        """Create a fixture model."""
+        return m.FixtureModel(
+            left=m.ResultModel(
+                team=m.TeamModel(name=left_name),
+                score=m.ScoreModel(value=left_score),
+            ),
+            right=m.ResultModel(
+                team=m.TeamModel(name=right_name),
+                score=m.ScoreModel(value=right_score),
+            ),
+        )
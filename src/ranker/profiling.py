@@ -0,0 +1,175 @@
+"""
+Profilers capture a CPU profile, or a snapshot of memory allocations, of a ranking run.
+
+A profiler is a context manager. On exit, it writes its profile to a file, and keeps a
+short summary of it to print:
+
+- `cprofile` writes a `cProfile` profile, that may be read with `pstats` or a viewer
+  such as `snakeviz`. The summary lists the functions with the most self time, which
+  excludes the time of the functions they call.
+- `tracemalloc` writes a report of the source lines that allocated the most memory,
+  and are still holding it. The summary has the peak of traced memory, and the top
+  lines of the report.
+
+Only the current process is profiled, and not any worker processes.
+"""
+from __future__ import annotations
+
+import abc
+import typing as t
+
+from .errors import ConfigurationError, ProfileError
+
+if t.TYPE_CHECKING:
+    from types import TracebackType
+
+PROFILERS: t.Final = ("cprofile", "tracemalloc")
+FILENAMES: t.Final = {"cprofile": "rank.prof", "tracemalloc": "rank-allocations.txt"}
+TOP = 25  # The number of lines in an allocation report
+SUMMARY_TOP = 5  # The number of lines in a summary
+
+
+class Profiler(abc.ABC):
+    """Profile the code run in the context, and write the profile to a file on exit."""
+
+    def __init__(self, path: str, top: int = TOP) -> None:
+        self.path = path
+        self.top = top
+        self.summary = ""  # Set on exit
+
+    def __enter__(self) -> Profiler:
+        """Start profiling."""
+        self.start()
+
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """
+        Stop profiling, and write the profile, even if the run failed.
+
+        If the profile cannot be written, a ProfileError is raised.
+        """
+        try:
+            self.summary = self.stop()
+        except OSError as e:
+            raise ProfileError(f"Could not write profile to {self.path}: {e}") from None
+
+    @abc.abstractmethod
+    def start(self) -> None:
+        """Start profiling."""
+
+    @abc.abstractmethod
+    def stop(self) -> str:
+        """Stop profiling, write the profile, and return a summary of it."""
+
+
+class CPUProfiler(Profiler):
+    """Capture a CPU profile, with `cProfile`."""
+
+    def start(self) -> None:
+        """Start profiling."""
+        import cProfile
+
+        self._profile = cProfile.Profile()
+        self._profile.enable()
+
+    def stop(self) -> str:
+        """Stop profiling, write the profile, and return a summary of it."""
+        import pstats
+
+        self._profile.disable()
+        self._profile.dump_stats(self.path)
+
+        stats = pstats.Stats(self._profile)  # Its attributes are not in type stubs
+        total_calls, total_time = stats.total_calls, stats.total_tt  # type: ignore
+        functions = sorted(
+            stats.stats.items(),  # type: ignore[attr-defined]
+            key=lambda item: item[1][2],  # By self time
+            reverse=True,
+        )[:SUMMARY_TOP]
+
+        lines = [
+            f"CPU profile written to {self.path} "
+            f"({total_calls} calls in {total_time:.3f} s)",
+            f"{'self':>10} {'cumulative':>12} {'calls':>10}  function",
+        ]
+        for (file, line, name), (_, calls, self_time, cumulative, _) in functions:
+            lines.append(
+                f"{self_time:8.3f} s {cumulative:10.3f} s {calls:10}  "
+                f"{name} ({file}:{line})"
+            )
+
+        return "\n".join(lines)
+
+
+class AllocationProfiler(Profiler):
+    """Capture a snapshot of memory allocations, with `tracemalloc`."""
+
+    def start(self) -> None:
+        """Start tracing memory allocations."""
+        import tracemalloc
+
+        tracemalloc.start()
+
+    def stop(self) -> str:
+        """Stop tracing, write an allocation report, and return a summary of it."""
+        import tracemalloc
+
+        _, peak = tracemalloc.get_traced_memory()
+        snapshot = tracemalloc.take_snapshot()
+        tracemalloc.stop()
+
+        snapshot = snapshot.filter_traces(
+            [
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+            ]
+        )
+        statistics = snapshot.statistics("lineno")
+        total = sum(stat.size for stat in statistics)
+        report = [
+            f"{stat.size / 1024:10.1f} KiB {stat.count:10} blocks  {stat.traceback}"
+            for stat in statistics[: self.top]
+        ]
+
+        with open(self.path, "w") as file:
+            file.write(
+                f"Peak traced memory: {peak / 1024:.1f} KiB\n"
+                f"Memory held at the end: {total / 1024:.1f} KiB\n"
+                f"Top {len(report)} lines by memory held:\n"
+            )
+            file.writelines(f"{line}\n" for line in report)
+
+        return "\n".join(
+            [
+                f"Allocation report written to {self.path} "
+                f"(peak traced memory {peak / 1024:.1f} KiB)",
+                *report[:SUMMARY_TOP],
+            ]
+        )
+
+
+def create(name: str, path: str | None = None, top: int = TOP) -> Profiler:
+    """
+    Create a named profiler, that writes its profile to `path`.
+
+    If no path is given, the profile is written to a file in the current directory,
+    named for the profiler.
+    """
+    profilers: dict[str, type[Profiler]] = {
+        "cprofile": CPUProfiler,
+        "tracemalloc": AllocationProfiler,
+    }
+
+    try:
+        profiler = profilers[name]
+    except KeyError:
+        raise ConfigurationError(f"Unknown profiler '{name}'") from None
+
+    return profiler(path=FILENAMES[name] if path is None else path, top=top)
@@ -0,0 +1,79 @@
+"""
+Readers give access to the content of input files.
+
+A file is memory-mapped, so that records can be scanned as bytes, straight from the
+operating system's page cache, without first being decoded and copied to a string.
+"""
+from __future__ import annotations
+
+import contextlib
+import locale
+import mmap
+import typing as t
+
+if t.TYPE_CHECKING:
+    from . import models as m
+    from .parsers import Buffer, LeagueRankerParser
+
+# The ASCII characters that `str.strip()` removes
+_WHITESPACE: t.Final = b" \t\n\r\x0b\x0c\x1c\x1d\x1e\x1f"
+
+Span: t.TypeAlias = tuple[int, int]  # A (start, end) byte range
+
+
+@contextlib.contextmanager
+def mapped(path: str) -> t.Iterator[Buffer]:
+    """Memory-map the file at `path` for reading. An empty file gives empty bytes."""
+    with open(path, "rb") as file:
+        if not file.seek(0, 2):
+            yield b""  # An empty file cannot be mapped
+            return
+
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            yield data
+
+
+def content_span(data: Buffer) -> Span:
+    """
+    Return the byte range of content in the buffer.
+
+    This is the equivalent of `str.strip()`: leading and trailing blank space is
+    excluded.
+    """
+    start, end = 0, len(data)
+    while start < end and data[start] in _WHITESPACE:
+        start += 1
+    while end > start and data[end - 1] in _WHITESPACE:
+        end -= 1
+
+    return start, end
+
+
+def encoding() -> str:
+    """Return the encoding of input files (the locale encoding)."""
+    return locale.getpreferredencoding(False)
+
+
+def iterparse_file(parser: LeagueRankerParser, path: str) -> t.Iterator[m.FixtureModel]:
+    """Lazily parse the content of the file at `path`, yielding a model per record."""
+    with mapped(path) as data:
+        start, end = content_span(data)
+
+        yield from parser.iterparse_buffer(data, start, end, encoding=encoding())
+
+
+def iterrecords_file(
+    parser: LeagueRankerParser, path: str
+) -> t.Iterator[m.FixtureRecord]:
+    """
+    Lazily parse the content of the file at `path`, yielding a tuple per record.
+
+    Mapping the file is timed as the `read` phase. Pages of the file are read as they
+    are parsed, so most of the time taken to read them is in the `parse` phase.
+    """
+    with contextlib.ExitStack() as stack:
+        with parser._stats.timer("read"):
+            data = stack.enter_context(mapped(path))
+            start, end = content_span(data)
+
+        yield from parser.iterrecords_buffer(data, start, end, encoding=encoding())
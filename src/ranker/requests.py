@@ -1,13 +1,72 @@
 """Request are an abstraction between the user interface and the controller."""
+import typing as t
+
 from dataclasses import dataclass
 
 
 @dataclass
 class CreateLogTableRequest:
-    """Request for Log Table model."""
+    """
+    Request for Log Table model.
+
+    Input `data` may be given as a string, or as any iterable of lines (such as an
+    open file object). An iterable is consumed lazily, one line at a time.
+
+    If the `path` of an input file is given, the file is memory-mapped and read in
+    place of `data`. It may also be split between a number of `workers` processes.
+
+    If the path of a `snapshot` file is given, then a file input is resumed from the
+    snapshot, and the snapshot is updated.
 
-    data: str
+    If a `cache_dir` is given, then the log table for a file input is cached in that
+    directory.
+
+    If `top` is given, only the top ranked teams (and any teams tied with the last of
+    them) are included in the log table.
+    """
+
+    data: str | t.Iterable[str]
+    path: str | None = None
+    workers: int = 1
+    top: int = 0  # All teams
+    snapshot: str | None = None
+    cache_dir: str | None = None
 
     def __post_init__(self) -> None:
         """Strip leading and ending spaces from data."""
-        self.data = self.data.strip()
+        if isinstance(self.data, str):
+            self.data = self.data.strip()
+        else:
+            self.data = _strip_lines(self.data)
+
+
+def _strip_lines(lines: t.Iterable[str]) -> t.Iterator[str]:
+    """
+    Lazily strip leading and ending spaces from an iterable of lines.
+
+    This is the line-by-line equivalent of `str.strip()`: blank lines at the start and
+    end of input are dropped, the first and last lines are stripped, and line endings
+    are removed. Only blank lines are held back, until it is known whether they are at
+    the end.
+    """
+    previous: str | None = None  # The last non-blank line seen
+    blanks: list[str] = []  # Blank lines seen since `previous`
+
+    for line in lines:
+        line = line.rstrip("\r\n")
+        if not line.strip():
+            if previous is not None:
+                blanks.append(line)
+            continue
+
+        if previous is None:
+            line = line.lstrip()
+        else:
+            yield previous
+            yield from blanks
+            blanks.clear()
+
+        previous = line
+
+    if previous is not None:
+        yield previous.rstrip()
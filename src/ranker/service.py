@@ -0,0 +1,162 @@
+r"""
+A long-running ranking service, with a socket API.
+
+The service reads its configuration once, so that each request only pays for parsing
+and ranking. It listens on a Unix domain socket, or on a TCP socket if the address is
+given as `host:port`. Each connection is handled in its own thread, and each request
+is ranked in its own context, so record counts are never mixed between requests.
+
+Requests and responses are JSON objects, one per line. A request holds fixture `data`
+in the input format, and optionally a number of `top` teams:
+
+```
+{"data": "Lions 3, Snakes 3\nTarantulas 1, FC Awesome 0", "top": 0}
+```
+
+A response holds the ranked table, and the record counts for the request:
+
+```
+{"rankings": [{"order": 1, "team": "Tarantulas", "aggregate": 3}, ...],
+ "stats": {"read": 2, "parsed": 2, "error": 0}}
+```
+
+If a request cannot be read, the response holds an `error` message instead.
+"""
+from __future__ import annotations
+
+import contextlib
+import json
+import logging
+import os
+import socket
+import socketserver
+import typing as t
+
+from . import models as m
+from .config import LeagueRankerConfig
+from .context import RankingContext
+from .controllers import LeagueRankController
+from .requests import CreateLogTableRequest
+
+logger = logging.getLogger(__name__)
+
+Address: t.TypeAlias = str | tuple[str, int]  # A socket path, or a (host, port)
+
+_COUNTS: t.Final = ("read", "parsed", "error")
+
+
+def parse_address(address: str) -> Address:
+    """Return a `(host, port)` for a `host:port` address, or else a socket path."""
+    host, _, port = address.rpartition(":")
+    if host and port.isdigit():
+        return host, int(port)
+
+    return address
+
+
+class RankService:
+    """A ranking service, that answers each request in its own ranking context."""
+
+    def __init__(self) -> None:
+        self._config = LeagueRankerConfig().snapshot()
+
+    def handle(self, payload: str | bytes) -> dict[str, t.Any]:
+        """Answer a JSON request, with a JSON-serialisable response."""
+        try:
+            content = json.loads(payload)
+            request = CreateLogTableRequest(
+                data=str(content["data"]), top=int(content.get("top", 0))
+            )
+        except (ValueError, TypeError, KeyError, AttributeError) as e:
+            return {"error": f"Invalid request: {e!r}"}
+
+        context = RankingContext(config=self._config)
+        table = LeagueRankController(context=context).create_log_table(request=request)
+
+        return {
+            "rankings": dump_table(table),
+            "stats": {name: context.stats[name] for name in _COUNTS},
+        }
+
+
+class RankRequestHandler(socketserver.StreamRequestHandler):
+    """Answer each request line on a connection with a response line."""
+
+    def handle(self) -> None:
+        """Handle a connection."""
+        service = t.cast(UnixRankServer | TCPRankServer, self.server).service
+
+        for line in self.rfile:
+            response = service.handle(line)
+            self.wfile.write(json.dumps(response).encode() + b"\n")
+
+
+class UnixRankServer(socketserver.ThreadingUnixStreamServer):
+    """A ranking service server, on a Unix domain socket."""
+
+    daemon_threads = True
+
+    def __init__(self, address: str, service: RankService) -> None:
+        super().__init__(address, RankRequestHandler)
+        self.service = service
+
+    def server_close(self) -> None:
+        """Close the server, and remove its socket file."""
+        super().server_close()
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(t.cast(str, self.server_address))
+
+
+class TCPRankServer(socketserver.ThreadingTCPServer):
+    """A ranking service server, on a TCP socket."""
+
+    allow_reuse_address = True
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], service: RankService) -> None:
+        super().__init__(address, RankRequestHandler)
+        self.service = service
+
+
+def create_server(address: str) -> UnixRankServer | TCPRankServer:
+    """Create a ranking service server, listening on an address."""
+    parsed = parse_address(address)
+    if isinstance(parsed, tuple):
+        return TCPRankServer(parsed, RankService())
+
+    return UnixRankServer(parsed, RankService())
+
+
+def request(address: str, data: str, top: int = 0) -> dict[str, t.Any]:
+    """Send a request to a ranking service, and return its response."""
+    parsed = parse_address(address)
+    family = socket.AF_INET if isinstance(parsed, tuple) else socket.AF_UNIX
+
+    with socket.socket(family, socket.SOCK_STREAM) as client:
+        client.connect(parsed)
+        client.sendall(json.dumps({"data": data, "top": top}).encode() + b"\n")
+
+        with client.makefile("rb") as file:
+            return t.cast(dict[str, t.Any], json.loads(file.readline()))
+
+
+def dump_table(table: m.RankingTableModel) -> list[dict[str, t.Any]]:
+    """Return a JSON-serialisable list for a ranking table."""
+    return [
+        {"order": r.order.value, "team": r.team.name, "aggregate": r.aggregate.value}
+        for r in table.rankings
+    ]
+
+
+def load_table(rankings: list[dict[str, t.Any]]) -> m.RankingTableModel:
+    """Return a ranking table, from a list made by `dump_table()`."""
+    return m.RankingTableModel(
+        rankings=[
+            m.RankModel(
+                team=m.TeamModel(name=r["team"]),
+                aggregate=m.RankAggregateModel(value=r["aggregate"]),
+                order=m.RankOrderModel(value=r["order"]),
+            )
+            for r in rankings
+        ]
+    )
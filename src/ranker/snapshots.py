@@ -0,0 +1,146 @@
+"""
+Snapshots persist the aggregated state of an input file, for warm restarts.
+
+A snapshot holds the points table and record counts for a prefix of an append-only
+input file, with the byte offset and line number at the end of that prefix. When a
+run is resumed from a snapshot, only the bytes after the offset are parsed.
+
+The prefix ends at the start of the last line of content, so that a record that is
+still being written is never saved. A snapshot is only used if the input looks
+unchanged: it must still have the same bytes just before the offset, and records must
+be tallied with the same configuration. Otherwise, input is parsed from the start.
+"""
+from __future__ import annotations
+
+import contextlib
+import dataclasses
+import hashlib
+import json
+import logging
+import os
+import typing as t
+
+from . import models as m
+from .errors import SnapshotError
+from .readers import content_span, encoding, mapped
+
+if t.TYPE_CHECKING:
+    from .config import ConfigSnapshot
+    from .factories import LogTableFactory
+    from .parsers import Buffer, LeagueRankerParser
+
+logger = logging.getLogger(__name__)
+
+VERSION = 1  # The snapshot file format version
+DIGEST_SIZE = 4096  # The number of bytes before the offset that are checked
+
+_COUNTS: t.Final = ("read", "parsed", "error")
+
+
+def load_snapshot(path: str) -> m.SnapshotModel | None:
+    """Load the snapshot file at `path`. Return None if it is missing or unusable."""
+    try:
+        with open(path, encoding="utf-8") as file:
+            content = json.load(file)
+
+        if content.pop("version", None) != VERSION:
+            raise ValueError(f"Unsupported version: {content.get('version')}")
+
+        return m.SnapshotModel(**content)
+
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError, TypeError, AttributeError) as e:
+        logger.warning("Ignoring snapshot %s: %s", path, e)
+
+        return None
+
+
+def save_snapshot(path: str, snapshot: m.SnapshotModel) -> None:
+    """
+    Save a snapshot file at `path`. The file is replaced in a single step.
+
+    If the snapshot cannot be written, the temporary file is removed, and a
+    SnapshotError is raised.
+    """
+    temp_path = f"{path}.tmp"
+
+    try:
+        with open(temp_path, "w", encoding="utf-8") as file:
+            json.dump({"version": VERSION, **dataclasses.asdict(snapshot)}, file)
+
+        os.replace(temp_path, path)
+    except OSError as e:
+        with contextlib.suppress(OSError):
+            os.remove(temp_path)
+
+        raise SnapshotError(f"Could not write snapshot to {path}: {e}") from None
+
+
+def digest(data: Buffer, offset: int) -> str:
+    """Return a digest of the bytes just before `offset`."""
+    return hashlib.sha256(data[max(offset - DIGEST_SIZE, 0) : offset]).hexdigest()
+
+
+def tally_resumed(
+    parser: LeagueRankerParser,
+    factory: LogTableFactory,
+    path: str,
+    snapshot: m.SnapshotModel | None,
+) -> tuple[dict[str, int], m.SnapshotModel]:
+    """
+    Parse and tally the file at `path`, resuming from a snapshot if it can be used.
+
+    Return the points table for the whole file, and a new snapshot. Record counts in
+    the snapshot are added to the parser stats. Settings are read from the parser
+    context configuration.
+    """
+    config = parser._context.config
+
+    with mapped(path) as data:
+        start, end = content_span(data)
+        line = 1
+
+        if snapshot is not None and _usable(snapshot, data, config):
+            start, line = snapshot.offset, snapshot.line
+            table, stats = snapshot.table, snapshot.stats
+        else:
+            table, stats = {}, dict.fromkeys(_COUNTS, 0)
+
+        for name in _COUNTS:
+            parser._stats.incr(name, stats[name])
+
+        # The start of the last line of content, after the last line separator
+        offset = max(data.rfind(b"\n", start, end), data.rfind(b"\r", start, end))
+        offset = max(offset + 1, start)
+
+        counts = {name: parser._stats[name] for name in _COUNTS}
+        records = parser.iterrecords_buffer(data, start, offset, line, encoding())
+        table = factory.merge([table, factory.tally_records(records)])
+        counts = {name: parser._stats[name] - counts[name] for name in _COUNTS}
+
+        snapshot = m.SnapshotModel(
+            table=dict(table),
+            stats={name: stats[name] + counts[name] for name in _COUNTS},
+            offset=offset,
+            line=line + counts["read"],  # One line is read per record
+            digest=digest(data, offset),
+            settings=config.settings(),
+        )
+
+        # The last line is tallied, but not saved in the snapshot
+        records = parser.iterrecords_buffer(
+            data, offset, end, snapshot.line, encoding()
+        )
+        table = factory.merge([table, factory.tally_records(records)])
+
+    return table, snapshot
+
+
+def _usable(snapshot: m.SnapshotModel, data: Buffer, config: ConfigSnapshot) -> bool:
+    """Return True if the snapshot was saved for a prefix of the data."""
+    return (
+        snapshot.settings == config.settings()
+        and snapshot.offset <= len(data)
+        and snapshot.digest == digest(data, snapshot.offset)
+    )
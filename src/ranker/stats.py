@@ -1,13 +1,267 @@
-"""A stats counter."""
+"""
+A stats counter, with timers for the phases of a ranking run.
+
+Timers are read from the monotonic `time.perf_counter_ns()` clock. Each named timer
+keeps the number of calls, their total and exclusive durations, and a histogram of
+durations. The exclusive (`self`) duration of a timer excludes the time of any timers
+nested inside it, so that the exclusive durations of all timers add up to the time of
+the outermost.
+
+Timing is off unless a counter is created with `timing=True`. When it is off, `timer()`
+returns a shared no-op timer and `iter()` returns its iterable unchanged, so that the
+timed code pays only for a method call.
+
+Records that cannot be parsed are rejected. Rejected records are counted by category,
+and a fixed-size sample of them is kept, so that memory use does not grow with the
+number of rejected records. They may also be written to a file. At the end of a run,
+one warning is logged for each category of rejected records.
+"""
+from __future__ import annotations
+
+import contextlib
+import copy
+import dataclasses
+import functools
+import logging
+import random
+import threading
+import time
+import typing as t
+
 from .meta import SingletonMeta
 
+if t.TYPE_CHECKING:
+    from types import TracebackType
+
+logger = logging.getLogger(__name__)
+
+P = t.ParamSpec("P")
+R = t.TypeVar("R")
+T = t.TypeVar("T")
+
+SAMPLE_SIZE = 10  # The number of rejected records that are kept as examples
+REJECTS_BUFFER = 1 << 16  # The buffer size of a rejected records file, in bytes
+
+Rejected: t.TypeAlias = tuple[int, str, str]  # A line number, category and record
+
+
+@dataclasses.dataclass(slots=True)
+class TimerStats:
+    """
+    The calls of a named timer, and their durations in nanoseconds.
+
+    The histogram counts calls by the bit length of their duration: bucket `k` counts
+    durations of at least `2 ** (k - 1)` and less than `2 ** k` nanoseconds.
+    """
+
+    count: int = 0
+    total_ns: int = 0
+    self_ns: int = 0  # The total, less the time of nested timers
+    min_ns: int = 0
+    max_ns: int = 0
+    buckets: dict[int, int] = dataclasses.field(default_factory=dict)
+
+    def add(self, elapsed: int, exclusive: int) -> None:
+        """Add a call, of the given total and exclusive durations."""
+        self.min_ns = min(self.min_ns, elapsed) if self.count else elapsed
+        self.max_ns = max(self.max_ns, elapsed)
+        self.count += 1
+        self.total_ns += elapsed
+        self.self_ns += exclusive
+
+        bucket = elapsed.bit_length()
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+
+    def merge(self, other: TimerStats) -> None:
+        """Add the calls of another timer."""
+        if not other.count:
+            return
+
+        self.min_ns = min(self.min_ns, other.min_ns) if self.count else other.min_ns
+        self.max_ns = max(self.max_ns, other.max_ns)
+        self.count += other.count
+        self.total_ns += other.total_ns
+        self.self_ns += other.self_ns
+
+        for bucket, count in other.buckets.items():
+            self.buckets[bucket] = self.buckets.get(bucket, 0) + count
+
+    def percentile(self, percent: float) -> int:
+        """
+        Return an upper bound of the given percentile of durations, in nanoseconds.
+
+        This is the upper bound of the histogram bucket that holds the percentile.
+        """
+        rank = percent / 100 * self.count
+        seen = 0
+
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= rank:
+                return 1 << bucket
+
+        return 0  # There are no calls
+
+    def as_dict(self) -> dict[str, t.Any]:
+        """Return the timer as a dict of JSON values."""
+        return {
+            "count": self.count,
+            "total_ns": self.total_ns,
+            "self_ns": self.self_ns,
+            "min_ns": self.min_ns,
+            "max_ns": self.max_ns,
+            "histogram": [
+                {"lt_ns": 1 << bucket, "count": self.buckets[bucket]}
+                for bucket in sorted(self.buckets)
+            ],
+        }
+
+
+class ErrorSampler:
+    """
+    Count rejected records by category, and keep a sample of them.
 
-class LeagueRankerStats(metaclass=SingletonMeta):
-    """A simple stats counter."""
+    The sample is a reservoir sample: each rejected record has the same chance of being
+    kept, however many are rejected. A sampler is not thread-safe.
+    """
+
+    def __init__(self, size: int = SAMPLE_SIZE, seed: int | None = None) -> None:
+        self.size = size
+        self.counts: dict[str, int] = {}
+        self.seen = 0  # The number of rejected records
+        self.sample: list[Rejected] = []
+        self._random = random.Random(seed)
+
+    def add(self, category: str, record: str, line: int) -> None:
+        """Count a rejected record, and keep it in the sample by chance."""
+        self.counts[category] = self.counts.get(category, 0) + 1
+        self.seen += 1
+
+        if len(self.sample) < self.size:
+            self.sample.append((line, category, record))
+        else:
+            index = self._random.randrange(self.seen)
+            if index < self.size:
+                self.sample[index] = (line, category, record)
+
+    def merge(self, other: ErrorSampler) -> None:
+        """
+        Add the counts and sample of another sampler.
+
+        Each kept record is taken from the sample of one sampler or the other, with a
+        chance in proportion to the number of records that its sample stands for.
+        """
+        for category, count in other.counts.items():
+            self.counts[category] = self.counts.get(category, 0) + count
+
+        ours, theirs = list(self.sample), list(other.sample)
+        left, right = self.seen, other.seen
+        self.sample = []
+
+        while len(self.sample) < self.size and (ours or theirs):
+            if ours and (not theirs or self._random.randrange(left + right) < left):
+                pick, left = ours, left - 1
+            else:
+                pick, right = theirs, right - 1
+
+            self.sample.append(pick.pop(self._random.randrange(len(pick))))
+
+        self.seen += other.seen
+
+    def summary(self) -> dict[str, t.Any]:
+        """Return the counts and sample, as a dict of JSON values."""
+        return {
+            "counts": dict(self.counts),
+            "sample": [
+                {"line": line, "category": category, "record": record}
+                for line, category, record in sorted(self.sample)
+            ],
+        }
+
+
+class _Frame:
+    """An entry on the stack of running timers, that adds up nested time."""
+
+    __slots__ = ("nested",)
 
     def __init__(self) -> None:
-        """Initialise the counter."""
+        self.nested = 0
+
+
+class Timer(contextlib.ContextDecorator, _Frame):
+    """
+    Time a block of code, as a context manager, or each call of a decorated function.
+
+    The time is added to a named timer of a stats counter, on exit.
+    """
+
+    __slots__ = ("_stats", "_name", "_start")
+
+    def __init__(self, stats: StatsCounter, name: str) -> None:
+        super().__init__()
+        self._stats = stats
+        self._name = name
+        self._start = 0
+
+    def _recreate_cm(self) -> Timer:
+        """Return a new timer for each call of a decorated function."""
+        return Timer(self._stats, self._name)
+
+    def __enter__(self) -> Timer:
+        """Start the timer, nested in any running timer."""
+        self.nested = 0
+        self._stats._stack().append(self)
+        self._start = time.perf_counter_ns()
+
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Stop the timer, and add its time to the stats counter."""
+        elapsed = time.perf_counter_ns() - self._start
+
+        stack = self._stats._stack()
+        stack.pop()
+        if stack:
+            stack[-1].nested += elapsed
+
+        self._stats._record(self._name, elapsed, elapsed - self.nested)
+
+
+class _NullTimer(contextlib.ContextDecorator):
+    """A timer that does nothing, for a stats counter that is not timing."""
+
+    def __enter__(self) -> _NullTimer:
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        pass
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class StatsCounter:
+    """
+    A simple stats counter.
+
+    Each ranking run has its own counter. Counts may be incremented, and timers run,
+    by many threads.
+    """
+
+    def __init__(self, timing: bool = False) -> None:
+        """Initialise the counter. Timers are only run if `timing` is enabled."""
+        self.timing = timing
         self._stats: dict[str, int] = {}
+        self._timers: dict[str, TimerStats] = {}
+        self._errors = ErrorSampler()
+        self._rejects: t.TextIO | None = None  # A file to write rejected records to
+        self._lock = threading.Lock()
+        self._local = threading.local()  # The stack of running timers, per thread
 
     def incr(self, name: str, val: int = 1) -> None:
         """
@@ -18,8 +272,192 @@ class LeagueRankerStats(metaclass=SingletonMeta):
         if not isinstance(val, int):
             raise ValueError(f"Cannot add a non-integer: '{val}' given")
 
-        self._stats[name] = self._stats.get(name, 0) + int(val)
+        with self._lock:
+            self._stats[name] = self._stats.get(name, 0) + int(val)
 
     def __getitem__(self, name: str) -> int:
         """Retrieve a name's value using a dict-like interface."""
         return self._stats.get(name, 0)
+
+    def reject(self, category: str, record: str, line: int) -> None:
+        """
+        Count a rejected record as an `error`, and by its category.
+
+        The record may be kept in the sample of rejected records, and is written to the
+        rejected records file, if there is one.
+        """
+        with self._lock:
+            self._stats["error"] = self._stats.get("error", 0) + 1
+            self._errors.add(category, record, line)
+
+            if self._rejects is not None:
+                self._rejects.write(f"{line}\t{category}\t{record}\n")
+
+    def errors(self) -> dict[str, t.Any]:
+        """Return the counts of rejected records by category, and a sample of them."""
+        with self._lock:
+            return self._errors.summary()
+
+    def log_errors(self) -> None:
+        """Log a warning for each category of rejected records, with an example."""
+        errors = self.errors()
+        examples: dict[str, dict[str, t.Any]] = {}
+        for example in errors["sample"]:  # In order of line number
+            examples.setdefault(example["category"], example)
+
+        for category, count in errors["counts"].items():
+            message = f"Rejected {count} {category} record(s)"
+            if (example := examples.get(category)) is not None:
+                message += f", such as {example['record']!r} at line {example['line']}"
+
+            logger.warning(message)
+
+    def sampler(self) -> ErrorSampler:
+        """Return a copy of the counts and sample of rejected records."""
+        with self._lock:
+            return copy.deepcopy(self._errors)
+
+    def merge_errors(self, errors: ErrorSampler) -> None:
+        """Add the rejected record counts and sample of another sampler."""
+        with self._lock:
+            self._errors.merge(errors)
+
+    @contextlib.contextmanager
+    def rejects(self, file: t.TextIO) -> t.Iterator[None]:
+        """
+        Write each record that is rejected in the context to a file.
+
+        Each line of the file has the line number, category and text of a record,
+        separated by tabs. Open the file with a large buffer, such as `REJECTS_BUFFER`,
+        so that records are written in few calls.
+        """
+        with self._lock:
+            self._rejects = file
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._rejects = None
+
+    def timer(self, name: str) -> Timer | _NullTimer:
+        """
+        Return a named timer, to be used as a context manager or a decorator.
+
+        If timing is not enabled, a no-op timer is returned.
+        """
+        return Timer(self, name) if self.timing else _NULL_TIMER
+
+    def iter(self, name: str, iterable: t.Iterable[T]) -> t.Iterator[T]:
+        """
+        Iterate over an iterable, timing the taking of each item with a named timer.
+
+        Use this for a lazy phase, such as parsing, that is run a record at a time by
+        the phase that consumes it. The time of each item is nested in the timer that
+        is running when it is taken, and the end of the iterable is timed as a call.
+        If timing is not enabled, the iterable is not wrapped.
+        """
+        if not self.timing:
+            return iter(iterable)
+
+        return self._iter(name, iter(iterable))
+
+    def timers(self) -> dict[str, TimerStats]:
+        """Return a copy of each named timer, in the order they were first run."""
+        with self._lock:
+            return {
+                name: dataclasses.replace(timer, buckets=dict(timer.buckets))
+                for name, timer in self._timers.items()
+            }
+
+    def metrics(self) -> dict[str, t.Any]:
+        """Return the counts, timers and rejected records, as a dict of JSON values."""
+        with self._lock:
+            counts = dict(self._stats)
+
+        timers = {name: timer.as_dict() for name, timer in self.timers().items()}
+
+        return {"counts": counts, "timers": timers, "errors": self.errors()}
+
+    def _stack(self) -> list[_Frame]:
+        """Return the stack of running timers, of this thread."""
+        try:
+            return t.cast(list[_Frame], self._local.stack)
+        except AttributeError:
+            self._local.stack = []
+            return t.cast(list[_Frame], self._local.stack)
+
+    def _record(self, name: str, elapsed: int, exclusive: int) -> None:
+        """Add a call to a named timer."""
+        with self._lock:
+            self._timers.setdefault(name, TimerStats()).add(elapsed, exclusive)
+
+    def _iter(self, name: str, iterator: t.Iterator[T]) -> t.Iterator[T]:
+        """
+        Time each item of an iterator. Times are added to the counter at the end.
+
+        This runs for every record of an input, so calls are tallied in locals, and
+        one frame is reused for every item.
+        """
+        stack, frame, clock = self._stack(), _Frame(), time.perf_counter_ns
+        buckets = [0] * 65  # By the bit length of a duration
+        count = total = exclusive = high = 0
+        low = None
+
+        try:
+            while True:
+                frame.nested = 0
+                stack.append(frame)
+                start = clock()
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+                finally:
+                    elapsed = clock() - start
+                    stack.pop()
+                    if stack:
+                        stack[-1].nested += elapsed
+
+                    count += 1
+                    total += elapsed
+                    exclusive += elapsed - frame.nested
+                    buckets[elapsed.bit_length()] += 1
+                    if elapsed > high:
+                        high = elapsed
+                    if low is None or elapsed < low:
+                        low = elapsed
+
+                yield item
+        finally:
+            stats = TimerStats(
+                count=count,
+                total_ns=total,
+                self_ns=exclusive,
+                min_ns=low or 0,
+                max_ns=high,
+                buckets={k: n for k, n in enumerate(buckets) if n},
+            )
+            with self._lock:
+                self._timers.setdefault(name, TimerStats()).merge(stats)
+
+
+def timed(name: str) -> t.Callable[[t.Callable[P, R]], t.Callable[P, R]]:
+    """
+    Decorate a method, to time each call with the stats of the instance's context.
+
+    The instance must have a `_context` ranking context.
+    """
+
+    def decorator(method: t.Callable[P, R]) -> t.Callable[P, R]:
+        @functools.wraps(method)
+        def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+            with args[0]._context.stats.timer(name):  # type: ignore[attr-defined]
+                return method(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+class LeagueRankerStats(StatsCounter, metaclass=SingletonMeta):
+    """A Singleton stats counter, for a single `rank` run."""
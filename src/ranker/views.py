@@ -3,39 +3,151 @@
 from __future__ import annotations
 
 import os
+import sys
 import typing as t
 
 import click
 
-from tabulate import tabulate
-
-from .config import LeagueRankerConfig
-from .stats import LeagueRankerStats
+from . import writers
+from .context import RankingContext
 
 if t.TYPE_CHECKING:
     from . import models as m
+    from .stats import TimerStats
+
+TIMING_HEADERS = ["Phase", "Calls", "Total ms", "Self ms", "Share", "p50 ms", "p99 ms"]
 
 
 class CreateLogTableRequestView:
     """View deriver for the CreateLogTableRequest response."""
 
     @staticmethod
-    def render(model: m.RankingTableModel) -> None:
-        """Render to CLI."""
+    def render(
+        model: m.RankingTableModel, context: RankingContext | None = None
+    ) -> None:
+        """
+        Render to CLI, with the stats of the given `context` if verbose.
+
+        Ranks are written in chunks, rather than a line at a time, so that a large
+        table is written with few calls. If the output format is not `text`, the table
+        is written by a writer, and stats are printed to stderr. If records were
+        rejected, their counts by category and a sample of them are printed after the
+        stats. If the phases of the run were timed, their timings are printed last.
+        """
+        context = RankingContext.default() if context is None else context
+        format = context.config.output_format
+
+        with context.stats.timer("render"):
+            if format == "text":
+                for chunk in CreateLogTableRequestView.chunks(model):
+                    click.echo(chunk, nl=False)
+            else:
+                CreateLogTableRequestView.write(model, format)
+
+        if context.config.verbose:
+            from tabulate import tabulate  # Only needed for verbose output
+
+            stats = context.stats
+
+            headers = ["Imported", "Processed", "Failed"]
+            rows = [[stats["read"], stats["parsed"], stats["error"]]]
+            table = tabulate(rows, headers, tablefmt="fancy_grid")
+
+            err = format != "text"  # Keep machine-readable output apart
+            click.secho(f"{os.linesep*2}Statistics:", bold=True, err=err)
+            click.echo(table, err=err)
+
+            if (errors := stats.errors())["counts"]:
+                counts = tabulate(errors["counts"].items(), ["Category", "Rejected"])
+                sample = tabulate(
+                    [row.values() for row in errors["sample"]],
+                    ["Line", "Category", "Record"],
+                    tablefmt="fancy_grid",
+                )
+                click.secho(f"{os.linesep}Rejected records:", bold=True, err=err)
+                click.echo(counts, err=err)
+                click.echo(f"{os.linesep}Sample:", err=err)
+                click.echo(sample, err=err)
+
+            if timers := stats.timers():
+                table = tabulate(
+                    CreateLogTableRequestView.timings(timers),
+                    TIMING_HEADERS,
+                    tablefmt="fancy_grid",
+                    floatfmt=".3f",
+                )
+                click.secho(f"{os.linesep}Timings:", bold=True, err=err)
+                click.echo(table, err=err)
+
+    @staticmethod
+    def write(model: m.RankingTableModel, format: str) -> None:
+        """Write to stdout, in a machine-readable format."""
+        sys.stdout.flush()
+        file = sys.stdout.buffer if format in writers.BINARY_FORMATS else sys.stdout
+        writers.write(model, format, file)
+        file.flush()
+
+    @staticmethod
+    def timings(timers: dict[str, TimerStats]) -> list[list[t.Any]]:
+        """
+        Return a row for each timed phase, with times in milliseconds.
+
+        The share of each phase is its exclusive time, as a percentage of the
+        exclusive time of all phases.
+        """
+        total = sum(timer.self_ns for timer in timers.values()) or 1
+
+        return [
+            [
+                name,
+                timer.count,
+                timer.total_ns / 1e6,
+                timer.self_ns / 1e6,
+                f"{timer.self_ns / total:.1%}",
+                timer.percentile(50) / 1e6,
+                timer.percentile(99) / 1e6,
+            ]
+            for name, timer in timers.items()
+        ]
+
+    @staticmethod
+    def lines(model: m.RankingTableModel) -> t.Iterator[str]:
+        """Yield a line of text for each rank."""
         for rank in model.rankings:
             order = rank.order.value
             name = rank.team.name
             aggregate = rank.aggregate.value
-            click.echo(
-                f"{order}. {name}, {aggregate} {'pt' if aggregate == 1 else 'pts'}"
-            )
+            yield f"{order}. {name}, {aggregate} {'pt' if aggregate == 1 else 'pts'}"
 
-        if LeagueRankerConfig().get_bool("verbose", False):
-            stats = LeagueRankerStats()
+    @staticmethod
+    def chunks(model: m.RankingTableModel, size: int | None = None) -> t.Iterator[str]:
+        """
+        Yield a block of text for each `size` ranks, with a line for each rank.
 
-            headers = ["Imported", "Processed", "Failed"]
-            rows = [[stats["read"], stats["parsed"], stats["error"]]]
-            table = tabulate(rows, headers, tablefmt="fancy_grid")
+        By default, a block has `writers.CHUNK_SIZE` ranks.
+        """
+        for chunk in writers.batched(CreateLogTableRequestView.lines(model), size):
+            yield "\n".join(chunk) + "\n"
+
+
+class RankBatchView:
+    """View deriver for the results of ranking a batch of leagues."""
+
+    @staticmethod
+    def render(results: list[m.LeagueResultModel]) -> None:
+        """Render to CLI."""
+        from tabulate import tabulate
+
+        headers = ["League", "Output", "Imported", "Processed", "Failed"]
+        rows = [
+            [
+                result.input,
+                result.output if result.error is None else f"Error: {result.error}",
+                result.stats.get("read", ""),
+                result.stats.get("parsed", ""),
+                result.stats.get("error", ""),
+            ]
+            for result in results
+        ]
 
-            click.secho(f"{os.linesep*2}Statistics:", bold=True)
-            click.echo(table)
+        click.echo(tabulate(rows, headers, tablefmt="fancy_grid"))
@@ -0,0 +1,116 @@
+"""
+Workers parse and tally byte ranges of an input file, in separate processes.
+
+An input file is split into chunks at line boundaries. Each chunk is parsed and
+tallied into a partial points table by a worker process, and the partial tables are
+merged by the parent process.
+
+Line numbers are counted from the first non-blank line, as they are when parsing a
+stripped input string. To keep these exact, the lines in every chunk are counted
+before any chunk is parsed.
+"""
+from __future__ import annotations
+
+import typing as t
+
+from concurrent.futures import ProcessPoolExecutor
+
+from .context import RankingContext
+from .factories import LogTableFactory
+from .parsers import LeagueRankerParser
+from .readers import Span, content_span, encoding, mapped
+
+if t.TYPE_CHECKING:
+    from .config import ConfigSnapshot
+    from .stats import ErrorSampler
+
+# Chunk size limits, in bytes
+MIN_CHUNK_SIZE = 1 << 20
+MAX_CHUNK_SIZE = 64 << 20
+
+
+def find_chunks(path: str, workers: int, size: int | None = None) -> list[Span]:
+    """
+    Split the content of the file at `path` into chunks, at line boundaries.
+
+    Leading and trailing blank space is excluded. Every chunk but the last ends with a
+    line feed. If no chunk `size` is given, one is chosen for the number of `workers`.
+    """
+    with mapped(path) as data:
+        start, end = content_span(data)
+
+        if size is None:
+            size = (end - start) // (workers * 4)  # A few chunks per worker
+            size = min(max(size, MIN_CHUNK_SIZE), MAX_CHUNK_SIZE)
+
+        chunks = []
+        while start < end:
+            boundary = data.find(b"\n", min(start + size, end) - 1, end)
+            boundary = end if boundary == -1 else boundary + 1
+            chunks.append((start, boundary))
+            start = boundary
+
+    return chunks
+
+
+def count_lines(path: str, chunk: Span) -> int:
+    r"""Return the number of line separators (`\r\n`, `\n` or `\r`) in a chunk."""
+    with mapped(path) as data:
+        text = data[chunk[0] : chunk[1]]
+
+    return text.count(b"\n") + text.count(b"\r") - text.count(b"\r\n")
+
+
+def tally_chunk(
+    path: str, chunk: Span, line: int, config: ConfigSnapshot
+) -> tuple[dict[str, int], int, int, ErrorSampler]:
+    """
+    Parse and tally a chunk, numbering lines from `line`, with the given `config`.
+
+    Return a partial points table, with the number of records read and parsed, and
+    the counts and sample of rejected records.
+    """
+    context = RankingContext(config=config)
+    parser = LeagueRankerParser(context=context)
+
+    with mapped(path) as data:
+        records = parser.iterrecords_buffer(data, *chunk, line, encoding())
+        table = LogTableFactory(context=context).tally_records(records)
+
+    stats = context.stats
+
+    return dict(table), stats["read"], stats["parsed"], stats.sampler()
+
+
+def tally_file(
+    path: str,
+    workers: int,
+    size: int | None = None,
+    context: RankingContext | None = None,
+) -> dict[str, int]:
+    """
+    Parse and tally the file at `path`, using a pool of `workers` processes.
+
+    Each worker is given the `context` configuration snapshot. Record counts, and the
+    counts and samples of rejected records, from all workers are added to the `context`
+    stats. If no context is given, the default context is used.
+    """
+    context = RankingContext.default() if context is None else context
+    chunks = find_chunks(path, workers, size)
+    paths = [path] * len(chunks)
+    configs = [context.config] * len(chunks)
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        lines = [1]  # The number of the first line in each chunk
+        for count in executor.map(count_lines, paths, chunks):
+            lines.append(lines[-1] + count)
+
+        results = list(executor.map(tally_chunk, paths, chunks, lines, configs))
+
+    for _, read, parsed, errors in results:
+        context.stats.incr("read", read)
+        context.stats.incr("parsed", parsed)
+        context.stats.incr("error", read - parsed)
+        context.stats.merge_errors(errors)
+
+    return LogTableFactory.merge(table for table, *_ in results)
@@ -0,0 +1,162 @@
+"""
+Writers stream a ranking table in a machine-readable format.
+
+Every format has the same fields for each rank: `order`, `team` and `aggregate`.
+Ranks are written in chunks, as they are read from the table, so that no list of rows
+is built for the whole table.
+
+The `arrow` (Arrow IPC stream) and `parquet` formats need PyArrow, which is an
+optional dependency.
+"""
+from __future__ import annotations
+
+import csv
+import functools
+import itertools
+import json
+import typing as t
+
+from .errors import ConfigurationError
+
+if t.TYPE_CHECKING:
+    from . import models as m
+
+CHUNK_SIZE = 8192  # The number of ranks that are rendered or written at a time
+
+TEXT_FORMATS: t.Final = ("json", "jsonl", "csv")
+BINARY_FORMATS: t.Final = ("arrow", "parquet")
+FIELDS: t.Final = ("order", "team", "aggregate")
+
+Row: t.TypeAlias = tuple[int, str, int]  # An order, team name and aggregate
+T = t.TypeVar("T")
+
+
+@functools.cache
+def pyarrow() -> t.Any:
+    """Return the PyArrow module, or None if it is not installed."""
+    try:
+        import pyarrow
+        import pyarrow.parquet  # noqa: F401 imported but unused
+    except ImportError:  # pragma: no cover
+        return None
+
+    return pyarrow
+
+
+def rows(model: m.RankingTableModel) -> t.Iterator[Row]:
+    """Yield a row for each rank."""
+    for rank in model.rankings:
+        yield rank.order.value, rank.team.name, rank.aggregate.value
+
+
+def batched(items: t.Iterable[T], size: int | None = None) -> t.Iterator[list[T]]:
+    """Yield a list for each `size` items, or each `CHUNK_SIZE` items."""
+    size = CHUNK_SIZE if size is None else size
+    iterator = iter(items)
+
+    while chunk := list(itertools.islice(iterator, size)):
+        yield chunk
+
+
+def chunks(
+    model: m.RankingTableModel, size: int | None = None
+) -> t.Iterator[list[Row]]:
+    """Yield a list of rows for each `size` ranks, or each `CHUNK_SIZE` ranks."""
+    return batched(rows(model), size)
+
+
+def write(model: m.RankingTableModel, format: str, file: t.IO[t.Any]) -> None:
+    """
+    Write a ranking table to a file, in the given format.
+
+    The file must be opened in text mode for a text format, and in binary mode for a
+    binary format.
+    """
+    writers: dict[str, t.Callable[[m.RankingTableModel, t.Any], None]] = {
+        "json": write_json,
+        "jsonl": write_jsonl,
+        "csv": write_csv,
+        "arrow": write_arrow,
+        "parquet": write_parquet,
+    }
+
+    try:
+        writer = writers[format]
+    except KeyError:
+        raise ConfigurationError(f"Unknown output format '{format}'") from None
+
+    writer(model, file)
+
+
+def _json_object(row: Row) -> str:
+    """Return a JSON object for a row."""
+    order, team, aggregate = row
+
+    return f'{{"order": {order}, "team": {json.dumps(team)}, "aggregate": {aggregate}}}'
+
+
+def write_json(model: m.RankingTableModel, file: t.TextIO) -> None:
+    """Write a ranking table as a JSON array of objects."""
+    separator = "["
+
+    for chunk in chunks(model):
+        file.write(separator + ", ".join(map(_json_object, chunk)))
+        separator = ", "
+
+    file.write("[]\n" if separator == "[" else "]\n")
+
+
+def write_jsonl(model: m.RankingTableModel, file: t.TextIO) -> None:
+    """Write a ranking table as JSON Lines, with an object for each rank."""
+    for chunk in chunks(model):
+        file.write("\n".join(map(_json_object, chunk)) + "\n")
+
+
+def write_csv(model: m.RankingTableModel, file: t.TextIO) -> None:
+    """Write a ranking table as CSV, with a header row."""
+    writer = csv.writer(file, lineterminator="\n")
+    writer.writerow(FIELDS)
+
+    for chunk in chunks(model):
+        writer.writerows(chunk)
+
+
+def write_arrow(model: m.RankingTableModel, file: t.BinaryIO) -> None:
+    """Write a ranking table as an Arrow IPC stream, with a batch for each chunk."""
+    pa = _require_pyarrow("arrow")
+
+    with pa.ipc.new_stream(file, _schema(pa)) as writer:
+        for chunk in chunks(model):
+            writer.write_batch(_batch(pa, chunk))
+
+
+def write_parquet(model: m.RankingTableModel, file: t.BinaryIO) -> None:
+    """Write a ranking table as Parquet, with a row group for each chunk."""
+    pa = _require_pyarrow("parquet")
+
+    with pa.parquet.ParquetWriter(file, _schema(pa)) as writer:
+        for chunk in chunks(model):
+            writer.write_batch(_batch(pa, chunk))
+
+
+def _require_pyarrow(format: str) -> t.Any:
+    """Return the PyArrow module, or raise a ConfigurationError if not installed."""
+    pa = pyarrow()
+    if pa is None:
+        raise ConfigurationError(f"Output format '{format}' requires PyArrow")
+
+    return pa
+
+
+def _schema(pa: t.Any) -> t.Any:
+    """Return the Arrow schema of a ranking table."""
+    return pa.schema(
+        [("order", pa.int64()), ("team", pa.string()), ("aggregate", pa.int64())]
+    )
+
+
+def _batch(pa: t.Any, chunk: list[Row]) -> t.Any:
+    """Return an Arrow record batch for a chunk of rows."""
+    orders, teams, aggregates = zip(*chunk, strict=True)
+
+    return pa.record_batch([orders, teams, aggregates], schema=_schema(pa))
@@ -56,6 +56,11 @@ def config_yaml():
   config_path: /var/foo/bar.yaml
   strict_parse: false
   verbose: false
+  workers: 1
+  top: 0
+  cache: false
+  metrics: ""
+  rejects: ""
   points_win: 3 # A win is worth 3 aggregate points
   points_loss: 0 # A loss is worth 0 aggregate points
   points_draw: 1 # A draw is worth 1 aggregate point
@@ -0,0 +1,94 @@
+"""Unit tests for the `ranker.batches` module."""
+import asyncio
+
+import pytest
+
+
+@pytest.fixture
+def league_paths(tmp_path, valid_input_data):
+    """Input files for two leagues."""
+    first = tmp_path / "first.in"
+    first.write_text(valid_input_data)
+
+    second = tmp_path / "second.in"
+    second.write_text("Owls 1, Bears 0\nbad\n")
+
+    return [str(first), str(second)]
+
+
+def test_output_path():
+    """
+    Given: An input file path, and an output directory
+    When: Getting the output file path
+    Then: Return a path in the output directory, with an `.out` extension
+    """
+    from ranker.batches import output_path
+
+    assert output_path("/data/div1.in", "/out") == "/out/div1.out"
+    assert output_path("div2", "out") == "out/div2.out"
+
+
+def test_rank_league__separate_stats(mocker, league_paths):
+    """
+    Given: Input files for two leagues
+    When: Ranking each league
+    Then: Each has its own record counts, and the global stats are not changed
+    """
+    from ranker.batches import rank_league
+    from ranker.stats import LeagueRankerStats
+
+    incr = mocker.spy(LeagueRankerStats, "incr")
+
+    assert rank_league(league_paths[0]) == (
+        [
+            "1. Tarantulas, 6 pts",
+            "2. Lions, 5 pts",
+            "3. FC Awesome, 1 pt",
+            "3. Snakes, 1 pt",
+            "5. Grouches, 0 pts",
+        ],
+        {"read": 5, "parsed": 5, "error": 0},
+    )
+    assert rank_league(league_paths[1], top=1) == (
+        ["1. Owls, 3 pts"],
+        {"read": 2, "parsed": 1, "error": 1},
+    )
+    assert incr.call_count == 0
+
+
+def test_rank_leagues(tmp_path, league_paths):
+    """
+    Given: Input files for leagues, one of which is missing
+    When: Ranking the leagues in a batch
+    Then: An output file is written for each league that can be ranked, and an error
+        is returned for the others
+    """
+    from ranker import models as m
+    from ranker.batches import rank_leagues
+
+    output_dir = tmp_path / "out"
+    missing = str(tmp_path / "missing.in")
+
+    results = asyncio.run(
+        rank_leagues(league_paths + [missing], str(output_dir), jobs=2)
+    )
+
+    assert results[:2] == [
+        m.LeagueResultModel(
+            input=league_paths[0],
+            output=str(output_dir / "first.out"),
+            stats={"read": 5, "parsed": 5, "error": 0},
+        ),
+        m.LeagueResultModel(
+            input=league_paths[1],
+            output=str(output_dir / "second.out"),
+            stats={"read": 2, "parsed": 1, "error": 1},
+        ),
+    ]
+    assert results[2].stats == {}
+    assert "No such file" in results[2].error
+    assert (output_dir / "first.out").read_text().startswith("1. Tarantulas, 6 pts\n")
+    assert (
+        output_dir / "second.out"
+    ).read_text() == "1. Owls, 3 pts\n2. Bears, 0 pts\n"
+    assert not (output_dir / "missing.out").exists()
@@ -0,0 +1,197 @@
+"""Unit tests for the `ranker.caches` module."""
+import os
+
+import pytest
+
+from ranker.requests import CreateLogTableRequest
+
+
+@pytest.fixture
+def input_path(tmp_path, valid_input_data):
+    """An input file."""
+    path = tmp_path / "input.in"
+    path.write_text(valid_input_data + "\nbad")
+
+    return str(path)
+
+
+def rank(path, cache_dir, **kwargs):
+    """Create a log table for an input file. Return the table and record counts."""
+    from ranker.controllers import LeagueRankController
+
+    controller = LeagueRankController()
+    request = CreateLogTableRequest(data="", path=path, cache_dir=cache_dir, **kwargs)
+
+    table = controller.create_log_table(request=request)
+    stats = controller._parser._stats
+
+    return table, [stats["read"], stats["parsed"], stats["error"]]
+
+
+def test_create_log_table__cached(mocker, tmp_path, input_path, sorted_log_table):
+    """
+    Given: A cache directory
+    When: A log table is created twice for the same input and configuration
+    Then: The second table is read from the cache, and nothing is parsed
+    """
+    from ranker.parsers import LeagueRankerParser
+
+    cache_dir = str(tmp_path / "cache")
+
+    assert rank(input_path, cache_dir) == (sorted_log_table, [6, 5, 1])
+    assert len(os.listdir(cache_dir)) == 1
+
+    spy = mocker.spy(LeagueRankerParser, "iterrecords_buffer")
+    assert rank(input_path, cache_dir) == (sorted_log_table, [6, 5, 1])
+    assert spy.call_count == 0
+
+
+def test_create_log_table__cached_errors(tmp_path, input_path):
+    """
+    Given: A cache directory
+    When: A log table is created twice for the same input and configuration
+    Then: The rejected records of the second run are read from the cache
+    """
+    from ranker.controllers import LeagueRankController
+
+    request = CreateLogTableRequest(
+        data="", path=input_path, cache_dir=str(tmp_path / "cache")
+    )
+    errors = []
+
+    for _ in range(2):
+        controller = LeagueRankController()
+        controller.create_log_table(request=request)
+        errors.append(controller._context.stats.errors())
+
+    assert errors[0] == errors[1]
+    assert errors[0]["counts"] == {"invalid_format": 1}
+    assert errors[0]["sample"] == [
+        {"line": 6, "category": "invalid_format", "record": "bad"}
+    ]
+
+
+def test_create_log_table__rejects_not_cached(mocker, tmp_path, input_path):
+    """
+    Given: A cached log table
+    When: Rejected records are written to a file
+    Then: The cache is neither read nor written, and the input is parsed
+    """
+    from ranker.config import LeagueRankerConfig
+    from ranker.parsers import LeagueRankerParser
+
+    cache_dir = tmp_path / "cache"
+    output = rank(input_path, str(cache_dir))
+
+    LeagueRankerConfig.create({"rejects": str(tmp_path / "rejects.tsv")})
+    spy = mocker.spy(LeagueRankerParser, "iterrecords_buffer")
+    (entry,) = cache_dir.iterdir()
+    entry.unlink()
+
+    assert rank(input_path, str(cache_dir)) == output
+    assert spy.call_count == 1
+    assert not any(cache_dir.iterdir())
+
+
+@pytest.mark.parametrize(
+    "change",
+    [
+        lambda path, monkeypatch: open(path, "a").write("\nLions 1, Owls 0"),
+        lambda path, monkeypatch: monkeypatch.setenv("RANKER_POINTS_WIN", "2"),
+        lambda path, monkeypatch: monkeypatch.setenv("RANKER_STRICT_PARSE", "true"),
+    ],
+)
+def test_key__changed(monkeypatch, tmp_path, input_path, change):
+    """
+    Given: A cached log table
+    When: The input content or configuration is changed
+    Then: The cache key is changed
+    """
+    from ranker.caches import ResultCache
+
+    key = ResultCache(directory=str(tmp_path)).key(path=input_path)
+
+    change(input_path, monkeypatch)
+    cache = ResultCache(directory=str(tmp_path))  # With a new configuration snapshot
+
+    assert cache.key(path=input_path) != key
+    assert cache.key(path=input_path, top=2) != cache.key(path=input_path)
+
+
+def test_create_log_table__resumed_not_cached(tmp_path, input_path):
+    """
+    Given: A cache directory
+    When: A run is resumed from a snapshot
+    Then: Nothing is cached
+    """
+    cache_dir = tmp_path / "cache"
+    snapshot = str(tmp_path / "snapshot.json")
+
+    rank(input_path, str(cache_dir), snapshot=snapshot)
+
+    assert not cache_dir.exists()
+    assert os.path.isfile(snapshot)
+
+
+def test_evict__least_recently_used(mocker, tmp_path, sorted_log_table):
+    """
+    Given: A cache with a maximum size
+    When: Entries are stored beyond that size
+    Then: The least recently used entries are evicted
+    """
+    from ranker.caches import ResultCache
+    from ranker.stats import LeagueRankerStats
+
+    cache = ResultCache(directory=str(tmp_path))
+    stats = LeagueRankerStats()
+
+    for n, key in enumerate(["a", "b", "c"]):
+        cache.put(key, sorted_log_table, stats)
+        os.utime(tmp_path / f"{key}.json", ns=(n, n))
+
+    cache._max_size = 3 * os.path.getsize(tmp_path / "a.json")  # Room for 3 entries
+
+    assert cache.get("a") is not None  # Now the most recently used
+    cache.put("d", sorted_log_table, stats)
+
+    assert sorted(os.listdir(tmp_path)) == ["a.json", "c.json", "d.json"]
+
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        "{not json",
+        "[]",
+        '{"rankings": [[1]]}',
+        '{"rankings": [], "stats": {"read": 1, "parsed": 1, "error": 0}}',
+    ],
+)
+def test_get__unusable_entry(caplog, tmp_path, content):
+    """
+    Given: A cache entry that cannot be read
+    When: Getting the entry
+    Then: Return None, and log a warning
+    """
+    from ranker.caches import ResultCache
+
+    (tmp_path / "a.json").write_text(content)
+
+    assert ResultCache(directory=str(tmp_path)).get("a") is None
+    assert caplog.messages[0].startswith("Ignoring cache entry")
+
+
+def test_put__unwritable(caplog, tmp_path, sorted_log_table):
+    """
+    Given: A cache directory that cannot be created
+    When: Storing an entry
+    Then: Log a warning
+    """
+    from ranker.caches import ResultCache
+    from ranker.stats import LeagueRankerStats
+
+    (tmp_path / "file").write_text("")
+    cache = ResultCache(directory=str(tmp_path / "file"))
+
+    cache.put("a", sorted_log_table, LeagueRankerStats())
+
+    assert caplog.messages[0].startswith("Could not write cache entry")
@@ -1,4 +1,8 @@
 """Unit test for the cli interface."""
+import csv
+import io
+import json
+
 import pytest
 
 from click.testing import CliRunner
@@ -89,6 +93,136 @@ def test_cli__verbose_flag_prints_stats(cli_runner):
     assert "Statistics:" in result.output
 
 
+@pytest.mark.parametrize("args", [["foo.in"], ["-"]])
+def test_cli__verbose_flag_prints_timings(cli_runner, valid_input_data, args):
+    """
+    Given: The cli is invoked with a file path, or stdin
+    When: The `--verbose` flag is set
+    Then: The command should print the timings of each phase of the run.
+    """
+    from ranker.main import cli
+
+    result = cli_runner.invoke(cli, [*args, "--verbose"], input=valid_input_data)
+    assert result.exit_code == 0
+
+    timings = result.output.split("Timings:")[1]
+    for phase in ["read", "parse", "build", "rank", "render"]:
+        assert f"│ {phase} " in timings
+
+
+def test_cli__metrics_option(cli_runner):
+    """
+    Given: The cli is invoked with a valid file path argument
+    When: The `--metrics` option is set
+    Then: Counts and the timings of each phase are written to the file, as JSON, and
+        no timings are printed.
+    """
+    from ranker.main import cli
+
+    result = cli_runner.invoke(cli, ["foo.in", "--metrics", "metrics.json"])
+    assert result.exit_code == 0
+    assert "Timings:" not in result.output
+
+    with open("metrics.json") as file:
+        metrics = json.load(file)
+
+    assert metrics["counts"] == {"read": 5, "parsed": 5}
+    assert list(metrics["timers"]) == ["read", "parse", "build", "rank", "render"]
+    assert metrics["timers"]["parse"]["count"] == 6  # A call for each record, and end
+
+
+@pytest.mark.parametrize(
+    "profile, summary",
+    [("cprofile", "CPU profile written to"), ("tracemalloc", "Allocation report")],
+)
+def test_cli__profile_option(cli_runner, profile, summary):
+    """
+    Given: The cli is invoked with a valid file path argument
+    When: The `--profile` option is set, with a `--profile-file`
+    Then: The profile is written to the file, and a summary is printed to stderr
+    """
+    import os
+
+    from ranker.main import cli
+
+    args = ["foo.in", "--profile", profile, "--profile-file", "out.prof"]
+    result = cli_runner.invoke(cli, args)
+
+    assert result.exit_code == 0
+    assert "1. Tarantulas, 6 pts" in result.stdout
+    assert summary in result.stderr
+    assert os.path.getsize("out.prof") > 0
+
+
+def test_cli__profile_option_errors(cli_runner):
+    """
+    Given: The cli is invoked with a valid file path argument
+    When: The profile file cannot be written, or is given without `--profile`
+    Then: The command should fail with an error message.
+    """
+    from ranker.main import cli
+
+    args = ["foo.in", "--profile", "cprofile", "--profile-file", "missing/out.prof"]
+    result = cli_runner.invoke(cli, args)
+    assert result.exit_code == 1
+    assert "Could not write profile to missing/out.prof" in result.output
+
+    result = cli_runner.invoke(cli, ["foo.in", "--profile-file", "out.prof"])
+    assert result.exit_code == 2
+    assert "--profile-file requires --profile." in result.output
+
+
+def test_cli__rejects_option(cli_runner, invalid_input_data):
+    """
+    Given: The cli is invoked with an input file, with records that cannot be parsed
+    When: The `--rejects` option is set, with the `--verbose` flag
+    Then: Rejected records are written to the file, and counted and sampled in the
+        printed stats.
+    """
+    from ranker.main import cli
+
+    with open("bar.in", "w") as file:
+        file.write(invalid_input_data)
+
+    result = cli_runner.invoke(cli, ["bar.in", "--rejects", "rejects.tsv", "-v"])
+    assert result.exit_code == 0
+
+    with open("rejects.tsv") as file:
+        rejects = file.read().splitlines()
+
+    assert rejects[0] == "1\tinvalid_format\tLions 3 Snakes 3"
+    assert len(rejects) == 5
+    assert "Rejected records:" in result.output
+    assert "invalid_format           5" in result.output
+    assert "│      5 │ invalid_format │ Lions 4 Grouches 0 " in result.output
+
+
+def test_cli__rejects_option_not_writable(cli_runner):
+    """
+    Given: The cli is invoked with a valid file path argument
+    When: The `--rejects` file cannot be written
+    Then: The command should fail with an error message.
+    """
+    from ranker.main import cli
+
+    result = cli_runner.invoke(cli, ["foo.in", "--rejects", "missing/rejects.tsv"])
+    assert result.exit_code == 1
+    assert "Could not write rejected records to missing/rejects.tsv" in result.output
+
+
+def test_cli__metrics_option_not_writable(cli_runner):
+    """
+    Given: The cli is invoked with a valid file path argument
+    When: The `--metrics` file cannot be written
+    Then: The command should fail with an error message.
+    """
+    from ranker.main import cli
+
+    result = cli_runner.invoke(cli, ["foo.in", "--metrics", "missing/metrics.json"])
+    assert result.exit_code == 1
+    assert "Could not write metrics to missing/metrics.json" in result.output
+
+
 def test_cli__strict_flag_prints_note(cli_runner):
     """
     Given: The cli is invoked with a valid file input argument
@@ -151,3 +285,410 @@ def test_cli__config_path_is_set(valid_input_data, config_yaml):
 
     assert result.exit_code == 0
     assert LeagueRankerConfig().get_str("config_path") == "var.yaml"
+
+
+def test_cli__workers_option(mocker, cli_runner):
+    """
+    Given: The cli is invoked with a valid file path argument
+    When: The `--workers` option is set
+    Then: The input file path is given to the controller, with the number of workers
+    """
+    from ranker.controllers import LeagueRankController
+    from ranker.main import cli
+
+    create_log_table = mocker.spy(LeagueRankController, "create_log_table")
+
+    result = cli_runner.invoke(cli, ["foo.in", "--workers", "2"])
+    assert result.exit_code == 0
+    assert result.output.splitlines()[1] == "1. Tarantulas, 6 pts"
+
+    request = create_log_table.call_args.kwargs["request"]
+    assert request.path == "foo.in"
+    assert request.workers == 2
+
+
+def test_cli__workers_option_stdin(mocker, valid_input_data):
+    """
+    Given: The cli is invoked with stdin as input
+    When: The `--workers` option is set
+    Then: Input is read in a single process
+    """
+    from ranker.controllers import LeagueRankController
+    from ranker.main import cli
+
+    create_log_table = mocker.spy(LeagueRankController, "create_log_table")
+
+    result = CliRunner().invoke(cli, ["-", "--workers", "2"], input=valid_input_data)
+    assert result.exit_code == 0
+    assert result.output.splitlines()[1] == "1. Tarantulas, 6 pts"
+
+    assert create_log_table.call_args.kwargs["request"].path is None
+
+
+def test_cli__top_option(cli_runner):
+    """
+    Given: The cli is invoked with a valid file path argument
+    When: The `--top` option is set
+    Then: Only the top ranked teams, and teams tied with the last of them, are printed
+    """
+    from ranker.main import cli
+
+    result = cli_runner.invoke(cli, ["foo.in", "--top", "3"])
+    assert result.exit_code == 0
+    assert result.output.splitlines()[1:] == [
+        "1. Tarantulas, 6 pts",
+        "2. Lions, 5 pts",
+        "3. FC Awesome, 1 pt",
+        "3. Snakes, 1 pt",
+    ]
+
+
+def test_cli__resume_option(cli_runner):
+    """
+    Given: The cli is invoked with a valid file path argument
+    When: The `--resume` option is set
+    Then: The log table is printed, and the snapshot file is saved
+    """
+    import os
+
+    from ranker.main import cli
+
+    result = cli_runner.invoke(cli, ["foo.in", "--resume", "foo.snapshot"])
+    assert result.exit_code == 0
+    assert result.output.splitlines()[1] == "1. Tarantulas, 6 pts"
+    assert os.path.isfile("foo.snapshot")
+
+    result = cli_runner.invoke(cli, ["foo.in", "--resume", "foo.snapshot"])
+    assert result.exit_code == 0
+    assert result.output.splitlines()[1] == "1. Tarantulas, 6 pts"
+
+
+def test_cli__resume_option_not_writable(cli_runner):
+    """
+    Given: The cli is invoked with a valid file path argument
+    When: The `--resume` snapshot file cannot be written
+    Then: The command should fail with an error message.
+    """
+    from ranker.main import cli
+
+    result = cli_runner.invoke(cli, ["foo.in", "--resume", "missing/foo.snapshot"])
+    assert result.exit_code == 1
+    assert "Could not write snapshot to missing/foo.snapshot" in result.output
+
+
+def test_cli__resume_option_stdin(valid_input_data):
+    """
+    Given: The cli is invoked with stdin as input
+    When: The `--resume` option is set
+    Then: Exit with a usage error
+    """
+    from ranker.main import cli
+
+    result = CliRunner().invoke(
+        cli, ["-", "--resume", "foo.snapshot"], input=valid_input_data
+    )
+    assert result.exit_code == 2
+    assert "--resume requires a file INPUT" in result.output
+
+
+def test_cli__cache_option(monkeypatch, tmp_path, cli_runner):
+    """
+    Given: The cli is invoked with a valid file path argument
+    When: The `--cache` option is set
+    Then: The log table is printed, and cached in the cache directory
+    """
+    from ranker.main import cli
+
+    monkeypatch.setenv("RANKER_CACHE_DIR", str(tmp_path))
+
+    for _ in range(2):
+        result = cli_runner.invoke(cli, ["foo.in", "--cache"])
+        assert result.exit_code == 0
+        assert result.output.splitlines()[1] == "1. Tarantulas, 6 pts"
+
+    assert len(list(tmp_path.iterdir())) == 1
+
+
+def test_cli__connect_option(mocker, valid_input_data):
+    """
+    Given: The cli is invoked with stdin as input
+    When: The `--connect` option is set
+    Then: Input is sent to the ranking service, and the response is printed
+    """
+    from ranker.main import cli
+
+    request = mocker.patch(
+        "ranker.service.request",
+        return_value={
+            "rankings": [{"order": 1, "team": "Tarantulas", "aggregate": 6}],
+            "stats": {"read": 5, "parsed": 5, "error": 0},
+        },
+    )
+
+    result = CliRunner().invoke(
+        cli, ["-", "--connect", "rank.sock", "-v"], input=valid_input_data
+    )
+    assert result.exit_code == 0
+    assert result.output.splitlines()[1] == "1. Tarantulas, 6 pts"
+    assert request.call_args.args == ("rank.sock",)
+    assert request.call_args.kwargs == {"data": valid_input_data, "top": 0}
+
+
+@pytest.mark.parametrize(
+    "effect, message",
+    [
+        (FileNotFoundError("No such file"), "Could not connect to rank.sock"),
+        ([{"error": "Invalid request: foo"}], "Invalid request: foo"),
+        (ValueError("Expecting value"), "Invalid response from rank.sock"),
+        ([{"rankings": []}], "Invalid response from rank.sock"),
+        ([{"stats": {"read": "x"}, "rankings": []}], "Invalid response from rank.sock"),
+        ([{"stats": {}, "rankings": [{"team": "Lions"}]}], "Invalid response from"),
+        ([[]], "Invalid response from rank.sock"),
+        ([None], "Invalid response from rank.sock"),
+    ],
+)
+def test_cli__connect_option_error(mocker, valid_input_data, effect, message):
+    """
+    Given: The cli is invoked with the `--connect` option
+    When: The ranking service cannot be reached, returns an error, or its response
+        is invalid
+    Then: Exit with an error message
+    """
+    from ranker.main import cli
+
+    mocker.patch("ranker.service.request", side_effect=effect)
+
+    result = CliRunner().invoke(
+        cli, ["-", "--connect", "rank.sock"], input=valid_input_data
+    )
+    assert result.exit_code == 1
+    assert f"Error: {message}" in result.output
+
+
+def test_serve(mocker):
+    """
+    Given: The serve command is invoked with an address
+    When: The server is interrupted
+    Then: The server is closed, and the command exits
+    """
+    from ranker.main import serve
+
+    create_server = mocker.patch("ranker.service.create_server")
+    server = create_server.return_value.__enter__.return_value
+    server.serve_forever.side_effect = KeyboardInterrupt
+
+    result = CliRunner().invoke(serve, ["rank.sock", "--strict"])
+    assert result.exit_code == 0
+    assert result.output == "Serving on rank.sock. Press Ctrl+C to stop.\n"
+    create_server.assert_called_once_with("rank.sock")
+
+
+@pytest.mark.parametrize(
+    "argv, command, args, prog_name",
+    [
+        (["rank", "serve", "rank.sock"], "serve", ["rank.sock"], "rank serve"),
+        (["rank", "batch", "a.in", "b.in"], "batch", ["a.in", "b.in"], "rank batch"),
+        (["rank", "foo.in", "-v"], "cli", ["foo.in", "-v"], "rank"),
+        (["rank", "--", "serve"], "cli", ["--", "serve"], "rank"),
+        (["rank"], "cli", [], "rank"),
+    ],
+)
+def test_main(mocker, argv, command, args, prog_name):
+    """
+    Given: The `rank` entry point is run
+    When: The first argument is, or is not, a command name
+    Then: Run the serve, batch or cli command
+    """
+    from ranker import main
+
+    mocker.patch("sys.argv", argv)
+    mocked = mocker.patch.object(main, command)
+
+    main.main()
+
+    mocked.assert_called_once_with(args, prog_name=prog_name)
+
+
+def test_batch(tmp_path, valid_input_data):
+    """
+    Given: The batch command is invoked with input files
+    When: Each league can be ranked
+    Then: A ranking table is written for each, and results are printed
+    """
+    from ranker.main import batch
+
+    paths = [tmp_path / "first.in", tmp_path / "second.in"]
+    for path in paths:
+        path.write_text(valid_input_data)
+
+    result = CliRunner().invoke(
+        batch, [str(path) for path in paths] + ["-o", str(tmp_path), "-j", "1"]
+    )
+    assert result.exit_code == 0
+    assert "second.out" in result.output
+    assert (tmp_path / "first.out").read_text() == (tmp_path / "second.out").read_text()
+
+
+def test_batch__error(mocker, tmp_path):
+    """
+    Given: The batch command is invoked with input files
+    When: A league cannot be ranked
+    Then: Results are printed, and the command exits with an error
+    """
+    from ranker import models as m
+    from ranker.main import batch
+
+    mocker.patch(
+        "ranker.batches.rank_leagues",
+        new_callable=mocker.AsyncMock,
+        return_value=[
+            m.LeagueResultModel(input="a.in", output="a.out", stats={}, error="Oops")
+        ],
+    )
+    (tmp_path / "a.in").write_text("")
+
+    result = CliRunner().invoke(batch, [str(tmp_path / "a.in")])
+    assert isinstance(result.exception, SystemExit)
+    assert result.exit_code == 1
+    assert "Error: Oops" in result.output
+
+
+def test_batch__duplicate_names(tmp_path):
+    """
+    Given: The batch command is invoked with input files
+    When: Two input files have the same name
+    Then: Exit with a usage error
+    """
+    from ranker.main import batch
+
+    for directory in ("a", "b"):
+        (tmp_path / directory).mkdir()
+        (tmp_path / directory / "div.in").write_text("")
+
+    result = CliRunner().invoke(
+        batch, [str(tmp_path / "a" / "div.in"), str(tmp_path / "b" / "div.in")]
+    )
+    assert result.exit_code == 2
+    assert "File names must be unique" in result.output
+
+
+def test_import__deferred_dependencies():
+    """
+    Given: A fresh Python interpreter
+    When: Importing the CLI
+    Then: Dependencies that are only needed by some runs are not imported
+    """
+    import subprocess
+    import sys
+
+    deferred = [
+        "asyncio",
+        "concurrent.futures",
+        "numpy",
+        "ranker.batches",
+        "ranker.engines",
+        "ranker.service",
+        "ranker.workers",
+        "socketserver",
+        "tabulate",
+        "yaml",
+    ]
+    code = (
+        "import sys, ranker.main; "
+        f"print(*sorted(set({deferred!r}) & set(sys.modules)), sep='\\n')"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, check=True, text=True
+    )
+
+    assert output.stdout.split() == []
+
+
+def test_package__lazy_cli():
+    """
+    Given: The `ranker` package
+    When: Getting its `cli` attribute, or an attribute that does not exist
+    Then: Return the CLI command, or raise AttributeError
+    """
+    import ranker
+
+    from ranker.main import cli
+
+    assert ranker.cli is cli
+
+    with pytest.raises(AttributeError, match="has no attribute 'foo'"):
+        ranker.foo  # noqa: B018
+
+
+@pytest.mark.parametrize("format", ["json", "jsonl", "csv"])
+def test_cli__format_option(cli_runner, format):
+    """
+    Given: The cli is invoked with a valid file path argument
+    When: The `--format` option is set to a text format, with verbose and strict
+    Then: Only the ranking table is written to stdout, and messages to stderr
+    """
+    from ranker.main import cli
+
+    result = cli_runner.invoke(cli, ["foo.in", "--format", format, "-v", "-s"])
+    assert result.exit_code == 0
+
+    if format == "json":
+        rows = json.loads(result.stdout)
+    elif format == "jsonl":
+        rows = [json.loads(line) for line in result.stdout.splitlines()]
+    else:
+        rows = list(csv.DictReader(io.StringIO(result.stdout)))
+
+    assert [row["team"] for row in rows][:2] == ["Tarantulas", "Lions"]
+    assert "Strict parsing is enabled" in result.stderr
+    assert "Statistics:" in result.stderr
+
+
+def test_cli__format_option_arrow(cli_runner):
+    """
+    Given: The cli is invoked with a valid file path argument
+    When: The `--format` option is set to arrow
+    Then: An Arrow IPC stream is written to stdout
+    """
+    pa = pytest.importorskip("pyarrow")
+
+    from ranker.main import cli
+
+    result = cli_runner.invoke(cli, ["foo.in", "--format", "arrow"])
+    assert result.exit_code == 0
+
+    table = pa.ipc.open_stream(result.stdout_bytes).read_all()
+    assert table.column("team").to_pylist()[:2] == ["Tarantulas", "Lions"]
+
+
+def test_cli__format_option_no_pyarrow(mocker, cli_runner):
+    """
+    Given: PyArrow is not installed
+    When: The `--format` option is set to parquet
+    Then: Exit with a usage error
+    """
+    from ranker.main import cli
+
+    mocker.patch("ranker.main.pyarrow", return_value=None)
+
+    result = cli_runner.invoke(cli, ["foo.in", "--format", "parquet"])
+    assert result.exit_code == 2
+    assert "parquet output needs PyArrow" in result.output
+
+
+def test_cli__format_config_invalid(mocker, monkeypatch, cli_runner):
+    """
+    Given: An unknown output format in configuration, rather than in `--format`
+    When: The cli is invoked with a valid file path argument
+    Then: Exit with a usage error, before the input is parsed
+    """
+    from ranker.main import cli
+    from ranker.parsers import LeagueRankerParser
+
+    monkeypatch.setenv("RANKER_OUTPUT_FORMAT", "xml")
+    spy = mocker.spy(LeagueRankerParser, "iterrecords_buffer")
+
+    result = cli_runner.invoke(cli, ["foo.in"])
+    assert result.exit_code == 2
+    assert "Unknown output format 'xml'" in result.output
+    assert spy.call_count == 0
@@ -1,4 +1,5 @@
 """Unit tests for the `ranker.config` module."""
+import dataclasses
 import os
 import re
 
@@ -16,6 +17,28 @@ def environment(mocker):
         yield
 
 
+@pytest.fixture(autouse=True)
+def cache_dir(monkeypatch, tmp_path):
+    """Cache parsed configuration files in a temporary directory."""
+    from ranker.config import LeagueRankerConfig
+
+    monkeypatch.setattr(LeagueRankerConfig, "_cache_dir", str(tmp_path / "cache"))
+
+    return tmp_path / "cache"
+
+
+@pytest.fixture
+def config_file(mocker, tmp_path):
+    """A configuration file on disk, read without the patched `open()`."""
+    import io
+
+    mocker.patch("builtins.open", io.open)
+    path = tmp_path / "league-ranker.yaml"
+    path.write_text("config:\n  points_win: 2\n  strict_parse: true\n")
+
+    return path
+
+
 @pytest.fixture
 def config(mocker, config_yaml):
     """
@@ -271,3 +294,139 @@ def test__find_config_path__config_path_is_set():
     config = LeagueRankerConfig.create({"config_path": "/foo/bar.yaml"})
 
     assert config._find_config_path() == "/foo/bar.yaml"
+
+
+def test_snapshot():
+    """
+    Given: A `LeagueRankerConfig` instance
+    When: Taking a snapshot of its configuration
+    Then: Values are typed, unset keys take defaults, and later changes are not seen
+    """
+    from ranker.config import ConfigSnapshot, LeagueRankerConfig
+
+    config = LeagueRankerConfig.create(
+        {"config_path": "/foo/bar.yaml", "points_win": 2, "verbose": "true"}
+    )
+    snapshot = config.snapshot()
+    os.environ["RANKER_POINTS_WIN"] = "4"
+
+    assert snapshot == ConfigSnapshot(points_win=2, verbose=True)
+    assert snapshot.points_win == 2
+    assert snapshot.top == 0
+    assert config.snapshot().points_win == 4
+
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        snapshot.points_win = 5  # type: ignore[misc]
+
+
+def test_snapshot__settings():
+    """
+    Given: Configuration snapshots
+    When: Getting the settings that records are tallied with
+    Then: Only points values and strict parsing are included
+    """
+    from ranker.config import ConfigSnapshot
+
+    snapshot = ConfigSnapshot(points_win=2, strict_parse=True)
+
+    assert snapshot.settings() == {
+        "points_win": 2,
+        "points_loss": 0,
+        "points_draw": 1,
+        "strict_parse": True,
+    }
+    assert dataclasses.replace(snapshot, top=3, workers=4).settings() == (
+        snapshot.settings()
+    )
+
+
+def test_snapshot__invalid_value():
+    """
+    Given: A `LeagueRankerConfig` instance, with a value that is not of its key type
+    When: Taking a snapshot of its configuration
+    Then: Raise a `ConfigurationError` exception
+    """
+    from ranker.config import LeagueRankerConfig
+
+    config = LeagueRankerConfig.create({"config_path": "/foo/bar.yaml", "top": "all"})
+
+    with pytest.raises(
+        ConfigurationError,
+        match=re.escape("Configuration key 'top' value cannot be returned as type"),
+    ):
+        config.snapshot()
+
+
+def test_merge_from_file__cached(mocker, cache_dir, config_file):
+    """
+    Given: A configuration file that has been read before
+    When: Reading the file again
+    Then: The cached values are merged, and the file is not parsed
+    """
+    import yaml
+
+    from ranker.config import LeagueRankerConfig
+
+    spy = mocker.spy(yaml, "safe_load")
+    LeagueRankerConfig.create({"config_path": str(config_file)})
+    del os.environ["RANKER_POINTS_WIN"]
+    LeagueRankerConfig()
+
+    assert spy.call_count == 1
+    assert len(os.listdir(cache_dir)) == 1
+    assert os.environ["RANKER_POINTS_WIN"] == "2"
+    assert os.environ["RANKER_STRICT_PARSE"] == "True"
+
+
+def test_merge_from_file__changed(mocker, config_file):
+    """
+    Given: A configuration file that has been read before
+    When: The file is changed, and read again
+    Then: The file is parsed again, and its new values are merged
+    """
+    import yaml
+
+    from ranker.config import LeagueRankerConfig
+
+    spy = mocker.spy(yaml, "safe_load")
+    LeagueRankerConfig.create({"config_path": str(config_file)})
+    config_file.write_text("config:\n  points_win: 5\n")
+    del os.environ["RANKER_POINTS_WIN"]
+    LeagueRankerConfig()
+
+    assert spy.call_count == 2
+    assert os.environ["RANKER_POINTS_WIN"] == "5"
+
+
+@pytest.mark.parametrize("content", ["{not json", "[]", '{"key": null}'])
+def test_merge_from_file__unusable_cache(mocker, cache_dir, config_file, content):
+    """
+    Given: A cache file for a configuration file, that cannot be used
+    When: Reading the configuration file
+    Then: The file is parsed, and the cache file is replaced
+    """
+    from ranker.config import LeagueRankerConfig
+
+    config = LeagueRankerConfig.create({"config_path": str(config_file)})
+    (cache_path,) = cache_dir.iterdir()
+    cache_path.write_text(content)
+    del os.environ["RANKER_POINTS_WIN"]
+    config._merge_from_file(str(config_file))
+
+    assert os.environ["RANKER_POINTS_WIN"] == "2"
+    assert cache_path.read_text() != content
+
+
+def test_merge_from_file__cache_not_writable(monkeypatch, tmp_path, config_file):
+    """
+    Given: A cache directory that cannot be written
+    When: Reading a configuration file
+    Then: The file is parsed, and its values are merged
+    """
+    from ranker.config import LeagueRankerConfig
+
+    (tmp_path / "file").write_text("")
+    monkeypatch.setattr(LeagueRankerConfig, "_cache_dir", str(tmp_path / "file"))
+    LeagueRankerConfig.create({"config_path": str(config_file)})
+
+    assert os.environ["RANKER_POINTS_WIN"] == "2"
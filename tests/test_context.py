@@ -0,0 +1,92 @@
+"""Unit tests for the `ranker.context` module."""
+import pytest
+
+
+def test_create__snapshot():
+    """
+    Given: A `LeagueRankerConfig` instance
+    When: Creating a ranking context
+    Then: The context has its own stats, and a snapshot of the configuration values
+    """
+    from ranker.config import LeagueRankerConfig
+    from ranker.context import RankingContext
+    from ranker.stats import LeagueRankerStats
+
+    config = LeagueRankerConfig.create({"points_win": 5})
+    context = RankingContext.create()
+    config.create({"points_win": 7})
+
+    assert context.config.points_win == 5
+    assert context.stats is not LeagueRankerStats()
+    assert RankingContext.create(context.config).config is context.config
+
+
+@pytest.mark.parametrize(
+    "config, timing",
+    [
+        ({}, False),
+        ({"verbose": True}, True),
+        ({"metrics": "metrics.json"}, True),
+    ],
+)
+def test_create__timing(config, timing):
+    """
+    Given: A configuration snapshot
+    When: Creating a ranking context
+    Then: The phases of the run are timed if verbose, or if metrics are written
+    """
+    from ranker.config import ConfigSnapshot
+    from ranker.context import RankingContext
+
+    context = RankingContext.create(ConfigSnapshot(**config))
+
+    assert context.stats.timing is timing
+
+
+def test_default():
+    """
+    Given: The default ranking context
+    When: Reading configuration values and counting records
+    Then: The current configuration is read, and records are counted in its stats
+    """
+    from ranker.config import LeagueRankerConfig
+    from ranker.context import RankingContext
+    from ranker.stats import LeagueRankerStats
+
+    LeagueRankerConfig.create({"points_win": 7})
+    context = RankingContext.default()
+
+    assert context.config.points_win == 7
+    assert isinstance(context.stats, LeagueRankerStats)
+
+
+def test_contexts__concurrent_rankings(valid_input_data):
+    """
+    Given: Ranking contexts with different configurations
+    When: Ranking the same input at the same time, in many threads
+    Then: Each ranking uses its own configuration, and counts its own records
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    from ranker.config import ConfigSnapshot
+    from ranker.context import RankingContext
+    from ranker.controllers import LeagueRankController
+    from ranker.requests import CreateLogTableRequest
+
+    configs = [ConfigSnapshot(points_win=points) for points in range(1, 9)]
+    contexts = [RankingContext(config=config) for config in configs]
+
+    def rank(context):
+        request = CreateLogTableRequest(data=valid_input_data)
+        table = LeagueRankController(context=context).create_log_table(request)
+
+        return {r.team.name: r.aggregate.value for r in table.rankings}
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        tables = list(executor.map(rank, contexts))
+
+    for points, table in enumerate(tables, start=1):
+        assert table["Tarantulas"] == 2 * points
+        assert table["Lions"] == 2 + points
+
+    assert all(context.stats["parsed"] == 5 for context in contexts)
@@ -1,4 +1,9 @@
 """Unit tests for the `ranker.controllers` module."""
+import logging
+import re
+
+import pytest
+
 from ranker import models as m
 from ranker.requests import CreateLogTableRequest
 
@@ -35,3 +40,191 @@ def test_create_log_table__invalid_input_data(invalid_input_data):
     output = controller.create_log_table(request=request)
 
     assert output == m.RankingTableModel(rankings=[])
+
+
+def test_create_log_table__input_lines(valid_input_data, sorted_log_table):
+    """
+    Given: A `CreateLogTableRequest` with an iterable of lines as data
+    When: The lines are surrounded by blank lines
+    Then: Return the same sorted log table as for string data
+    """
+    import io
+
+    from ranker.controllers import LeagueRankController
+
+    controller = LeagueRankController()
+
+    data = io.StringIO(f"\n \n{valid_input_data}\n\t\n\n")
+    request = CreateLogTableRequest(data=data)
+
+    output = controller.create_log_table(request=request)
+
+    assert output == sorted_log_table
+
+
+def test_create_log_table__input_lines_blank_records(mocker):
+    """
+    Given: A `CreateLogTableRequest` with an iterable of lines as data
+    When: Blank lines occur between records
+    Then: These are parsed as records, as they would be for string data
+    """
+    from ranker.controllers import LeagueRankController
+
+    lines = ["  Lions 3, Snakes 3 \n", "\n", "   \n", "Lions 1, FC Awesome 1  \n"]
+
+    expected = CreateLogTableRequest(data="".join(lines))
+    request = CreateLogTableRequest(data=iter(lines))
+
+    assert list(request.data) == re.split(r"\n", expected.data)
+
+    controller = LeagueRankController()
+    match = mocker.spy(controller._parser, "match")
+
+    controller.create_log_table(request=CreateLogTableRequest(data=iter(lines)))
+
+    assert [c.kwargs["line"] for c in match.call_args_list] == [1, 2, 3, 4]
+
+
+def test_create_log_table__input_lines_all_blank():
+    """
+    Given: A `CreateLogTableRequest` with an iterable of lines as data
+    When: All lines are blank
+    Then: Return an empty results
+    """
+    from ranker.controllers import LeagueRankController
+
+    request = CreateLogTableRequest(data=iter(["\n", "  \r\n"]))
+
+    output = LeagueRankController().create_log_table(request=request)
+
+    assert output == m.RankingTableModel(rankings=[])
+
+
+def test_create_log_table__workers(tmp_path, valid_input_data, sorted_log_table):
+    """
+    Given: A `CreateLogTableRequest` with an input file path
+    When: More than one worker is requested
+    Then: Return the same sorted log table as for a single process
+    """
+    from ranker.controllers import LeagueRankController
+
+    path = tmp_path / "foo.in"
+    path.write_text(valid_input_data)
+
+    request = CreateLogTableRequest(data="", path=str(path), workers=2)
+
+    output = LeagueRankController().create_log_table(request=request)
+
+    assert output == sorted_log_table
+
+
+def test_create_log_table__workers_rejects(
+    mocker, tmp_path, valid_input_data, sorted_log_table
+):
+    """
+    Given: A `CreateLogTableRequest` with an input file path, and more than one worker
+    When: Rejected records are written to a file
+    Then: The input is parsed in one process, so that every rejected record is written
+    """
+    from ranker.config import ConfigSnapshot
+    from ranker.context import RankingContext
+    from ranker.controllers import LeagueRankController
+
+    tally_file = mocker.patch("ranker.workers.tally_file")
+    path = tmp_path / "foo.in"
+    path.write_text(valid_input_data)
+    context = RankingContext(config=ConfigSnapshot(rejects="rejects.tsv"))
+
+    request = CreateLogTableRequest(data="", path=str(path), workers=2)
+
+    output = LeagueRankController(context).create_log_table(request=request)
+
+    assert output == sorted_log_table
+    tally_file.assert_not_called()
+
+
+def test_create_log_table__no_fixture_models(mocker, tmp_path, valid_input_data):
+    """
+    Given: A `CreateLogTableRequest`, with string data or an input file path
+    When: Creating a log table
+    Then: No fixture models are created
+    """
+    from ranker.controllers import LeagueRankController
+
+    fixture_model = mocker.spy(m, "FixtureModel")
+
+    path = tmp_path / "foo.in"
+    path.write_text(valid_input_data)
+
+    controller = LeagueRankController()
+    controller.create_log_table(request=CreateLogTableRequest(data=valid_input_data))
+    controller.create_log_table(request=CreateLogTableRequest("", path=str(path)))
+
+    fixture_model.assert_not_called()
+
+
+def test_list_fixtures(tmp_path, valid_input_data):
+    """
+    Given: A `CreateLogTableRequest`, with string data or an input file path
+    When: Fixtures are requested
+    Then: Return the list of fixtures
+    """
+    from ranker.controllers import LeagueRankController
+    from ranker.parsers import LeagueRankerParser
+
+    path = tmp_path / "foo.in"
+    path.write_text(valid_input_data)
+
+    controller = LeagueRankController()
+    expected = LeagueRankerParser().parse(data=valid_input_data)
+
+    assert len(expected.fixtures) == 5
+    assert controller.list_fixtures(CreateLogTableRequest(valid_input_data)) == expected
+    assert controller.list_fixtures(CreateLogTableRequest("", str(path))) == expected
+
+
+@pytest.mark.parametrize(
+    "top, expected",
+    [
+        (1, ["Tarantulas"]),
+        (2, ["Tarantulas", "Lions"]),
+        (3, ["Tarantulas", "Lions", "FC Awesome", "Snakes"]),
+        (4, ["Tarantulas", "Lions", "FC Awesome", "Snakes"]),
+        (5, ["Tarantulas", "Lions", "FC Awesome", "Snakes", "Grouches"]),
+        (9, ["Tarantulas", "Lions", "FC Awesome", "Snakes", "Grouches"]),
+    ],
+)
+def test_create_log_table__top(valid_input_data, sorted_log_table, top, expected):
+    """
+    Given: A `CreateLogTableRequest` for the top ranked teams
+    When: The request data is valid
+    Then: Return the top ranked teams, and any teams tied with the last of them, with
+        the same order values as in the full log table
+    """
+    from ranker.controllers import LeagueRankController
+
+    controller = LeagueRankController()
+
+    request = CreateLogTableRequest(data=valid_input_data, top=top)
+
+    output = controller.create_log_table(request=request)
+
+    assert [r.team.name for r in output.rankings] == expected
+    assert output.rankings == sorted_log_table.rankings[: len(expected)]
+
+
+def test_create_log_table__debug_log(caplog, valid_input_data):
+    """
+    Given: A `CreateLogTableRequest`
+    When: The DEBUG log level is enabled
+    Then: The order set for each team is logged
+    """
+    from ranker.controllers import LeagueRankController
+
+    caplog.set_level(logging.DEBUG)
+
+    request = CreateLogTableRequest(data=valid_input_data, top=1)
+    LeagueRankController().create_log_table(request=request)
+
+    assert "Set Tarantulas to order 1" in caplog.messages
+    assert "Set Lions to order 2" not in caplog.messages
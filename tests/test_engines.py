@@ -0,0 +1,181 @@
+"""Unit tests for the `ranker.engines` module."""
+import random
+
+import pytest
+
+from ranker import models as m
+from ranker.errors import RankEngineError
+from ranker.requests import CreateLogTableRequest
+
+TEAMS = ["Lions", "Snakes", "Tarantulas", "FC Awesome", "Grouches", "Bears", "Owls"]
+
+
+def fixture(left_name, left_score, right_name, right_score):
+    """Create a fixture model."""
+    return m.FixtureModel(
+        left=m.ResultModel(
+            team=m.TeamModel(name=left_name), score=m.ScoreModel(value=left_score)
+        ),
+        right=m.ResultModel(
+            team=m.TeamModel(name=right_name), score=m.ScoreModel(value=right_score)
+        ),
+    )
+
+
+def rebuild(factory, fixtures):
+    """Build and rank a log table from scratch."""
+    from ranker.controllers import LeagueRankController
+
+    controller = LeagueRankController()
+    table = factory.build(fixtures)
+
+    return controller._rank(table=table)
+
+
+def test_load(valid_input_data, sorted_log_table):
+    """
+    Given: A rank engine
+    When: Loading parsed records
+    Then: The table is the same as the sorted log table
+    """
+    from ranker.controllers import LeagueRankController
+
+    request = CreateLogTableRequest(data=valid_input_data)
+    engine = LeagueRankController().create_rank_engine(request=request)
+
+    assert engine.table() == sorted_log_table
+    assert len(engine) == 5
+    assert engine.rank("FC Awesome") == sorted_log_table.rankings[2]
+
+
+def test_load__file(tmp_path, valid_input_data, sorted_log_table):
+    """
+    Given: A rank engine
+    When: Loading records from an input file
+    Then: The table is the same as the sorted log table
+    """
+    from ranker.controllers import LeagueRankController
+
+    path = tmp_path / "input.in"
+    path.write_text(valid_input_data)
+
+    request = CreateLogTableRequest(data="", path=str(path))
+    engine = LeagueRankController().create_rank_engine(request=request)
+
+    assert engine.table() == sorted_log_table
+
+
+@pytest.mark.parametrize("points", [(3, 0, 1), (2, -1, 1)])
+def test_apply_and_retract__same_as_rebuild(points):
+    """
+    Given: A rank engine, and configured points values
+    When: Applying and retracting results one at a time
+    Then: After each update, the table is the same as one rebuilt from scratch
+    """
+    from ranker.engines import RankEngine
+    from ranker.factories import LogTableFactory
+
+    rng = random.Random(11)
+    factory = LogTableFactory()
+    factory.points_win, factory.points_loss, factory.points_draw = points
+
+    engine = RankEngine(factory=factory)
+    applied = []
+
+    for _ in range(400):
+        if applied and rng.random() < 0.4:
+            engine.retract(applied.pop(rng.randrange(len(applied))))
+        else:
+            left_name, right_name = rng.sample(TEAMS, 2)
+            result = fixture(
+                left_name, rng.randint(0, 2), right_name, rng.randint(0, 2)
+            )
+            engine.apply(result)
+            applied.append(result)
+
+        expected = rebuild(factory, applied)
+        assert engine.table() == expected
+
+
+def test_table__top():
+    """
+    Given: A rank engine
+    When: Getting the table for the top ranked teams
+    Then: Return the top ranked teams, and any teams tied with the last of them
+    """
+    from ranker.controllers import LeagueRankController
+    from ranker.engines import RankEngine
+
+    records = [
+        ("Lions", 3, "Snakes", 0),
+        ("Owls", 1, "Bears", 1),
+        ("Owls", 1, "Grouches", 2),
+    ]
+
+    engine = RankEngine()
+    engine.load(records)
+
+    for top in range(1, len(engine) + 2):
+        expected = LeagueRankController()._rank(table=engine.table(), top=top)
+
+        assert engine.table(top=top) == expected
+
+
+def test_table__is_a_snapshot():
+    """
+    Given: A ranking table from a rank engine
+    When: A result is applied to the engine
+    Then: The ranking table is not changed
+    """
+    from ranker.engines import RankEngine
+
+    engine = RankEngine()
+    engine.apply(fixture("Lions", 1, "Snakes", 0))
+    table = engine.table()
+
+    engine.apply(fixture("Snakes", 3, "Bears", 0))
+    engine.apply(fixture("Snakes", 3, "Bears", 0))
+
+    assert [(r.team.name, r.order.value) for r in table.rankings] == [
+        ("Lions", 1),
+        ("Snakes", 2),
+    ]
+    assert engine.rank("Lions").order.value == 2
+
+
+def test_retract__removes_team():
+    """
+    Given: A rank engine
+    When: All results for a team are retracted
+    Then: The team is removed from the table
+    """
+    from ranker.engines import RankEngine
+
+    engine = RankEngine()
+    engine.apply(fixture("Lions", 1, "Snakes", 1))
+    engine.apply(fixture("Lions", 2, "Owls", 1))
+    engine.retract(fixture("Lions", 2, "Owls", 1))
+
+    assert len(engine) == 2
+    with pytest.raises(KeyError):
+        engine.rank("Owls")
+
+
+def test_retract__raises_rank_engine_error():
+    """
+    Given: A rank engine
+    When: Retracting a result for a team with no results
+    Then: A RankEngineError is raised, and the table is not changed
+    """
+    from ranker.engines import RankEngine
+
+    engine = RankEngine()
+    engine.apply(fixture("Lions", 1, "Snakes", 1))
+    table = engine.table()
+
+    with pytest.raises(
+        RankEngineError, match="Cannot retract a result for team 'Owls'"
+    ):
+        engine.retract(fixture("Lions", 1, "Owls", 1))
+
+    assert engine.table() == table
@@ -1,5 +1,7 @@
 """Unit test for the `ranker.factories` module."""
 
+import logging
+
 import pytest
 
 from ranker import models as m
@@ -99,3 +101,114 @@ def test_build(input, expected):
     output = factory.build(input)
 
     assert output == expected
+
+
+def test_build__columnar(input, expected):
+    """
+    Given: Columnar fixtures
+    When: Building a log table
+    Then: Return the same table as for fixture models, in the same order
+    """
+    columns = m.ColumnarFixtureListModel()
+    columns.extend(
+        (f.left.team.name, f.left.score.value, f.right.team.name, f.right.score.value)
+        for f in input.fixtures
+    )
+
+    factory = LogTableFactory()
+    output = factory.build(columns)
+
+    assert output == expected
+
+
+def test_tally_records(input, expected):
+    """
+    Given: Parsed record tuples
+    When: Tallying points
+    Then: Return the same points as for fixture models, in the same order
+    """
+    records = [
+        (f.left.team.name, f.left.score.value, f.right.team.name, f.right.score.value)
+        for f in input.fixtures
+    ]
+
+    factory = LogTableFactory()
+    output = factory.tally_records(records)
+
+    assert output == factory.tally(input.fixtures)
+    assert list(output.items()) == [
+        (r.team.name, r.aggregate.value) for r in expected.rankings
+    ]
+
+
+@pytest.mark.parametrize("points", [(3, 0, 1), (2, -1, 1)])
+def test_tally_columns__numpy_same_as_python(mocker, points):
+    """
+    Given: Columnar fixtures, and configured points values
+    When: Tallying points with and without NumPy
+    Then: Return the same points, in the same order, as for record tuples
+    """
+    import random
+
+    from ranker import factories
+
+    rng = random.Random(7)
+    teams = ["Lions", "Snakes", "Tarantulas", "FC Awesome", "Grouches"]
+    records = [
+        (rng.choice(teams), rng.randint(0, 3), rng.choice(teams), rng.randint(0, 3))
+        for _ in range(500)
+    ]
+    columns = m.ColumnarFixtureListModel()
+    columns.extend(records)
+
+    factory = LogTableFactory()
+    factory.points_win, factory.points_loss, factory.points_draw = points
+
+    vectorised = factory.tally_columns(columns)
+    mocker.patch.object(factories, "_numpy", return_value=None)
+    fallback = factory.tally_columns(columns)
+
+    assert list(vectorised.items()) == list(fallback.items())
+    assert list(fallback.items()) == list(factory.tally_records(records).items())
+    assert all(type(v) is int for v in vectorised.values())
+
+
+def test_tally_columns__empty():
+    """
+    Given: No columnar fixtures
+    When: Tallying points
+    Then: Return an empty points table
+    """
+    assert LogTableFactory().tally_columns(m.ColumnarFixtureListModel()) == {}
+
+
+@pytest.mark.parametrize(
+    "level, expected",
+    [
+        (
+            logging.INFO,
+            [
+                "Lions won Snakes: 3 - 1",
+                "Lions lost Snakes: 0 - 2",
+                "Lions drew Snakes: 1 - 1",
+            ],
+        ),
+        (logging.WARNING, []),
+    ],
+)
+def test_tally_records__trace(caplog, level, expected):
+    """
+    Given: Parsed record tuples
+    When: Tallying points, with a given log level
+    Then: A message is logged for each fixture only if INFO is enabled
+    """
+    caplog.set_level(level, logger="ranker.factories")
+    records = [
+        ("Lions", 3, "Snakes", 1),
+        ("Lions", 0, "Snakes", 2),
+        ("Lions", 1, "Snakes", 1),
+    ]
+
+    LogTableFactory().tally_records(records)
+
+    assert caplog.messages == expected
@@ -1,4 +1,6 @@
 """Unit tests for the `ranker.parsers` module."""
+import logging
+
 import pytest
 
 from ranker import models as m
@@ -136,3 +138,309 @@ def test_match__raises_record_parse_error(mocker, record, match):
 
     with pytest.raises(RecordParseError, match=match):
         parser.match(record=record)
+
+
+def test_iterparse__iterable_of_lines():
+    """
+    Given: An iterable of lines, such as an open file object
+    When: Parsing lazily
+    Then: Yield a FixtureModel for each valid record, with line endings removed.
+    """
+    import io
+
+    from ranker.parsers import LeagueRankerParser
+
+    data = io.StringIO("Foo 1,Bar 2\nRed Jam 5 Sky Pen 6\r\nBaz 3, Bat Fox 4\r\n")
+
+    parser = LeagueRankerParser()
+    parser._strict_parse = True
+
+    output = parser.iterparse(data=data)
+
+    assert next(output) == m.FixtureModel(
+        left=m.ResultModel(team=m.TeamModel(name="Foo"), score=m.ScoreModel(value=1)),
+        right=m.ResultModel(team=m.TeamModel(name="Bar"), score=m.ScoreModel(value=2)),
+    )
+    assert data.tell() == len("Foo 1,Bar 2\n")  # Nothing is read ahead
+    assert parser._stats["read"] == 0  # Counts are added when parsing ends
+
+    assert next(output) == m.FixtureModel(
+        left=m.ResultModel(team=m.TeamModel(name="Baz"), score=m.ScoreModel(value=3)),
+        right=m.ResultModel(
+            team=m.TeamModel(name="Bat Fox"), score=m.ScoreModel(value=4)
+        ),
+    )
+    assert list(output) == []
+    assert parser._stats["read"] == 3
+    assert parser._stats["error"] == 1
+    assert parser._stats["parsed"] == 2
+
+
+@pytest.mark.parametrize("strict_parse", [False, True])
+@pytest.mark.parametrize(
+    "record",
+    [
+        "",
+        "   ",
+        "\t\x1c\x0b",
+        "Foo 3, Bar 5",
+        "Foo 3, Bar 5\n",
+        "  Foo 3,   Bar 5  ",
+        "Foo\t3,Bar\t5",
+        "Foo 3 , Bar 5",
+        "Foo, Baz 3, Bar 5",
+        "__Foo__ 3,__Bar__ 5__",
+        "Foo_ _ _3,Bar-_-5",
+        "Fóò Bär 3, Çrème ß 5",
+        "Foo Baz 3, Bar 5",
+        "Foo 3,,Bar 5",
+        "Foo 3, Bar 5, Baz 1",
+        "$#@!, 3",
+        "Foo 0003, Bar 00",
+        "Foo ³ 3, Bar ٣ 5",
+    ],
+)
+def test_match__same_as_sequential_normalisation(strict_parse, record):
+    """
+    Given: Any record string value
+    When: Strict parsing is either enabled or disabled
+    Then: The result is identical to substituting each normalisation in sequence.
+    """
+    import re
+
+    from ranker.parsers import LeagueRankerParser
+
+    def legacy_match(record):
+        if not strict_parse:
+            record = re.sub(r"[^\w ,]+", " ", record)
+            record = re.sub(r"[\s\_]+", " ", record)
+            record = record.strip()
+
+        if not record:
+            raise RecordParseError(f"Unusable record: '{record}' at line 0")
+
+        match = re.match(r"^(\D*) (\d+),(\D*) (\d+)$", record)
+
+        if not match:
+            raise RecordParseError(f"Invalid record format: '{record}' at line 0")
+
+        return tuple([str(group).strip() for group in match.groups()])
+
+    parser = LeagueRankerParser()
+    parser._strict_parse = strict_parse
+
+    try:
+        expected = legacy_match(record)
+    except RecordParseError as e:
+        with pytest.raises(RecordParseError, match=re.escape(str(e))):
+            parser.match(record=record)
+    else:
+        assert parser.match(record=record) == expected
+
+
+@pytest.mark.parametrize("strict_parse", [False, True])
+def test_iterparse_buffer__same_as_iterparse(caplog, strict_parse):
+    """
+    Given: Input data as bytes
+    When: Parsing records in place, with strict parsing enabled or disabled
+    Then: Yield the same models, log messages and counts as for string input.
+    """
+    from ranker.parsers import LeagueRankerParser
+
+    caplog.set_level(logging.DEBUG, logger="ranker.parsers")
+    data = (
+        "Foo 1,Bar 2\nBaz 3, Bat Fox 4\r\nRed Jam 5 Sky Pen 6\r"
+        "$_foo 6, _&Bar$foo 5\n\nFóò 7, Bär 8\nFoo  9, Bar 10\n  \n"
+        "Fluff Mop 7,Kick Ball 8"
+    )
+
+    expected_parser = LeagueRankerParser()
+    expected_parser._strict_parse = strict_parse
+    expected = list(expected_parser.iterparse(data=data, line=10))
+    expected_messages = caplog.messages.copy()
+    caplog.clear()
+
+    parser = LeagueRankerParser()
+    parser._strict_parse = strict_parse
+    output = list(parser.iterparse_buffer(data=data.encode(), line=10))
+
+    assert output == expected
+    assert caplog.messages == expected_messages
+    for name in ("read", "parsed", "error"):
+        assert parser._stats[name] == expected_parser._stats[name]
+    assert parser._stats.errors() == expected_parser._stats.errors()
+
+
+def test_iterrecords__rejected(caplog):
+    """
+    Given: Input data, with records that are unusable or have an invalid format
+    When: Parsing records
+    Then: Rejected records are counted by category, and sampled with their line
+        numbers and text as read, and a debug message is logged for each
+    """
+    from ranker.parsers import LeagueRankerParser
+
+    caplog.set_level(logging.DEBUG, logger="ranker.parsers")
+    parser = LeagueRankerParser()
+    parser._strict_parse = False
+
+    data = ["Foo 1, Bar 2\n", "$%^\r\n", "Foo 1 Bar 2\n"]
+    assert len(list(parser.iterrecords(data=data, line=7))) == 1
+
+    assert parser._stats.errors() == {
+        "counts": {"unusable": 1, "invalid_format": 1},
+        "sample": [
+            {"line": 8, "category": "unusable", "record": "$%^"},
+            {"line": 9, "category": "invalid_format", "record": "Foo 1 Bar 2"},
+        ],
+    }
+    assert caplog.messages == [
+        "Unusable record: '' at line 8",
+        "Invalid record format: 'Foo 1 Bar 2' at line 9",
+    ]
+
+
+def test_iterparse_buffer__byte_range():
+    """
+    Given: Input data as bytes
+    When: Parsing records in a byte range, that ends with a line separator
+    Then: Yield models for records in that range only.
+    """
+    from ranker.parsers import LeagueRankerParser
+
+    data = b"Foo 1,Bar 2\r\nBaz 3, Bat Fox 4\r\nRed 5, Sky 6"
+
+    parser = LeagueRankerParser()
+    output = list(parser.iterparse_buffer(data=data, start=13, end=31))
+
+    assert output == [
+        m.FixtureModel(
+            left=m.ResultModel(
+                team=m.TeamModel(name="Baz"), score=m.ScoreModel(value=3)
+            ),
+            right=m.ResultModel(
+                team=m.TeamModel(name="Bat Fox"), score=m.ScoreModel(value=4)
+            ),
+        )
+    ]
+    assert parser._stats["read"] == 1
+
+
+def test_iterrecords__team_names_interned():
+    """
+    Given: Records that share team names
+    When: Parsing records, as strings or bytes
+    Then: Each distinct team name is the same string object.
+    """
+    from ranker.parsers import LeagueRankerParser
+
+    data = "Lions 3, Snakes 3\nSnakes 1, $Lions 2\n"
+
+    parser = LeagueRankerParser()
+    first, second = parser.iterrecords(data=data)
+    third, fourth = parser.iterrecords_buffer(data=data.encode())
+
+    assert first[0] is second[2] is third[0] is fourth[2]
+    assert first[2] is second[0] is third[2] is fourth[0]
+
+
+def test_parse_columnar__same_as_parse():
+    """
+    Given: Input data with valid and invalid records
+    When: Parsing into a columnar fixture list
+    Then: Team ids are assigned in order of first appearance, columns are buffers,
+        and iterating yields the same fixtures as `parse()`.
+    """
+    from ranker.parsers import LeagueRankerParser
+
+    data = "Lions 3, Snakes 3\nTarantulas 1, FC Awesome 0\nbad\nSnakes 1, Lions 2\n"
+
+    parser = LeagueRankerParser()
+    output = parser.parse_columnar(data=data)
+
+    assert output.teams == {"Lions": 0, "Snakes": 1, "Tarantulas": 2, "FC Awesome": 3}
+    assert memoryview(output.left_teams).tolist() == [0, 2, 1]
+    assert memoryview(output.left_scores).tolist() == [3, 1, 1]
+    assert memoryview(output.right_teams).tolist() == [1, 3, 0]
+    assert memoryview(output.right_scores).tolist() == [3, 0, 2]
+    assert memoryview(output.left_scores).itemsize == 8
+    assert len(output) == 3
+    assert list(output) == parser.parse(data=data).fixtures
+
+
+def test_parse_columnar__large_scores():
+    """
+    Given: Input data with scores that do not fit in 32 bits
+    When: Parsing into a columnar fixture list, and building a log table
+    Then: Scores are held, and the table is the same as for `parse()`
+    """
+    from ranker.factories import LogTableFactory
+    from ranker.parsers import LeagueRankerParser
+
+    data = f"Lions {2**32}, Snakes {2**32 - 1}\nSnakes {2**64 - 1}, Lions {2**63}\n"
+
+    parser = LeagueRankerParser()
+    output = parser.parse_columnar(data=data)
+
+    assert memoryview(output.left_scores).tolist() == [2**32, 2**64 - 1]
+    assert list(output) == parser.parse(data=data).fixtures
+    assert LogTableFactory().build(output) == LogTableFactory().build(
+        parser.parse(data=data)
+    )
+
+
+def test_parse_columnar__scores_out_of_range():
+    """
+    Given: Input data with a score greater than a columnar fixture list can hold
+    When: Parsing into a columnar fixture list
+    Then: The record is rejected as invalid, and the other records are kept
+    """
+    from ranker.parsers import LeagueRankerParser
+
+    data = f"Foo {2**64}, Bar 1\nFoo 1, Bar 99999999999999999999\nFoo 2, Baz 0"
+
+    parser = LeagueRankerParser()
+    output = parser.parse_columnar(data=data)
+
+    assert output.teams == {"Foo": 0, "Baz": 1}
+    assert list(output) == parser.parse(data="Foo 2, Baz 0").fixtures
+    assert parser._stats.errors()["counts"] == {"invalid_format": 2}
+    assert [e["line"] for e in parser._stats.errors()["sample"]] == [1, 2]
+
+
+def test_iterrecords_buffer__counts_added_when_closed():
+    """
+    Given: Records parsed lazily from a buffer
+    When: Parsing is stopped before the end of the buffer
+    Then: Counts of the records read and parsed so far are added to the stats
+    """
+    from ranker.parsers import LeagueRankerParser
+
+    parser = LeagueRankerParser()
+    records = parser.iterrecords_buffer(b"bad\nFoo 1, Bar 2\nBaz 3, Bat 4\n")
+
+    assert next(records) == ("Foo", 1, "Bar", 2)
+    assert parser._stats["read"] == 0
+
+    records.close()
+
+    assert [parser._stats[name] for name in ("read", "parsed", "error")] == [2, 1, 1]
+
+
+def test_columnar_append__score_out_of_range():
+    """
+    Given: A columnar fixture list
+    When: Appending a record with a score greater than the list can hold
+    Then: An OverflowError is raised, and nothing is appended
+    """
+    columns = m.ColumnarFixtureListModel()
+    columns.append(("Foo", 1, "Bar", 2))
+
+    with pytest.raises(OverflowError):
+        columns.append(("Baz", 0, "Foo", m.MAX_SCORE + 1))
+
+    assert columns.teams == {"Foo": 0, "Bar": 1}
+    assert [len(column) for column in (columns.left_teams, columns.right_scores)] == [
+        1,
+        1,
+    ]
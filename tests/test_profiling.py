@@ -0,0 +1,89 @@
+"""Unit tests for the `ranker.profiling` module."""
+import pstats
+
+import pytest
+
+
+def work():
+    """Allocate and hold some memory, with some calls to profile."""
+    return [str(n) for n in range(10000)]
+
+
+def test_cprofile(tmp_path):
+    """
+    Given: A cProfile profiler
+    When: Profiling some code
+    Then: A profile is written, that pstats can read, and a summary is kept
+    """
+    from ranker import profiling
+
+    path = str(tmp_path / "rank.prof")
+
+    with profiling.create("cprofile", path) as profiler:
+        work()
+
+    stats = pstats.Stats(path)
+    assert any(name == "work" for _, _, name in stats.stats)
+    assert profiler.summary.startswith(f"CPU profile written to {path}")
+    assert len(profiler.summary.splitlines()) <= 2 + profiling.SUMMARY_TOP
+
+
+def test_tracemalloc(tmp_path):
+    """
+    Given: A tracemalloc profiler
+    When: Profiling some code, that holds allocated memory
+    Then: An allocation report is written, with the top lines, and a summary is kept
+    """
+    import re
+    import tracemalloc
+
+    from ranker import profiling
+
+    path = str(tmp_path / "allocations.txt")
+
+    with profiling.create("tracemalloc", path, top=3) as profiler:
+        held = work()
+
+    with open(path) as file:
+        report = file.read().splitlines()
+
+    assert held
+    assert not tracemalloc.is_tracing()
+    assert report[0].startswith("Peak traced memory:")
+    assert re.fullmatch(r"Top \d+ lines by memory held:", report[2])
+    assert len(report) <= 3 + 3
+    assert any("test_profiling.py" in line for line in report[3:])
+    assert profiler.summary.startswith(f"Allocation report written to {path}")
+
+
+@pytest.mark.parametrize("name", ["cprofile", "tracemalloc"])
+def test_profile__not_writable(tmp_path, name):
+    """
+    Given: A profiler, with a path that cannot be written
+    When: Profiling some code
+    Then: A ProfileError is raised
+    """
+    from ranker import profiling
+    from ranker.errors import ProfileError
+
+    path = str(tmp_path / "missing" / "profile")
+
+    with pytest.raises(ProfileError, match="Could not write profile to"):
+        with profiling.create(name, path):
+            work()
+
+
+def test_create():
+    """
+    Given: Profiler names
+    When: Creating profilers, without a path
+    Then: Each writes to its default file, and an unknown name raises an error
+    """
+    from ranker import profiling
+    from ranker.errors import ConfigurationError
+
+    assert profiling.create("cprofile").path == "rank.prof"
+    assert profiling.create("tracemalloc").path == "rank-allocations.txt"
+
+    with pytest.raises(ConfigurationError, match="Unknown profiler 'foo'"):
+        profiling.create("foo")
@@ -0,0 +1,61 @@
+"""Unit tests for the `ranker.readers` module."""
+import pytest
+
+
+@pytest.mark.parametrize(
+    ["data", "expected"],
+    [
+        (b"", (0, 0)),
+        (b" \r\n\t\n", (5, 5)),
+        (b"Foo 1, Bar 2", (0, 12)),
+        (b"\n \x0c\x1cFoo 1, Bar 2\r\n\x0b\n", (4, 16)),
+    ],
+)
+def test_content_span(data, expected):
+    """
+    Given: A buffer
+    When: Finding the range of content
+    Then: Leading and trailing blank space is excluded
+    """
+    from ranker.readers import content_span
+
+    assert content_span(data) == expected
+
+
+def test_mapped(tmp_path):
+    """
+    Given: An input file
+    When: Memory-mapping the file
+    Then: The buffer holds the file content
+    """
+    from ranker.readers import mapped
+
+    path = tmp_path / "foo.in"
+
+    path.write_bytes(b"")
+    with mapped(str(path)) as data:
+        assert data == b""
+
+    path.write_bytes(b"Foo 1, Bar 2\n")
+    with mapped(str(path)) as data:
+        assert data[:] == b"Foo 1, Bar 2\n"
+
+
+def test_iterparse_file(tmp_path, valid_input_data):
+    """
+    Given: An input file, with surrounding blank lines
+    When: Parsing the file
+    Then: Yield the same models as for the stripped input string
+    """
+    from ranker.parsers import LeagueRankerParser
+    from ranker.readers import iterparse_file
+
+    path = tmp_path / "foo.in"
+    path.write_text(f"\n\n  {valid_input_data}  \n\n")
+
+    parser = LeagueRankerParser()
+
+    output = list(iterparse_file(parser=parser, path=str(path)))
+
+    assert output == parser.parse(data=valid_input_data).fixtures
+    assert parser._stats["read"] == 10
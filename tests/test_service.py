@@ -0,0 +1,136 @@
+"""Unit tests for the `ranker.service` module."""
+import json
+import os
+import threading
+
+import pytest
+
+
+@pytest.fixture
+def serving():
+    """Run a ranking service server in a thread, for the duration of a test."""
+    from ranker.service import create_server
+
+    servers = []
+
+    def start(address):
+        server = create_server(address)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+
+        return server
+
+    yield start
+
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.mark.parametrize(
+    "address, expected",
+    [
+        ("localhost:8765", ("localhost", 8765)),
+        ("127.0.0.1:0", ("127.0.0.1", 0)),
+        ("/tmp/rank.sock", "/tmp/rank.sock"),
+        ("rank:sock", "rank:sock"),
+        (":8765", ":8765"),
+    ],
+)
+def test_parse_address(address, expected):
+    """
+    Given: A service address
+    When: Parsing the address
+    Then: Return a (host, port) for a TCP address, or else a socket path
+    """
+    from ranker.service import parse_address
+
+    assert parse_address(address) == expected
+
+
+def test_handle(valid_input_data):
+    """
+    Given: A ranking service
+    When: Handling requests
+    Then: Return the ranked table, and the record counts for each request
+    """
+    from ranker.service import RankService
+
+    service = RankService()
+    payload = json.dumps({"data": valid_input_data + "\nbad", "top": 2})
+
+    for _ in range(2):
+        assert service.handle(payload) == {
+            "rankings": [
+                {"order": 1, "team": "Tarantulas", "aggregate": 6},
+                {"order": 2, "team": "Lions", "aggregate": 5},
+            ],
+            "stats": {"read": 6, "parsed": 5, "error": 1},
+        }
+
+
+@pytest.mark.parametrize("payload", ["{not json", "[]", '{"top": 1}', '{"data": ""'])
+def test_handle__invalid_request(payload):
+    """
+    Given: A ranking service
+    When: Handling a request that cannot be read
+    Then: Return an error message
+    """
+    from ranker.service import RankService
+
+    assert RankService().handle(payload)["error"].startswith("Invalid request")
+
+
+@pytest.mark.parametrize("address", ["{tmp_path}/rank.sock", "127.0.0.1:0"])
+def test_request(tmp_path, serving, sorted_log_table, valid_input_data, address):
+    """
+    Given: A ranking service server, on a Unix domain or TCP socket
+    When: Sending requests
+    Then: Return the ranked table for each request
+    """
+    from ranker.service import load_table, request
+
+    server = serving(address.format(tmp_path=tmp_path))
+    address = server.server_address
+    if isinstance(address, tuple):
+        address = "{}:{}".format(*address)
+
+    for _ in range(2):
+        response = request(address, data=valid_input_data)
+        assert load_table(response["rankings"]) == sorted_log_table
+
+
+def test_request__concurrent_connections(tmp_path, serving, valid_input_data):
+    """
+    Given: A ranking service server, with a connection that is held open
+    When: Sending a request on another connection
+    Then: The request is answered, without waiting for the first connection to close
+    """
+    import socket
+
+    from ranker.service import request
+
+    address = str(tmp_path / "rank.sock")
+    serving(address)
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as idle:
+        idle.connect(address)
+        response = request(address, data=valid_input_data)
+
+    assert response["stats"] == {"read": 5, "parsed": 5, "error": 0}
+
+
+def test_server_close__removes_socket(tmp_path):
+    """
+    Given: A ranking service server, on a Unix domain socket
+    When: The server is closed
+    Then: The socket file is removed
+    """
+    from ranker.service import create_server
+
+    path = str(tmp_path / "rank.sock")
+
+    with create_server(path):
+        assert os.path.exists(path)
+
+    assert not os.path.exists(path)
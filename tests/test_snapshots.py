@@ -0,0 +1,149 @@
+"""Unit tests for the `ranker.snapshots` module."""
+import json
+import logging
+
+import pytest
+
+from ranker.requests import CreateLogTableRequest
+
+
+def rank(path, snapshot=None):
+    """Create a log table for an input file. Return the table and record counts."""
+    from ranker.controllers import LeagueRankController
+
+    controller = LeagueRankController()
+    request = CreateLogTableRequest(data="", path=str(path), snapshot=snapshot)
+
+    table = controller.create_log_table(request=request)
+    stats = controller._parser._stats
+
+    return table, [stats["read"], stats["parsed"], stats["error"]]
+
+
+@pytest.mark.parametrize(
+    "before, appended",
+    [
+        ("Lions 3, Snakes 3\nTarantulas 1, FC Awesome 0\n", "Lions 1, FC Awesome 1\n"),
+        ("\n\nLions 3, Snakes 3\r\nbad\r\nTarantulas 1, ", "FC Awesome 0\r\nLions 4"),
+        ("Lions 3, Snakes 3\n\n", "\n\nbad\n  Tarantulas 3, Snakes 1  \n\n"),
+        ("", "Lions 3, Snakes 3\nLions 4, Grouches 0"),
+        ("Lions 3, Snakes 3", ""),
+    ],
+)
+def test_resume__same_as_full_parse(caplog, tmp_path, before, appended):
+    """
+    Given: A snapshot of an input file
+    When: Records are appended to the input, and a run is resumed from the snapshot
+    Then: The log table and record counts are the same as for a full parse, and
+        messages are logged with the same line numbers, for the records parsed
+    """
+    from ranker import snapshots
+
+    def messages():
+        return [r.getMessage() for r in caplog.records if r.name == "ranker.parsers"]
+
+    caplog.set_level(logging.DEBUG, logger="ranker.parsers")
+    path = tmp_path / "input.in"
+    snapshot = str(tmp_path / "snapshot.json")
+
+    path.write_text(before)
+    rank(path, snapshot)
+    saved = snapshots.load_snapshot(snapshot)
+
+    path.write_text(before + appended)
+    caplog.clear()
+    output = rank(path, snapshot)
+    resumed_messages = messages()
+
+    caplog.clear()
+    assert output == rank(path)
+    assert resumed_messages == messages()[len(messages()) - len(resumed_messages) :]
+    assert snapshots.load_snapshot(snapshot).offset >= saved.offset
+
+
+def test_resume__only_appended_bytes_parsed(mocker, tmp_path):
+    """
+    Given: A snapshot of an input file
+    When: Records are appended to the input, and a run is resumed from the snapshot
+    Then: Parsing starts at the snapshot offset
+    """
+    from ranker.parsers import LeagueRankerParser
+
+    path = tmp_path / "input.in"
+    snapshot = str(tmp_path / "snapshot.json")
+
+    path.write_text("Lions 3, Snakes 3\nTarantulas 1, FC Awesome 0")
+    rank(path, snapshot)
+    path.write_text("Lions 3, Snakes 3\nTarantulas 1, FC Awesome 0\nLions 4, Owls 0")
+
+    spy = mocker.spy(LeagueRankerParser, "iterrecords_buffer")
+    rank(path, snapshot)
+
+    assert [call.args[2:4] for call in spy.call_args_list] == [(18, 45), (45, 60)]
+    assert json.loads(open(snapshot).read())["line"] == 3
+
+
+@pytest.mark.parametrize(
+    "change",
+    [
+        lambda path, snapshot: path.write_text("Owls 3, Snakes 0\nLions 1, Owls 2\n"),
+        lambda path, snapshot: path.write_text("Lions 3\n"),
+        lambda path, snapshot: snapshot.write_text("{not json"),
+        lambda path, snapshot: snapshot.write_text('{"version": 0}'),
+        lambda path, snapshot: snapshot.write_text('{"version": 1, "table": {}}'),
+        lambda path, snapshot: snapshot.write_text("[]"),
+    ],
+)
+def test_resume__unusable_snapshot(tmp_path, change):
+    """
+    Given: A snapshot of an input file
+    When: The input is not append-only, or the snapshot is unusable
+    Then: The input is parsed from the start
+    """
+    path = tmp_path / "input.in"
+    snapshot = tmp_path / "snapshot.json"
+
+    path.write_text("Lions 3, Snakes 3\nTarantulas 1, FC Awesome 0\n")
+    rank(path, str(snapshot))
+    change(path, snapshot)
+
+    assert rank(path, str(snapshot)) == rank(path)
+
+
+def test_resume__changed_settings(mocker, tmp_path):
+    """
+    Given: A snapshot of an input file
+    When: Points values are changed
+    Then: The input is parsed from the start
+    """
+    from ranker.config import LeagueRankerConfig
+
+    path = tmp_path / "input.in"
+    snapshot = str(tmp_path / "snapshot.json")
+
+    path.write_text("Lions 3, Snakes 3\nTarantulas 1, FC Awesome 0\nLions 4, Owls 0\n")
+    rank(path, snapshot)
+
+    LeagueRankerConfig.create({"points_win": 2})
+
+    output, _ = rank(path, snapshot)
+    assert output.rankings[0].aggregate.value == 3  # Lions: 1 draw + 1 win
+
+
+@pytest.mark.parametrize("snapshot", ["missing/snapshot.json", "directory"])
+def test_resume__snapshot_not_written(tmp_path, snapshot):
+    """
+    Given: A snapshot path that cannot be written
+    When: A run is resumed
+    Then: A SnapshotError is raised, and no temporary file is left behind
+    """
+    from ranker.errors import SnapshotError
+
+    path = tmp_path / "input.in"
+    path.write_text("Lions 3, Snakes 3\nTarantulas 1, FC Awesome 0\n")
+    (tmp_path / "directory").mkdir()
+
+    with pytest.raises(SnapshotError, match="Could not write snapshot to"):
+        rank(path, str(tmp_path / snapshot))
+
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["directory", "input.in"]
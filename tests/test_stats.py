@@ -59,3 +59,303 @@ def test_increment__get_item():
 
     stats = LeagueRankerStats()
     assert stats["red"] == 0
+
+
+def test_increment__many_threads():
+    """
+    Given: A stats counter instance
+    When: A named count is incremented by many threads at once
+    Then: No increment is lost
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    from ranker.stats import StatsCounter
+
+    stats = StatsCounter()
+
+    def count(n):
+        for _ in range(n):
+            stats.incr("foo")
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(count, [10000] * 8))
+
+    assert stats["foo"] == 80000
+
+
+def test_timer__disabled():
+    """
+    Given: A stats counter, that is not timing
+    When: A timer is used as a context manager, a decorator and an iterator
+    Then: The same no-op timer is returned, the iterable is not wrapped, and no
+        timers are recorded
+    """
+    from ranker.stats import StatsCounter
+
+    stats = StatsCounter()
+    items = [1, 2]
+
+    with stats.timer("foo"):
+        pass
+
+    @stats.timer("bar")
+    def bar():
+        return 1
+
+    assert bar() == 1
+    assert stats.timer("foo") is stats.timer("bar")
+    assert list(stats.iter("baz", items)) == items
+    assert stats.timers() == {}
+
+
+def test_timer__nested(mocker):
+    """
+    Given: A stats counter, that is timing
+    When: Timers are nested, as context managers and decorators
+    Then: Each timer records its total time, and its time less the nested timers
+    """
+    from ranker.stats import StatsCounter
+
+    clock = iter(range(0, 1000, 10))
+    mocker.patch("ranker.stats.time.perf_counter_ns", side_effect=lambda: next(clock))
+    stats = StatsCounter(timing=True)
+
+    @stats.timer("inner")
+    def inner():
+        pass
+
+    with stats.timer("outer"):  # 0
+        inner()  # 10, 20
+        inner()  # 30, 40
+    # 50
+
+    timers = stats.timers()
+    assert list(timers) == ["inner", "outer"]
+    assert (timers["inner"].count, timers["inner"].total_ns) == (2, 20)
+    assert (timers["outer"].total_ns, timers["outer"].self_ns) == (50, 30)
+    assert (timers["inner"].min_ns, timers["inner"].max_ns) == (10, 10)
+
+
+def test_timer__iter(mocker):
+    """
+    Given: A stats counter, that is timing
+    When: Items of nested iterators are taken in a timer
+    Then: Each item is timed as a call, as is the end of each iterator, and the time of
+        each iterator is nested in the iterator or timer that takes its items
+    """
+    from ranker.stats import StatsCounter
+
+    clock = iter(range(0, 1000, 10))
+    mocker.patch("ranker.stats.time.perf_counter_ns", side_effect=lambda: next(clock))
+    stats = StatsCounter(timing=True)
+
+    with stats.timer("build"):
+        items = list(stats.iter("parse", stats.iter("read", "ab")))
+
+    timers = stats.timers()
+    assert items == ["a", "b"]
+    assert [timer.count for timer in timers.values()] == [3, 3, 1]
+    assert timers["read"].total_ns == timers["read"].self_ns == 30
+    assert (timers["parse"].total_ns, timers["parse"].self_ns) == (90, 60)
+    assert (timers["build"].total_ns, timers["build"].self_ns) == (130, 40)
+
+
+def test_timer__histogram():
+    """
+    Given: A timer, with calls of many durations
+    When: Reading percentiles of its durations
+    Then: The upper bound of the histogram bucket of each percentile is returned
+    """
+    from ranker.stats import TimerStats
+
+    timer, other = TimerStats(), TimerStats()
+    assert timer.percentile(50) == 0
+
+    for elapsed in [100, 200, 300]:
+        timer.add(elapsed, elapsed)
+    for elapsed in [5000, 50]:
+        other.add(elapsed, 0)
+    timer.merge(other)
+    timer.merge(TimerStats())
+
+    assert (timer.count, timer.total_ns, timer.self_ns) == (5, 5650, 600)
+    assert (timer.min_ns, timer.max_ns) == (50, 5000)
+    assert timer.percentile(50) == 256
+    assert timer.percentile(99) == 8192
+    assert timer.as_dict()["histogram"] == [
+        {"lt_ns": 64, "count": 1},
+        {"lt_ns": 128, "count": 1},
+        {"lt_ns": 256, "count": 1},
+        {"lt_ns": 512, "count": 1},
+        {"lt_ns": 8192, "count": 1},
+    ]
+
+
+def test_metrics():
+    """
+    Given: A stats counter, that is timing
+    When: Counting records, and running a timer and a timed iterator
+    Then: The metrics have the counts and timers, as JSON values
+    """
+    import json
+
+    from ranker.stats import StatsCounter
+
+    stats = StatsCounter(timing=True)
+    stats.incr("read", 2)
+    with stats.timer("rank"):
+        pass
+    assert list(stats.iter("parse", "ab")) == ["a", "b"]
+
+    metrics = json.loads(json.dumps(stats.metrics()))
+
+    assert metrics["counts"] == {"read": 2}
+    assert metrics["timers"]["rank"]["count"] == 1
+    assert metrics["timers"]["parse"]["count"] == 3
+
+
+def test_timed():
+    """
+    Given: A method, decorated to be timed
+    When: The method is called
+    Then: The call is timed with the stats of the instance's context
+    """
+    from ranker.config import ConfigSnapshot
+    from ranker.context import RankingContext
+    from ranker.stats import StatsCounter, timed
+
+    class Phase:
+        def __init__(self, context):
+            self._context = context
+
+        @timed("phase")
+        def run(self, value):
+            return value
+
+    context = RankingContext(config=ConfigSnapshot(), stats=StatsCounter(timing=True))
+
+    assert Phase(context).run(1) == 1
+    assert context.stats.timers()["phase"].count == 1
+
+
+def test_timer__many_threads():
+    """
+    Given: A stats counter, that is timing
+    When: Timers are nested in many threads at once
+    Then: Each thread has its own stack of timers, and no call is lost
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    from ranker.stats import StatsCounter
+
+    stats = StatsCounter(timing=True)
+
+    def run(n):
+        for _ in range(n):
+            with stats.timer("outer"), stats.timer("inner"):
+                pass
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(run, [1000] * 8))
+
+    timers = stats.timers()
+    assert timers["outer"].count == timers["inner"].count == 8000
+    assert timers["outer"].self_ns <= timers["outer"].total_ns
+
+
+def test_error_sampler__reservoir():
+    """
+    Given: An error sampler
+    When: More records are rejected than the sample size
+    Then: Records are counted by category, and a sample of a fixed size is kept, in
+        which every record has about the same chance of being kept
+    """
+    from ranker.stats import ErrorSampler
+
+    kept = [0] * 100
+    for seed in range(200):
+        sampler = ErrorSampler(size=10, seed=seed)
+        for line in range(100):
+            sampler.add("unusable" if line % 4 else "invalid_format", "", line)
+
+        assert len(sampler.sample) == 10
+        for line, _, _ in sampler.sample:
+            kept[line] += 1
+
+    assert sampler.counts == {"invalid_format": 25, "unusable": 75}
+    assert sampler.seen == 100
+    assert sum(kept[:50]) == pytest.approx(sum(kept[50:]), rel=0.15)
+
+
+def test_error_sampler__merge():
+    """
+    Given: Error samplers, with records rejected in parts of an input
+    When: Merging the samplers
+    Then: Counts are added, and a sample of records from both parts is kept, in
+        proportion to the number of records rejected in each part
+    """
+    from ranker.stats import ErrorSampler
+
+    sampler, small, large = ErrorSampler(seed=1), ErrorSampler(), ErrorSampler()
+    small.add("unusable", "", 1)
+    for line in range(1000, 2000):
+        large.add("invalid_format", "Foo", line)
+
+    sampler.merge(small)
+    assert sampler.sample == [(1, "unusable", "")]
+
+    sampler.merge(large)
+    summary = sampler.summary()
+    assert summary["counts"] == {"unusable": 1, "invalid_format": 1000}
+    assert sampler.seen == 1001
+    assert len(summary["sample"]) == 10
+    assert summary["sample"] == sorted(summary["sample"], key=lambda r: r["line"])
+    assert all(row["line"] >= 1000 for row in summary["sample"][1:])
+
+
+def test_reject(tmp_path):
+    """
+    Given: A stats counter
+    When: Records are rejected, while in and out of a rejected records context
+    Then: Each is counted as an error and by category, and only those rejected in the
+        context are written to the file
+    """
+    from ranker.stats import StatsCounter
+
+    stats = StatsCounter()
+    path = tmp_path / "rejects.tsv"
+
+    with open(path, "w") as file, stats.rejects(file):
+        stats.reject("unusable", "", 1)
+        stats.reject("invalid_format", "Foo 1", 2)
+    stats.reject("invalid_format", "Bar 2", 3)
+
+    assert stats["error"] == 3
+    assert stats.errors()["counts"] == {"unusable": 1, "invalid_format": 2}
+    assert stats.metrics()["errors"] == stats.errors()
+    assert stats.sampler().seen == 3
+    assert path.read_text() == "1\tunusable\t\n2\tinvalid_format\tFoo 1\n"
+
+
+def test_log_errors(caplog):
+    """
+    Given: A stats counter, with rejected records of more categories than are sampled
+    When: Logging the rejected records
+    Then: A warning is logged for each category, with the first sampled example
+    """
+    from ranker.stats import StatsCounter
+
+    stats = StatsCounter()
+    stats._errors.size = 1
+
+    stats.reject("invalid_format", "Foo 1", 2)
+    stats.reject("invalid_format", "Bar 2", 3)
+    stats.reject("unusable", "", 4)
+    stats._errors.sample = [(2, "invalid_format", "Foo 1")]  # Not left to chance
+
+    stats.log_errors()
+
+    assert caplog.messages == [
+        "Rejected 2 invalid_format record(s), such as 'Foo 1' at line 2",
+        "Rejected 1 unusable record(s)",
+    ]
@@ -0,0 +1,85 @@
+"""Unit tests for the `ranker.views` module."""
+from ranker import models as m
+
+
+def test_chunks(sorted_log_table):
+    """
+    Given: A ranking table
+    When: Rendering the table in chunks of ranks
+    Then: Yield blocks of text, that join to a line for each rank
+    """
+    from ranker.views import CreateLogTableRequestView
+
+    chunks = list(CreateLogTableRequestView.chunks(sorted_log_table, size=2))
+
+    assert len(chunks) == 3
+    assert all(chunk.endswith("\n") for chunk in chunks)
+    assert "".join(chunks).splitlines() == list(
+        CreateLogTableRequestView.lines(sorted_log_table)
+    )
+    assert list(CreateLogTableRequestView.chunks(m.RankingTableModel([]))) == []
+
+
+def test_lines__points():
+    """
+    Given: A ranking table, with aggregates of 0, 1 and 2 points
+    When: Rendering the table
+    Then: Points are pluralised, except for 1 point
+    """
+    from ranker.views import CreateLogTableRequestView
+
+    table = m.RankingTableModel(
+        rankings=[
+            m.RankModel(
+                team=m.TeamModel(name=name),
+                aggregate=m.RankAggregateModel(value=value),
+                order=m.RankOrderModel(value=order),
+            )
+            for order, (name, value) in enumerate(
+                [("Lions", 2), ("Snakes", 1), ("Owls", 0)], start=1
+            )
+        ]
+    )
+
+    assert "".join(CreateLogTableRequestView.chunks(table)) == (
+        "1. Lions, 2 pts\n2. Snakes, 1 pt\n3. Owls, 0 pts\n"
+    )
+
+
+def test_timings():
+    """
+    Given: The timers of a ranking run
+    When: Rendering a row for each timed phase
+    Then: Times are in milliseconds, with the share of the exclusive time of all phases
+    """
+    from ranker.stats import TimerStats
+    from ranker.views import CreateLogTableRequestView
+
+    parse, build = TimerStats(), TimerStats()
+    parse.add(3_000_000, 3_000_000)
+    build.add(4_000_000, 1_000_000)
+
+    rows = CreateLogTableRequestView.timings({"parse": parse, "build": build})
+
+    assert rows[0][:5] == ["parse", 1, 3.0, 3.0, "75.0%"]
+    assert rows[1][:5] == ["build", 1, 4.0, 1.0, "25.0%"]
+    assert rows[1][5] == rows[1][6] == (1 << 22) / 1e6
+
+
+def test_render__verbose_not_timed(capsys, sorted_log_table):
+    """
+    Given: A verbose ranking context, with a stats counter that is not timing
+    When: Rendering a ranking table
+    Then: Stats are printed, without timings
+    """
+    from ranker.config import ConfigSnapshot
+    from ranker.context import RankingContext
+    from ranker.views import CreateLogTableRequestView
+
+    context = RankingContext(config=ConfigSnapshot(verbose=True))
+
+    CreateLogTableRequestView.render(sorted_log_table, context=context)
+
+    output = capsys.readouterr().out
+    assert "Statistics:" in output
+    assert "Timings:" not in output
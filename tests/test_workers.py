@@ -0,0 +1,126 @@
+"""Unit tests for the `ranker.workers` module."""
+import logging
+
+import pytest
+
+
+@pytest.fixture
+def input_path(tmp_path):
+    """An input file, with blank lines and invalid records."""
+    path = tmp_path / "foo.in"
+    path.write_bytes(
+        b"\n  \r\n"
+        b"  Lions 3, Snakes 3\r\n"
+        b"Tarantulas 1, FC Awesome 0\n"
+        b"\n"
+        b"Lions 1, FC Awesome 1\r"
+        b"Tarantulas 3 Snakes 1\n"
+        b"Lions 4, Grouches 0  \n\n"
+    )
+
+    return str(path)
+
+
+@pytest.mark.parametrize(
+    ["data", "expected"],
+    [
+        (b"", []),
+        (b" \r\n\t\n", []),
+        (b"\n\nFoo 1, Bar 2\n\n", [(2, 14)]),
+        (b"Foo 1, Bar 2\nBaz 3, Bat 4\n", [(0, 13), (13, 25)]),
+        (b"Foo 1, Bar 2\r\nBaz 3, Bat 4", [(0, 14), (14, 26)]),
+        (b"Foo 1, Bar 2\rBaz 3, Bat 4\nRed 5, Sky 6", [(0, 26), (26, 38)]),
+    ],
+)
+def test_find_chunks(tmp_path, data, expected):
+    """
+    Given: An input file
+    When: Splitting it into chunks of at least 10 bytes
+    Then: Chunks end at line boundaries, and exclude leading and trailing blank space
+    """
+    from ranker.workers import find_chunks
+
+    path = tmp_path / "foo.in"
+    path.write_bytes(data)
+
+    assert find_chunks(str(path), workers=2, size=10) == expected
+
+
+def test_find_chunks__default_size(input_path):
+    """
+    Given: An input file
+    When: Splitting it into chunks, with no chunk size
+    Then: A small file is not split
+    """
+    from ranker.workers import find_chunks
+
+    assert find_chunks(input_path, workers=4) == [(7, 117)]
+
+
+def test_count_lines(tmp_path):
+    """
+    Given: A chunk of an input file
+    When: Counting lines
+    Then: Return the number of line separators
+    """
+    from ranker.workers import count_lines
+
+    path = tmp_path / "foo.in"
+    path.write_bytes(b"Foo\r\nBar\rBaz\n\nBat")
+
+    assert count_lines(str(path), (0, 17)) == 4
+    assert count_lines(str(path), (5, 13)) == 2
+
+
+def test_tally_chunk(caplog, input_path):
+    """
+    Given: A chunk of an input file
+    When: Parsing and tallying the chunk from a line number
+    Then: Return the partial points table, counts of records read and parsed, and the
+        rejected records
+    """
+    from ranker.config import LeagueRankerConfig
+    from ranker.workers import tally_chunk
+
+    caplog.set_level(logging.DEBUG, logger="ranker.parsers")
+    config = LeagueRankerConfig().snapshot()
+    *output, errors = tally_chunk(input_path, (53, 117), line=3, config=config)
+
+    assert output == [{"Lions": 4, "FC Awesome": 1, "Grouches": 0}, 4, 2]
+    assert caplog.messages == [
+        "Unusable record: '' at line 3",
+        "Invalid record format: 'Tarantulas 3 Snakes 1' at line 5",
+    ]
+    assert errors.counts == {"unusable": 1, "invalid_format": 1}
+    assert [line for line, _, _ in errors.sample] == [3, 5]
+
+    *output, errors = tally_chunk(input_path, (26, 53), 2, config)  # Ends with a "\n"
+
+    assert output == [{"Tarantulas": 3, "FC Awesome": 0}, 1, 1]
+    assert errors.seen == 0
+
+
+def test_tally_file(input_path):
+    """
+    Given: An input file
+    When: Parsing and tallying chunks of the file in worker processes
+    Then: Return the same points table and counts as parsing the whole input
+    """
+    from ranker.context import RankingContext
+    from ranker.factories import LogTableFactory
+    from ranker.parsers import LeagueRankerParser
+    from ranker.workers import tally_file
+
+    context = RankingContext.create()
+    stats = context.stats
+
+    output = tally_file(input_path, workers=2, size=10, context=context)
+
+    with open(input_path) as file:
+        parser = LeagueRankerParser()
+        expected = LogTableFactory().tally(parser.iterparse(file.read().strip()))
+
+    assert output == expected
+    assert [stats[k] for k in ("read", "parsed", "error")] == [6, 4, 2]
+    assert stats.errors() == parser._stats.errors()
+    assert [parser._stats[k] for k in ("read", "parsed", "error")] == [6, 4, 2]
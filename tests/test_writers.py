@@ -0,0 +1,152 @@
+"""Unit tests for the `ranker.writers` module."""
+import csv
+import io
+import json
+
+import pytest
+
+from ranker import models as m
+
+ROWS = [
+    {"order": 1, "team": "Tarantulas", "aggregate": 6},
+    {"order": 2, "team": "Lions", "aggregate": 5},
+    {"order": 3, "team": "FC Awesome", "aggregate": 1},
+    {"order": 3, "team": 'Snakes, "The"', "aggregate": 1},
+    {"order": 5, "team": "Grouches", "aggregate": 0},
+]
+
+
+@pytest.fixture
+def table():
+    """A ranking table, with a team name that must be quoted."""
+    return m.RankingTableModel(
+        rankings=[
+            m.RankModel(
+                team=m.TeamModel(name=row["team"]),
+                aggregate=m.RankAggregateModel(value=row["aggregate"]),
+                order=m.RankOrderModel(value=row["order"]),
+            )
+            for row in ROWS
+        ]
+    )
+
+
+@pytest.fixture(autouse=True)
+def chunk_size(mocker):
+    """Write ranks in small chunks, so that tables span many chunks."""
+    mocker.patch("ranker.writers.CHUNK_SIZE", 2)
+
+
+@pytest.mark.parametrize(
+    "format, load",
+    [
+        ("json", json.loads),
+        ("jsonl", lambda output: [json.loads(line) for line in output.splitlines()]),
+        (
+            "csv",
+            lambda output: [
+                {**row, "order": int(row["order"]), "aggregate": int(row["aggregate"])}
+                for row in csv.DictReader(io.StringIO(output))
+            ],
+        ),
+    ],
+)
+def test_write__text_formats(table, format, load):
+    """
+    Given: A ranking table
+    When: Writing the table in a text format
+    Then: The output can be loaded, with a row for each rank
+    """
+    from ranker.writers import write
+
+    file = io.StringIO()
+    write(table, format, file)
+
+    assert load(file.getvalue()) == ROWS
+    assert file.getvalue().endswith("\n")
+
+
+@pytest.mark.parametrize("format", ["json", "jsonl", "csv"])
+def test_write__empty_table(format):
+    """
+    Given: An empty ranking table
+    When: Writing the table in a text format
+    Then: The output holds no rows
+    """
+    from ranker.writers import write
+
+    file = io.StringIO()
+    write(m.RankingTableModel(rankings=[]), format, file)
+
+    expected = {"json": "[]\n", "jsonl": "", "csv": "order,team,aggregate\n"}
+
+    assert file.getvalue() == expected[format]
+
+
+def test_write__arrow(table):
+    """
+    Given: A ranking table
+    When: Writing the table as an Arrow IPC stream
+    Then: The stream can be read, with a record batch for each chunk of ranks
+    """
+    pa = pytest.importorskip("pyarrow")
+
+    from ranker.writers import write
+
+    file = io.BytesIO()
+    write(table, "arrow", file)
+
+    reader = pa.ipc.open_stream(file.getvalue())
+    batches = list(reader)
+
+    assert [batch.num_rows for batch in batches] == [2, 2, 1]
+    assert pa.Table.from_batches(batches).to_pylist() == ROWS
+
+
+def test_write__parquet(table):
+    """
+    Given: A ranking table
+    When: Writing the table as Parquet
+    Then: The file can be read, with a row group for each chunk of ranks
+    """
+    pytest.importorskip("pyarrow")
+    import pyarrow.parquet as pq
+
+    from ranker.writers import write
+
+    file = io.BytesIO()
+    write(table, "parquet", file)
+
+    parquet = pq.ParquetFile(io.BytesIO(file.getvalue()))
+
+    assert parquet.metadata.num_row_groups == 3
+    assert parquet.read().to_pylist() == ROWS
+
+
+def test_write__unknown_format(table):
+    """
+    Given: A ranking table
+    When: Writing the table in an unknown format
+    Then: Raise a `ConfigurationError` exception
+    """
+    from ranker.errors import ConfigurationError
+    from ranker.writers import write
+
+    with pytest.raises(ConfigurationError, match="Unknown output format 'xml'"):
+        write(table, "xml", io.StringIO())
+
+
+@pytest.mark.parametrize("format", ["arrow", "parquet"])
+def test_write__no_pyarrow(mocker, table, format):
+    """
+    Given: PyArrow is not installed
+    When: Writing a ranking table in a binary format
+    Then: Raise a `ConfigurationError` exception
+    """
+    from ranker.errors import ConfigurationError
+    from ranker.writers import write
+
+    mocker.patch("ranker.writers.pyarrow", return_value=None)
+
+    with pytest.raises(ConfigurationError, match=f"'{format}' requires PyArrow"):
+        write(table, format, io.BytesIO())